@@ -1,11 +1,14 @@
 import asyncio
+import inspect
 import uuid
 import logging
 from typing import Dict, Any, Optional, Callable, Awaitable
 
 # สมมติว่ามีการ import จาก module ของโปรเจกต์ (ตามโค้ดเดิมของคุณ)
 from core.aether_conductor import conductor
-from core.envelope import Envelope, AetherIntent
+from core.envelope import Envelope, AetherIntent, PayloadView
+from core.admission import AdmissionError
+from core.clock import Clock, get_clock
 
 # ตั้งค่า Logging พื้นฐาน (ปรับแต่งได้ตามต้องการ)
 logging.basicConfig(
@@ -19,21 +22,42 @@ class BaseAgent:
     คลาสแม่แบบสำหรับ Agent ในระบบ AETHERIUM-GENESIS
     จัดการการเชื่อมต่อ รับ-ส่ง ข้อมูลผ่าน Conductor
     """
-    def __init__(self, agent_id: str, conductor_ref=conductor):
+    def __init__(self, agent_id: str, conductor_ref=conductor, clock: Optional[Clock] = None):
         self.agent_id = agent_id
         self.bus = conductor_ref
+        self._clock = clock
+        self._subscriptions = []
         logger.info(f"🤖 [Agent: {self.agent_id}] Initialized and connected to Aether.")
 
-    async def subscribe(self, topic: str, handler: Callable[[Envelope], Awaitable[None]]):
+    @property
+    def clock(self) -> Clock:
+        """
+        นาฬิกาของ Agent: ใช้เวลาเสมือน (Virtual Time) อัตโนมัติเมื่อรันใน simulate()
+        """
+        return self._clock or get_clock()
+
+    async def subscribe(self, topic: str, handler: Callable[[Envelope], Awaitable[None]], **options):
         """
         ลงทะเบียนรับข้อมูลจาก Topic ที่กำหนด
+        (options เช่น max_queue / workers / overflow จะถูกส่งต่อให้ Conductor)
         """
         logger.info(f"S [Agent: {self.agent_id}] Subscribing to topic: '{topic}'")
         try:
-            await self.bus.subscribe(topic, handler)
+            sub = await self.bus.subscribe(topic, handler, **options)
         except Exception as e:
             logger.error(f"❌ [Agent: {self.agent_id}] Failed to subscribe to '{topic}': {e}")
             raise e
+        if hasattr(sub, "unsubscribe"):
+            self._subscriptions.append(sub)
+        return sub
+
+    async def unsubscribe_all(self):
+        """
+        ยกเลิกการรับข้อมูลทุก Topic ของ Agent นี้ (เพื่อไม่ให้ Conductor ยึด Agent ไว้หลังหยุดทำงาน)
+        """
+        subs, self._subscriptions = self._subscriptions, []
+        for sub in subs:
+            await sub.unsubscribe()
 
     async def publish(self, topic: str, intent: AetherIntent, payload: Dict[str, Any], flow_id: Optional[str] = None):
         """
@@ -41,6 +65,9 @@ class BaseAgent:
         """
         # สร้าง Flow ID ใหม่ถ้าไม่มีการระบุมา (สำหรับการ Trace การทำงานข้าม Agent)
         current_flow_id = flow_id or str(uuid.uuid4())
+        # Payload ที่ได้รับมาเป็นแบบอ่านอย่างเดียว (PayloadView): ทำสำเนาตื้นก่อนส่งต่อ
+        if isinstance(payload, PayloadView):
+            payload = payload.copy()
 
         env = Envelope(
             intent=intent,
@@ -53,10 +80,52 @@ class BaseAgent:
 
         try:
             await self.bus.publish(topic, env)
+        except AdmissionError as e:
+            # ถูกปฏิเสธโดยเจตนา (rate limit / load shedding): ไม่เก็บเข้า Dead-Letter
+            logger.warning(f"⏳ [Agent: {self.agent_id}] Publish to '{topic}' refused ({e.reason}); retry after {e.retry_after:.3f}s")
         except Exception as e:
             logger.error(f"❌ [Agent: {self.agent_id}] Error publishing to '{topic}': {e}")
+            # เก็บไว้ใน Dead-Letter Store (ถ้า Conductor รองรับ) เพื่อ replay ภายหลัง
+            record = getattr(self.bus, "record_publish_failure", None)
+            if record is not None:
+                record(topic, env, self.agent_id, e)
             # อาจจะเพิ่ม logic การ retry ที่นี่ได้ในอนาคต
 
+    async def request(self, topic: str, intent: AetherIntent, payload: Dict[str, Any],
+                      flow_id: Optional[str] = None, timeout: float = 5.0) -> Envelope:
+        """
+        ส่งคำถามแล้วรอคำตอบเดียว (Request/Reply ผ่าน Inbox ส่วนตัวของ Conductor)
+        Raises asyncio.TimeoutError หากไม่มีคำตอบภายใน timeout
+        """
+        env = Envelope(
+            intent=intent,
+            sender_id=self.agent_id,
+            payload=payload,
+            flow_id=flow_id or str(uuid.uuid4())
+        )
+        return await self.bus.request(topic, env, timeout)
+
+    async def reply(self, request: Envelope, intent: AetherIntent, payload: Dict[str, Any]):
+        """
+        ตอบกลับ Envelope ที่ถูกส่งมาด้วย request() (ไปถึงผู้ถามเท่านั้น ไม่กระจายทั้ง Topic)
+        """
+        env = Envelope(intent=intent, sender_id=self.agent_id, payload=payload, flow_id=request.flow_id)
+        await self.bus.reply(request, env)
+
+    async def cancel_flow(self, flow_id: str):
+        """
+        ยกเลิกงานที่ยังค้างอยู่ทั้งหมดของ Flow นี้ (Handler ที่กำลังทำงาน และ Envelope ที่รอคิว)
+        ข้อความที่ส่งหลังจากนี้ใน Flow เดียวกันยังถูกส่งตามปกติ
+        """
+        cancel = getattr(self.bus, "cancel_flow", None)
+        if cancel is None:
+            return 0
+        result = cancel(flow_id)
+        if inspect.isawaitable(result):
+            result = await result
+        logger.info(f"🛑 [Agent: {self.agent_id}] Cancelled flow {flow_id}")
+        return result
+
     async def start(self):
         """
         Method ที่จะถูก Override โดย Subclass เพื่อเริ่มการทำงานหลัก
@@ -69,5 +138,5 @@ class BaseAgent:
         Method สำหรับการเคลียร์ทรัพยากรก่อนปิดตัว
         """
         logger.info(f"🛑 [Agent: {self.agent_id}] Stopping...")
-        pass
+        await self.unsubscribe_all()
         
@@ -1,15 +1,21 @@
+import asyncio
 from agents.base_agent import BaseAgent
 from core.envelope import Envelope, AetherIntent
 from config.gep_constitution import GEP_CONFIG
 
 class GEPPolicyEnforcer(BaseAgent):
-    def __init__(self, conductor):
+    def __init__(self, conductor, agio_timeout: float = 5.0):
         super().__init__("SAG_AuditGate_001", conductor)
         self.rules = GEP_CONFIG["policy_rules_map"]
+        self.agio_timeout = agio_timeout
+        # flow_id -> envelope awaiting AGIO's verdict
         self.pending_audits = {}
+        # flow_id -> in-flight request to AGIO (released when a legacy broadcast settles the flow)
+        self._escalations = {}
 
     async def start(self):
         await self.subscribe("aether.tasks.pending", self.handle_audit)
+        # Legacy responders still broadcast verdicts keyed by flow_id
         await self.subscribe("query.response", self.handle_agio_response)
 
     async def handle_audit(self, envelope: Envelope):
@@ -25,17 +31,35 @@ class GEPPolicyEnforcer(BaseAgent):
         if rule and rule.get("check_via_agio"):
             print(f"[SAG] ⚖️ Escalating to AGIO...")
             self.pending_audits[envelope.flow_id] = envelope
-            await self.publish("query.knowledge.retrieve", AetherIntent.QUERY_TRUTH, {
+            escalation = asyncio.ensure_future(self.request("query.knowledge.retrieve", AetherIntent.QUERY_TRUTH, {
                 "query": rule["agio_query_template"],
                 "context": envelope.payload,
                 "_security_context": "AGIO-CODEX System Message"
-            }, envelope.flow_id)
+            }, envelope.flow_id, timeout=self.agio_timeout))
+            self._escalations[envelope.flow_id] = escalation
+            try:
+                verdict = await escalation
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                return  # settled by a legacy broadcast on query.response
+            except asyncio.TimeoutError:
+                if self.pending_audits.pop(envelope.flow_id, None):
+                    await self._reject(envelope, "AGIO Timeout")
+                return
+            finally:
+                if self._escalations.get(envelope.flow_id) is escalation:
+                    del self._escalations[envelope.flow_id]
+            await self.handle_agio_response(verdict)
         else:
             await self._approve(envelope)
 
     async def handle_agio_response(self, envelope: Envelope):
         original = self.pending_audits.pop(envelope.flow_id, None)
         if original:
+            escalation = self._escalations.pop(envelope.flow_id, None)
+            if escalation is not None:
+                escalation.cancel()  # no need to keep waiting for the private reply
             if envelope.payload.get("status") == "SAFE":
                 await self._approve(original)
             else:
@@ -47,6 +71,8 @@ class GEPPolicyEnforcer(BaseAgent):
 
     async def _reject(self, env, reason):
         print(f"[SAG] 🛑 Rejected: {reason}")
+        # Stop whatever else this flow still has running or queued
+        await self.cancel_flow(env.flow_id)
         # Add security context to ensure system messages are trusted
         payload = {
             "reason": reason,
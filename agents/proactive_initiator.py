@@ -15,7 +15,7 @@ class ProactiveInitiatorAgent(BaseAgent):
     """
     def __init__(self, conductor):
         super().__init__("Proactive_Initiator_001", conductor)
-        self.last_interaction_time = datetime.now(timezone.utc)
+        self.last_interaction_time = self.clock.now()
         self.is_awake = False
         
         # Internal Memory สำหรับจำสถานะล่าสุด (Mock)
@@ -38,7 +38,7 @@ class ProactiveInitiatorAgent(BaseAgent):
 
     async def _update_interaction_time(self, envelope: Envelope):
         """รับรู้ว่ามีการเคลื่อนไหวเกิดขึ้น ให้รีเซ็ตเวลา"""
-        self.last_interaction_time = datetime.now(timezone.utc)
+        self.last_interaction_time = self.clock.now()
         # print(f"[{self.agent_id}] 🕒 Clock Reset. User is active.")
 
     async def _autonomous_loop(self):
@@ -65,7 +65,7 @@ class ProactiveInitiatorAgent(BaseAgent):
 
     async def _should_i_speak(self) -> Dict[str, Any]:
         """Speech Decision Engine Logic"""
-        now = datetime.now(timezone.utc)
+        now = self.clock.now()
         silence_duration = now - self.last_interaction_time
         
         # Rule 1: Long Silence Check (ทักทายเมื่อเงียบไปนาน)
@@ -110,5 +110,5 @@ class ProactiveInitiatorAgent(BaseAgent):
             )
             
             # อัปเดตเวลาเพื่อไม่ให้ทักซ้ำทันที
-            self.last_interaction_time = datetime.now(timezone.utc)
+            self.last_interaction_time = self.clock.now()
 
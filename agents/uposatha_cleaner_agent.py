@@ -19,6 +19,14 @@ class UposathaCleanerAgent(BaseAgent):
         self._running_task = asyncio.create_task(self.start_ritual_loop())
         print(f"[{self.agent_id}] 🧹 Ready to purify system state.")
 
+    async def stop(self):
+        # หยุด Background Loop แล้วปล่อย Subscription ทั้งหมด
+        task, self._running_task = self._running_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await super().stop()
+
     async def start_ritual_loop(self):
         try:
             while True:
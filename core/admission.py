@@ -0,0 +1,146 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .dispatch import BackpressureError
+
+# tier -> (tokens per second, burst); None means unlimited
+DEFAULT_LIMITS: Dict[str, Optional[Tuple[float, float]]] = {
+    "trusted": None,
+    "standard": (200.0, 400.0),
+    "low": (5.0, 10.0),
+}
+
+
+def trust_tier(trust: int) -> str:
+    if trust >= 90:
+        return "trusted"
+    if trust >= 50:
+        return "standard"
+    return "low"
+
+
+class AdmissionError(BackpressureError):
+    """
+    Raised by publish when the conductor refuses an envelope. `reason` is
+    'rate_limited' or 'overloaded'; `retry_after` (seconds) is a hint for
+    the sender's backoff.
+    """
+
+    def __init__(self, topic: str, sender_id: str, tier: str, reason: str, retry_after: float):
+        self.topic = topic
+        self.subscriptions = []
+        self.sender_id = sender_id
+        self.tier = tier
+        self.reason = reason
+        self.retry_after = retry_after
+        Exception.__init__(self, f"Admission refused for '{sender_id}' ({tier}) on '{topic}': "
+                                 f"{reason}, retry after {retry_after:.3f}s")
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def take(self, now: float, n: float = 1.0) -> float:
+        """ Takes n tokens; returns 0.0 on success, else seconds until they'd be available. """
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        return (n - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Per-sender token buckets (limits chosen by trust tier) plus global load
+    shedding. A monitor task samples event-loop lag and the conductor's
+    queued depth every `sample_interval`; while either is over its limit,
+    tiers listed in `shed_tiers` are refused outright.
+    """
+
+    def __init__(self, depth_probe: Callable[[], int],
+                 limits: Optional[Dict[str, Optional[Tuple[float, float]]]] = None,
+                 max_senders: int = 10000, max_lag: float = 0.1, max_depth: int = 50000,
+                 shed_tiers: Tuple[str, ...] = ("low", "standard"), sample_interval: float = 0.05):
+        self.depth_probe = depth_probe
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.max_senders = max_senders
+        self.max_lag = max_lag
+        self.max_depth = max_depth
+        self.shed_tiers = set(shed_tiers)
+        self.sample_interval = sample_interval
+
+        self._buckets: 'OrderedDict[Tuple[str, str], TokenBucket]' = OrderedDict()
+        self._monitor: Optional[asyncio.Task] = None
+        self.lag = 0.0
+        self.depth = 0
+
+        # --- Counters ---
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}   # "reason:tier" -> count
+
+    @property
+    def overloaded(self) -> bool:
+        return self.lag > self.max_lag or self.depth > self.max_depth
+
+    def admit(self, topic: str, sender_id: str, trust: int):
+        """ Raises AdmissionError if the envelope must not be dispatched. """
+        if self._monitor is None:
+            self._monitor = asyncio.create_task(self._sample())
+
+        tier = trust_tier(trust)
+        if tier in self.shed_tiers and self.overloaded:
+            self._reject(topic, sender_id, tier, "overloaded", self.sample_interval)
+
+        limit = self.limits.get(tier)
+        if limit is not None:
+            now = asyncio.get_running_loop().time()
+            key = (sender_id, tier)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit[0], limit[1], now)
+                if len(self._buckets) > self.max_senders:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            wait = bucket.take(now)
+            if wait:
+                self._reject(topic, sender_id, tier, "rate_limited", wait)
+        self.admitted += 1
+
+    def _reject(self, topic: str, sender_id: str, tier: str, reason: str, retry_after: float):
+        key = f"{reason}:{tier}"
+        self.rejected[key] = self.rejected.get(key, 0) + 1
+        raise AdmissionError(topic, sender_id, tier, reason, retry_after)
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            overshoot = max(loop.time() - expected, 0.0)
+            self.lag = self.lag * 0.5 + overshoot * 0.5
+            self.depth = self.depth_probe()
+
+    async def close(self):
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None:
+            monitor.cancel()
+            await asyncio.gather(monitor, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "senders": len(self._buckets),
+            "lag_ms": round(self.lag * 1000, 3),
+            "depth": self.depth,
+            "overloaded": self.overloaded,
+        }
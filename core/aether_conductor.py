@@ -1,58 +1,959 @@
 import asyncio
+import concurrent.futures
+import heapq
 import uuid
-import time
-from collections import defaultdict
-from typing import Callable, Dict, Any, Optional, List
-from .envelope import Envelope
-from .signature import OriginMetadata, AISource
+from collections import OrderedDict, defaultdict, deque
+from itertools import groupby
+from typing import Callable, Dict, Any, Optional, List, Iterable, Set, Tuple, AsyncIterator, Awaitable
+from .envelope import Envelope, EnvelopeView
+from .signature import OriginMetadata, AISource, TrustCache
+from .dispatch import Subscription, OverflowPolicy, BackpressureError, earliest_deadline
+from .topic_trie import TopicTrie
+from .job_registry import JobRegistry, JobView
+from .job_wal import JobWAL
+from .lanes import LaneScheduler, SandboxLane, LaneOverflowError, Priority, DEFAULT_TOPIC_PRIORITIES
+from .dead_letter import DeadLetter, DeadLetterStore, RetryPolicy
+from .coalesce import Coalesce
+from .admission import AdmissionController, AdmissionError
+from .retention import Retention, RetentionRing, ReplayFrom
+from .clock import get_clock
+from .dedup import Deduplicator, WindowDedup, BloomDedup
+from .flows import FlowTracker
+from .inbox import inbox_topic
 
 class AetherConductor:
     """
     AetherBus: The Central Nervous System (Async & Thread-Safe Concept)
     Acts as Message Broker and Job Registry.
+    The module-level `conductor` is the default instance.
     """
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(AetherConductor, cls).__new__(cls)
-            cls._instance.channels = defaultdict(list)
-            cls._instance.trust_scores = {
-                AISource.HUMAN_ARCHITECT: 100,
-                AISource.GEMINI_CORE: 95,
-                AISource.UNKNOWN_ECHO: 10
-            }
-            # --- Job Registry ---
-            cls._instance._job_registry = {}
-            cls._instance._lock = asyncio.Lock()
-
-        return cls._instance
-
-    async def subscribe(self, topic: str, handler: Callable):
-        self.channels[topic].append(handler)
+    def __init__(self, trust_scores: Optional[Dict[AISource, int]] = None,
+                 trust_cache_size: int = 4096, job_shards: int = 64, history_limit: int = 32,
+                 dead_letter_maxlen: int = 10000, route_cache_size: int = 4096):
+        """
+        Each conductor is an isolated bus (one per tenant, test, or worker).
+        Construction touches no event loop: queues, workers, futures and the
+        job registry are created on first use, in whichever loop uses them.
+        Per-topic lookups (routes, priorities, retention) are memoized in LRU
+        caches of `route_cache_size` topics, so per-job or client-chosen topic
+        names cannot grow them without bound.
+        """
+        # --- Routing ---
+        # channels: pattern -> {subscription id: subscription} (exact and wildcard alike)
+        self.channels = defaultdict(dict)
+        self._wildcards = TopicTrie()
+        self.route_cache_size = route_cache_size
+        self._route_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._prune_tasks = set()
+        self.trust_scores = dict(trust_scores) if trust_scores is not None else {
+            AISource.HUMAN_ARCHITECT: 100,
+            AISource.GEMINI_CORE: 95,
+            AISource.UNKNOWN_ECHO: 10
+        }
+        # Memoized origin analysis (set deep=False to trust marker fields only)
+        self.signature_cache = TrustCache(maxsize=trust_cache_size)
+        # --- Failed Deliveries ---
+        self.dead_letters = DeadLetterStore(maxlen=dead_letter_maxlen)
+        self._retry_tasks = set()
+        # --- Request/Reply (private inbox, correlation_id -> future) ---
+        self.inbox = inbox_topic()
+        self._replies = {}
+        self.late_replies = 0
+        # --- Job Registry (built lazily, see _jobs) ---
+        self._job_shards = job_shards
+        self._history_limit = history_limit
+        self._job_store: Optional[JobRegistry] = None
+        # --- Admission Control (off until enable_admission) ---
+        self._admission = None
+        # --- Deduplication by msg_id (off until enable_dedup) ---
+        self._dedup: Optional[Deduplicator] = None
+        # --- Priority Lanes (off until enable_lanes) ---
+        self._lanes = None
+        self._lane_weights = None   # handed to subscriptions, see Subscription.lane_weights
+        self._sandbox = None
+        self._priorities = {}
+        self._priority_trie = TopicTrie()
+        self._priority_cache: 'OrderedDict[str, Priority]' = OrderedDict()
+        # --- Retention (per-topic history for late subscribers) ---
+        self._retention: Dict[str, Retention] = {}
+        self._retention_trie = TopicTrie()
+        self._retention_cache: 'OrderedDict[str, Optional[Retention]]' = OrderedDict()
+        self._rings: Dict[str, RetentionRing] = {}
+        self._next_offset = 0
+        # --- Thread Handoff (sync-world publishers, see publish_threadsafe) ---
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handoff = deque()
+        self._handoff_scheduled = False
+        self._handoff_task: Optional[asyncio.Task] = None
+        self.handoff_wakeups = 0
+        self.handoff_published = 0
+        # --- Flows (in-flight handlers per flow_id, see cancel_flow) ---
+        self.flows = FlowTracker()
+        self._seq = 0   # stamped into meta["seq"] as envelopes are accepted
+
+    @property
+    def _jobs(self) -> JobRegistry:
+        if self._job_store is None:
+            self._job_store = JobRegistry(shards=self._job_shards, history_limit=self._history_limit)
+        return self._job_store
+
+    async def subscribe(self, topic: str, handler: Callable, max_queue: int = 0,
+                        workers: int = 1, overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+                        batch: bool = False, with_topic: bool = False,
+                        timeout: Optional[float] = None,
+                        retry: Optional[RetryPolicy] = None,
+                        coalesce: Optional[Coalesce] = None,
+                        replay_from: Optional[ReplayFrom] = None,
+                        weak: bool = False) -> Subscription:
+        """
+        Attaches a handler to a topic.
+        max_queue > 0 switches the subscription to queued dispatch: envelopes are
+        buffered and drained by `workers` long-lived tasks, and `overflow` decides
+        what happens when the buffer is full.
+        batch=True hands the handler a list of envelopes per publish call.
+        with_topic=True calls handler(topic, envelope) with the concrete topic.
+        timeout caps each delivery; overdue handlers are cancelled and reported.
+        Failed deliveries go to `dead_letters`; `retry` re-attempts them with backoff.
+        coalesce=Coalesce(window, key) delivers only the latest (or merged)
+        envelope per key and window, for bursty streams.
+        replay_from (an offset, epoch seconds or datetime) first delivers what
+        retained topics matching `topic` still hold from that point, then live
+        traffic, with no gap or duplicate in between; see retain().
+        weak=True holds the handler weakly: once its owner is garbage-collected
+        the subscription is removed automatically.
+        The returned Subscription is the handle for unsubscribe().
+        """
+        sub = Subscription(topic, handler, max_queue=max_queue, workers=workers,
+                           overflow=overflow, batch=batch, with_topic=with_topic,
+                           timeout=timeout, retry=retry, coalesce=coalesce, weak=weak)
+        sub.on_failure = self._dead_letter
+        sub.on_unsubscribe = self.unsubscribe
+        sub.on_collected = self._handler_collected
+        sub.flows = self.flows
+        sub.lane_weights = self._lane_weights
+        self._loop = asyncio.get_running_loop()
+        if TopicTrie.is_wildcard(topic):
+            self._wildcards.insert(topic, sub)
+        backlog = None
+        if replay_from is not None:
+            # Snapshot and registration happen without yielding: everything
+            # fanned out after this point reaches the subscription live
+            backlog = self._backlog(topic, replay_from)
+            sub.held = []
+        self.channels[topic][sub.id] = sub
+        self._invalidate_routes(topic)
         print(f"👀 AetherBus: Agent subscribed to topic -> {topic}")
+        if backlog is not None:
+            await self._replay(sub, backlog)
+        return sub
+
+    async def unsubscribe(self, sub: Subscription, drain: bool = False) -> bool:
+        """
+        Detaches a subscription in O(1) and stops its workers (drain=True lets
+        them finish what is queued first). Returns False if it was not attached.
+        """
+        subs = self.channels.get(sub.topic)
+        if subs is None or subs.pop(sub.id, None) is None:
+            return False
+        if not subs:
+            del self.channels[sub.topic]
+        if TopicTrie.is_wildcard(sub.topic):
+            self._wildcards.remove(sub.topic, sub)
+        self._invalidate_routes(sub.topic)
+        sub.active = False
+        if drain:
+            await sub.join()
+        await sub.close()
+        print(f"🔕 AetherBus: Agent unsubscribed from topic -> {sub.topic}")
+        return True
 
-    async def publish(self, topic: str, envelope: Envelope):
+    def _handler_collected(self, sub: Subscription):
+        # Runs inside the garbage collector: defer the removal to the loop
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._prune, sub)
+        except RuntimeError:
+            pass
+
+    def _prune(self, sub: Subscription):
+        task = asyncio.create_task(self.unsubscribe(sub))
+        self._prune_tasks.add(task)
+        task.add_done_callback(self._prune_tasks.discard)
+
+    def _invalidate_routes(self, pattern: str):
+        if TopicTrie.is_wildcard(pattern):
+            self._route_cache.clear()
+        else:
+            self._route_cache.pop(pattern, None)
+
+    async def publish(self, topic: str, envelope: Envelope, priority: Optional[Priority] = None):
+        envelope = self._own(envelope)
+        dedup = self._dedup
+        if dedup is None:
+            return await self._publish(topic, envelope, priority)
+        if not dedup.claim(envelope.msg_id, topic):
+            return  # already published within the window
+        try:
+            await self._publish(topic, envelope, priority)
+        except (AdmissionError, LaneOverflowError):
+            # Refused before dispatch: the sender may retry with the same msg_id
+            dedup.release(envelope.msg_id)
+            raise
+        except BaseException:
+            dedup.commit(envelope.msg_id)
+            raise
+        dedup.commit(envelope.msg_id)
+
+    async def _publish(self, topic: str, envelope: Envelope, priority: Optional[Priority]):
         # 1. Signature Check (Listen)
-        content_sample = str(envelope.payload)
-        sig = OriginMetadata.analyze_code_style(content_sample)
-        trust = self.trust_scores.get(sig.source, 0)
+        sig, trust = self._guard(envelope)
+        if self._admission is not None:
+            self._admission.admit(topic, envelope.sender_id, trust)
+
+        if topic == self.inbox:
+            # Replies never fan out: O(1) hand-off to the waiting requester
+            self._resolve_reply(envelope)
+            return
 
         print(f"[Conductor] 🎻 Wave on '{topic}' | Origin: {sig.source.value} | Trust: {trust}")
 
         # 2. Structural Adjustment (Guide)
         if trust < 50:
             print("   -> 🛡️ Low Trust: Quarantine Mode Activated")
-            envelope.payload["_quarantine"] = True
 
         # 3. Dispatch (Async)
-        if topic in self.channels:
-            # Create tasks but don't strictly wait (fire and forget pattern for speed, or wait if needed)
-            # Using asyncio.wait to ensure execution within this tick if needed,
-            # or we can gather. For now, preserving existing logic:
-            tasks = [asyncio.create_task(h(envelope)) for h in self.channels[topic]]
-            if tasks:
-                await asyncio.wait(tasks)
+        if trust < 50 and self._sandbox is not None:
+            self._sandbox.submit(topic, envelope)
+            return
+        if self._lanes is not None:
+            self._lanes.submit(self.priority_for(topic, priority), topic, envelope)
+            return
+        tasks, rejected = [], []
+        await self._fan_out(topic, [envelope], tasks, rejected)
+        await self._settle(tasks, rejected)
+
+    async def publish_many(self, topic: str, envelopes: Iterable[Envelope]):
+        """
+        Publishes a batch to one topic: routes are resolved once, the batch is
+        logged once, and every handler is scheduled exactly once for the whole
+        batch (batch subscribers receive the list itself).
+        """
+        await self.publish_batch((topic, env) for env in envelopes)
+
+    async def publish_batch(self, items: Iterable[Tuple[str, Envelope]]):
+        """ Mixed-topic variant of publish_many; order is preserved per topic. """
+        await self._publish_batch(items, self._dedup)
+
+    async def _publish_batch(self, items: Iterable[Tuple[str, Envelope]], dedup: Optional[Deduplicator]):
+        by_topic: Dict[str, List[Envelope]] = {}
+        quarantined = 0
+        refused: List[BackpressureError] = []
+        sandboxed: List[Tuple[str, Envelope]] = []
+        claimed: Set[str] = set()
+        for topic, envelope in items:
+            envelope = self._own(envelope)
+            if dedup is not None:
+                if not dedup.claim(envelope.msg_id, topic):
+                    continue
+                claimed.add(envelope.msg_id)
+            _, trust = self._guard(envelope)
+            if self._admission is not None:
+                try:
+                    self._admission.admit(topic, envelope.sender_id, trust)
+                except AdmissionError as e:
+                    refused.append(e)
+                    if dedup is not None:
+                        claimed.discard(envelope.msg_id)
+                        dedup.release(envelope.msg_id)
+                    continue
+            if trust < 50:
+                quarantined += 1
+                if self._sandbox is not None:
+                    sandboxed.append((topic, envelope))
+                    continue
+            by_topic.setdefault(topic, []).append(envelope)
+
+        total = len(sandboxed) + sum(len(envs) for envs in by_topic.values())
+        if total:
+            topics = len(by_topic.keys() | {topic for topic, _ in sandboxed})
+            print(f"[Conductor] 🎻 Batch of {total} wave(s) on {topics} topic(s) | Quarantined: {quarantined}")
+
+        for topic, envelope in sandboxed:
+            try:
+                self._sandbox.submit(topic, envelope)
+            except LaneOverflowError as e:
+                refused.append(e)
+                if dedup is not None:
+                    claimed.discard(envelope.msg_id)
+                    dedup.release(envelope.msg_id)
+
+        try:
+            await self._dispatch_batch(by_topic)
+        finally:
+            if dedup is not None:
+                for msg_id in claimed:
+                    dedup.commit(msg_id)
+        if refused:
+            # The accepted part was dispatched; report the first refusal
+            raise refused[0]
+
+    async def _dispatch_batch(self, by_topic: Dict[str, List[Envelope]]):
+        if self._lanes is not None:
+            for topic, envelopes in by_topic.items():
+                priority = self.priority_for(topic)
+                for envelope in envelopes:
+                    self._lanes.submit(priority, topic, envelope)
+            return
+        tasks, rejected = [], []
+        for topic, envelopes in by_topic.items():
+            await self._fan_out(topic, envelopes, tasks, rejected)
+        await self._settle(tasks, rejected)
+
+    async def deliver(self, topic: str, envelope: Envelope):
+        """
+        Dispatches to local subscriptions without signature analysis, for
+        envelopes that were already guarded by an upstream conductor.
+        """
+        self._stamp(envelope)
+        await self._deliver(topic, envelope)
+
+    async def _deliver(self, topic: str, envelope: Envelope):
+        # Lanes dispatch through here (already guarded and stamped)
+        tasks, rejected = [], []
+        await self._fan_out(topic, [envelope], tasks, rejected)
+        await self._settle(tasks, rejected)
+
+    async def _deliver_quarantined(self, topic: str, envelope: Envelope):
+        # The sandbox dispatches through here: handlers run on the sandbox's
+        # own workers, never through a subscription's queue, so a quarantined
+        # flood cannot evict or stall trusted envelopes queued there
+        tasks, rejected = [], []
+        await self._fan_out(topic, [envelope], tasks, rejected, inline=True)
+        await self._settle(tasks, rejected)
+
+    # --- Sync World / Other Threads ---
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        Sets the loop that publish_threadsafe hands envelopes to (done
+        automatically by the first subscribe).
+        """
+        self._loop = loop
+
+    def publish_threadsafe(self, topic: str, envelope: Envelope,
+                           priority: Optional[Priority] = None) -> concurrent.futures.Future:
+        """
+        Publishes from any thread without blocking. Envelopes go into a
+        lock-free handoff buffer; the loop is woken once per batch (not per
+        envelope) and publishes them in order. The returned future resolves
+        when the publish completed; failures are also kept in dead_letters.
+        """
+        loop = self._loop
+        if loop is None:
+            raise RuntimeError("Conductor has no event loop yet: subscribe first or call attach_loop()")
+        future = concurrent.futures.Future()
+        self._handoff.append((topic, envelope, priority, future))
+        if not self._handoff_scheduled:
+            self._handoff_scheduled = True
+            loop.call_soon_threadsafe(self._wake_handoff)
+        return future
+
+    def publish_sync(self, topic: str, envelope: Envelope, priority: Optional[Priority] = None,
+                     timeout: Optional[float] = None):
+        """ Blocking publish for synchronous code running outside the event loop thread. """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and running is self._loop:
+            raise RuntimeError("publish_sync would block the event loop; await publish() instead")
+        return self.publish_threadsafe(topic, envelope, priority).result(timeout)
+
+    def _wake_handoff(self):
+        # Reset before draining: anything appended from now on schedules a new wake-up
+        self._handoff_scheduled = False
+        self.handoff_wakeups += 1
+        if self._handoff_task is None or self._handoff_task.done():
+            self._handoff_task = asyncio.create_task(self._flush_handoff())
+
+    async def _flush_handoff(self):
+        buffer = self._handoff
+        while buffer:
+            topic, envelope, priority, future = buffer.popleft()
+            try:
+                await self.publish(topic, envelope, priority)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not isinstance(e, AdmissionError):
+                    self.record_publish_failure(topic, envelope, "threadsafe", e)
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            else:
+                self.handoff_published += 1
+                if future.set_running_or_notify_cancel():
+                    future.set_result(None)
+
+    def handoff_stats(self) -> Dict[str, Any]:
+        """ Cross-thread publishes: buffered, published, and loop wake-ups paid for them. """
+        return {"buffered": len(self._handoff), "published": self.handoff_published,
+                "wakeups": self.handoff_wakeups}
+
+    @staticmethod
+    def _own(envelope) -> Envelope:
+        # Re-publishing a delivered view re-publishes the original envelope
+        return envelope.unwrap() if isinstance(envelope, EnvelopeView) else envelope
+
+    def _guard(self, envelope: Envelope) -> Tuple[OriginMetadata, int]:
+        """
+        Classifies the sender and annotates the envelope's meta layer; the
+        payload itself is never touched (handlers still see '_quarantine').
+        """
+        sig = self.signature_cache.analyze(envelope.sender_id, envelope.payload)
+        trust = self.trust_scores.get(sig.source, 0)
+        envelope.meta["origin"] = sig.source.value
+        envelope.meta["trust"] = trust
+        if trust < 50:
+            envelope.meta["quarantine"] = True
+        self._stamp(envelope)
+        return sig, trust
+
+    def _stamp(self, envelope: Envelope):
+        self._seq += 1
+        envelope.meta["seq"] = self._seq
+
+    async def _fan_out(self, topic: str, envelopes: List[Envelope],
+                       tasks: List[asyncio.Task], rejected: List[Tuple[str, Subscription]],
+                       inline: bool = False):
+        if self._retention:
+            self._retain(topic, envelopes)
+        # One read-only view per envelope, shared by every subscriber (no copies)
+        envelopes = [env.view() for env in envelopes]
+        subs = self._route_cache.get(topic)
+        if subs is None:
+            subs = self._resolve(topic)
+        else:
+            self._route_cache.move_to_end(topic)
+
+        for sub in subs:
+            if sub.held is not None:
+                # Still replaying: live traffic queues up behind the backlog
+                sub.held.extend((topic, envelope) for envelope in envelopes)
+            else:
+                await self._deliver_to(sub, topic, envelopes, tasks, rejected, inline)
+
+    async def _deliver_to(self, sub: Subscription, topic: str, envelopes: list,
+                          tasks: List[asyncio.Task], rejected: List[Tuple[str, Subscription]],
+                          inline: bool = False):
+        # inline=True runs even queued subscriptions' handlers in this task
+        queued = sub.queued and not inline
+        if sub.coalescer is not None:
+            # Deferred: the window decides when (and what) to deliver
+            for envelope in envelopes:
+                sub.coalescer.offer(topic, envelope)
+        elif sub.batch:
+            # Batch subscribers see the whole list as a single delivery
+            if queued:
+                if not await sub.offer(envelopes, topic):
+                    rejected.append((topic, sub))
+            else:
+                tasks.append(asyncio.create_task(sub.run((envelopes,), earliest_deadline(envelopes), topic)))
+        elif queued:
+            # Queued subscriptions only pay for an enqueue
+            for envelope in envelopes:
+                if not await sub.offer(envelope, topic):
+                    rejected.append((topic, sub))
+                    break
+        elif len(envelopes) == 1:
+            envelope = envelopes[0]
+            args = (topic, envelope) if sub.with_topic else (envelope,)
+            tasks.append(asyncio.create_task(sub.run(args, envelope.deadline, topic)))
+        else:
+            tasks.append(asyncio.create_task(self._deliver_each(sub, topic, envelopes)))
+
+    @staticmethod
+    async def _deliver_each(sub: Subscription, topic: str, envelopes: List[Envelope]):
+        for envelope in envelopes:
+            await sub.run((topic, envelope) if sub.with_topic else (envelope,), envelope.deadline, topic)
+
+    @staticmethod
+    async def _settle(tasks: List[asyncio.Task], rejected: List[Tuple[str, Subscription]]):
+        if tasks:
+            await asyncio.wait(tasks)
+        if rejected:
+            topic = rejected[0][0]
+            raise BackpressureError(topic, [sub for _, sub in rejected])
+
+    def _resolve(self, topic: str) -> tuple:
+        """ Resolves exact + wildcard subscriptions for a concrete topic and caches them. """
+        subs = list(self.channels.get(topic, {}).values())
+        if len(self._wildcards):
+            subs.extend(s for s in self._wildcards.match(topic) if s.topic != topic)
+            subs.sort(key=lambda s: s.id)
+        resolved = tuple(subs)
+        self._remember(self._route_cache, topic, resolved)
+        return resolved
+
+    def _remember(self, cache: OrderedDict, topic: str, value):
+        cache[topic] = value
+        if len(cache) > self.route_cache_size:
+            cache.popitem(last=False)
+
+    def clear_subscriptions(self):
+        """ Drops every subscription (used to reset state between runs). """
+        self.channels.clear()
+        self._wildcards = TopicTrie()
+        self._route_cache.clear()
+
+    async def drain(self):
+        """
+        Waits until every queued subscription has emptied its buffer
+        (pending coalesce windows are delivered early).
+        """
+        if self._handoff_task is not None:
+            await self._handoff_task
+        if self._handoff:
+            await self._flush_handoff()
+        if self._sandbox is not None:
+            await self._sandbox.join()
+        if self._lanes is not None:
+            await self._lanes.join()
+        for subs in list(self.channels.values()):
+            for sub in list(subs.values()):
+                await sub.join()
+
+    async def shutdown(self):
+        """ Stops all subscription worker pools and flushes the job WAL. """
+        await self.disable_lanes()
+        await self.disable_sandbox()
+        await self.disable_admission()
+        retries, self._retry_tasks = self._retry_tasks, set()
+        for task in retries:
+            task.cancel()
+        if retries:
+            await asyncio.gather(*retries, return_exceptions=True)
+        for subs in list(self.channels.values()):
+            for sub in list(subs.values()):
+                await sub.close()
+        if self._job_store is not None:
+            await self._job_store.detach_wal()
+
+    def dispatch_stats(self) -> List[Dict[str, Any]]:
+        """ Per-subscription queue depth and delivery counters. """
+        return [sub.stats() for subs in self.channels.values() for sub in subs.values()
+                if sub.queued or sub.coalescer is not None]
+
+    def slow_handler_report(self) -> List[Dict[str, Any]]:
+        """
+        Subscriptions that blew their budget (timed out or got an already
+        expired envelope) or raised, worst offenders first.
+        """
+        report = [{
+            "subscription": sub.id,
+            "topic": sub.topic,
+            "handler": sub.name,
+            "budget": sub.timeout,
+            "timed_out": sub.timed_out,
+            "expired": sub.expired,
+            "failed": sub.failed,
+            "max_elapsed": round(sub.max_elapsed, 6),
+            "last_incident": sub.last_incident,
+        } for subs in self.channels.values() for sub in subs.values()
+            if sub.timed_out or sub.expired or sub.failed]
+        report.sort(key=lambda r: (r["timed_out"], r["expired"], r["failed"]), reverse=True)
+        return report
+
+    # --- Flows ---
+
+    def cancel_flow(self, flow_id: str) -> int:
+        """
+        Aborts a flow (user abort, rejected audit): cancels its running
+        handlers and drops its envelopes still waiting in queues, lanes or
+        coalesce windows. Envelopes the flow publishes afterwards are
+        delivered normally. Cost is O(handlers in flight for the flow).
+        Returns the number of handlers cancelled.
+        """
+        cancelled = self.flows.cancel(flow_id, self._seq)
+        print(f"🛑 AetherBus: Flow '{flow_id}' cancelled ({cancelled} running handler(s))")
+        return cancelled
+
+    def flow_stats(self) -> Dict[str, Any]:
+        """ Flows and handlers in flight, cancellations and envelopes dropped for them. """
+        return self.flows.stats()
+
+    # --- Request/Reply ---
+
+    async def request(self, topic: str, envelope: Envelope, timeout: float = 5.0) -> Envelope:
+        """
+        Publishes `envelope` and waits for the single reply addressed to it.
+        The reply travels on this conductor's private inbox, keyed by
+        correlation id, so no other subscriber sees it. Raises asyncio.TimeoutError.
+        """
+        envelope = self._own(envelope)
+        envelope.reply_to = self.inbox
+        envelope.correlation_id = envelope.correlation_id or envelope.msg_id
+        future = asyncio.get_running_loop().create_future()
+        self._replies[envelope.correlation_id] = future
+        try:
+            await self.publish(topic, envelope)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._replies.pop(envelope.correlation_id, None)
+
+    async def reply(self, request: Envelope, envelope: Envelope):
+        """ Answers a request; a no-op if the request did not ask for a reply. """
+        if not request.reply_to:
+            return
+        envelope.correlation_id = request.correlation_id or request.msg_id
+        envelope.flow_id = request.flow_id
+        await self.publish(request.reply_to, envelope)
+
+    def _resolve_reply(self, envelope: Envelope):
+        future = self._replies.get(envelope.correlation_id)
+        if future is None or future.done():
+            # Requester timed out or a duplicate answer arrived
+            self.late_replies += 1
+            return
+        future.set_result(envelope.view())
+
+    # --- Dead Letters ---
+
+    def _dead_letter(self, sub: Subscription, topic: str, payload, outcome: str,
+                     error: Optional[BaseException]):
+        """ Subscription failure hook: records the delivery and schedules a retry. """
+        for envelope in (payload if isinstance(payload, list) else [payload]):
+            letter = self.dead_letters.record(topic, envelope, sub.name, sub.id, outcome, error)
+            # An expired envelope will not get any less expired
+            if outcome != "expired" and sub.retry is not None and sub.retry.should_retry(letter.attempts):
+                letter.retrying = True
+                task = asyncio.create_task(self._retry(sub, letter, sub.retry.delay(letter.attempts)))
+                self._retry_tasks.add(task)
+                task.add_done_callback(self._retry_tasks.discard)
+
+    async def _retry(self, sub: Subscription, letter: DeadLetter, delay: float):
+        await asyncio.sleep(delay)
+        letter.retrying = False
+        if sub.id not in self.channels.get(sub.topic, ()):
+            return  # unsubscribed meanwhile; stays dead until replayed
+        if await self._redeliver(sub, letter.topic, [letter]):
+            self.dead_letters.resolve(letter.key)
+
+    @staticmethod
+    async def _redeliver(sub: Subscription, topic: str, letters: List[DeadLetter]) -> bool:
+        envelopes = [l.envelope for l in letters]
+        if sub.batch:
+            return await sub.run((envelopes,), earliest_deadline(envelopes), topic)
+        ok = True
+        for envelope in envelopes:
+            args = (topic, envelope) if sub.with_topic else (envelope,)
+            ok = await sub.run(args, envelope.deadline, topic) and ok
+        return ok
+
+    def record_publish_failure(self, topic: str, envelope: Envelope, source: str,
+                               error: Optional[BaseException] = None) -> DeadLetter:
+        """ Keeps an envelope whose publish raised (e.g. backpressure) for later replay. """
+        return self.dead_letters.record(topic, envelope, f"publish:{source}", None, "publish", error)
+
+    async def replay_dead_letters(self, topic: Optional[str] = None, handler: Optional[str] = None,
+                                  batch_size: int = 100) -> int:
+        """
+        Re-attempts stored dead letters (e.g. after a fix is deployed), batch_size
+        at a time. Letters whose subscription is still registered are redelivered
+        to that subscription only, grouped so each handler is scheduled once per
+        batch; the rest are re-published. Returns the number resolved.
+        """
+        letters = self.dead_letters.list(topic=topic, handler=handler)
+        live = {sub.id: sub for subs in self.channels.values() for sub in subs.values()}
+        resolved = 0
+
+        for start in range(0, len(letters), batch_size):
+            chunk = letters[start:start + batch_size]
+            groups: Dict[Tuple[int, str], List[DeadLetter]] = {}
+            republish = []
+            for letter in chunk:
+                if letter.subscription_id in live:
+                    groups.setdefault((letter.subscription_id, letter.topic), []).append(letter)
+                else:
+                    republish.append(letter)
+
+            async def redeliver(sub_id: int, group_topic: str, group: List[DeadLetter]):
+                sub = live[sub_id]
+                if sub.batch:
+                    return group if await self._redeliver(sub, group_topic, group) else []
+                # Per-envelope so partial success resolves what did go through
+                return [l for l in group if await self._redeliver(sub, group_topic, [l])]
+
+            tasks = [asyncio.create_task(redeliver(sub_id, t, group)) for (sub_id, t), group in groups.items()]
+
+            if republish:
+                for letter in republish:
+                    self.dead_letters.resolve(letter.key)
+                try:
+                    # Deliberate re-delivery: bypasses msg_id deduplication
+                    await self._publish_batch(((l.topic, l.envelope) for l in republish), None)
+                    resolved += len(republish)
+                except Exception as e:
+                    for letter in republish:
+                        self.record_publish_failure(letter.topic, letter.envelope, "replay", e)
+
+            for done in (await asyncio.gather(*tasks)) if tasks else ():
+                for letter in done:
+                    if self.dead_letters.resolve(letter.key):
+                        resolved += 1
+
+        print(f"♻️ AetherBus: Replayed {len(letters)} dead letter(s), {resolved} resolved")
+        return resolved
+
+    # --- Admission Control ---
+
+    async def enable_admission(self, **options):
+        """
+        Rate-limits senders by trust tier and sheds non-trusted traffic while
+        the loop lags or queues are deep; refused publishes raise AdmissionError.
+        Options: limits, max_senders, max_lag, max_depth, shed_tiers, sample_interval.
+        """
+        await self.disable_admission()
+        self._admission = AdmissionController(self._queued_depth, **options)
+        print("🚧 AetherBus: Admission control enabled")
+
+    async def disable_admission(self):
+        admission, self._admission = self._admission, None
+        if admission is not None:
+            await admission.close()
+
+    def _queued_depth(self) -> int:
+        depth = sum(sub.queue.qsize() for subs in self.channels.values() for sub in subs.values()
+                    if sub.queue is not None)
+        if self._lanes is not None:
+            depth += sum(lane["depth"] for lane in self._lanes.stats())
+        if self._sandbox is not None:
+            depth += self._sandbox.stats()["depth"]
+        return depth
+
+    def admission_stats(self) -> Dict[str, Any]:
+        """ Admitted/refused counts (by reason and tier), loop lag and queued depth. """
+        return self._admission.stats() if self._admission is not None else {}
+
+    # --- Deduplication ---
+
+    def enable_dedup(self, window: float = 60.0, mode: str = "exact", **options):
+        """
+        Drops publishes whose msg_id was already dispatched within `window`
+        seconds (retries, re-publishes after a reconnect). mode="exact" keeps a
+        bounded set (option: max_entries); mode="bloom" keeps two rotating Bloom
+        filters of fixed size (options: capacity, error_rate).
+        Dead-letter replays are never deduplicated.
+        """
+        if mode == "exact":
+            self._dedup = WindowDedup(window, **options)
+        elif mode == "bloom":
+            self._dedup = BloomDedup(window, **options)
+        else:
+            raise ValueError(f"Unknown dedup mode '{mode}' (use 'exact' or 'bloom')")
+        print(f"🧬 AetherBus: msg_id deduplication enabled ({mode}, {window}s window)")
+
+    def disable_dedup(self):
+        self._dedup = None
+
+    def dedup_stats(self) -> Dict[str, Any]:
+        """ Checked/dropped counts (also per topic) and memory use of the dedup stage. """
+        return self._dedup.stats() if self._dedup is not None else {}
+
+    # --- Quarantine Sandbox ---
+
+    async def enable_sandbox(self, workers: int = 1, max_depth: int = 1000):
+        """
+        Routes quarantined (low-trust) envelopes to their own lane: a queue of
+        at most `max_depth` envelopes drained by `workers` dedicated tasks.
+        Their publish returns once queued and raises LaneOverflowError when full.
+        Sandbox workers call every handler themselves, bypassing the queues of
+        queued subscriptions, which stay reserved for trusted traffic.
+        """
+        await self.disable_sandbox()
+        self._sandbox = SandboxLane(self._deliver_quarantined, workers=workers, max_depth=max_depth)
+        print(f"🧪 AetherBus: Quarantine sandbox enabled ({workers} worker(s), depth {max_depth})")
+
+    async def disable_sandbox(self):
+        """ Dispatches what the sandbox holds, then stops its workers. """
+        sandbox, self._sandbox = self._sandbox, None
+        if sandbox is not None:
+            await sandbox.join()
+            await sandbox.close()
+
+    def sandbox_stats(self) -> Dict[str, Any]:
+        return self._sandbox.stats() if self._sandbox is not None else {}
+
+    # --- Priority Lanes ---
+
+    async def enable_lanes(self, workers: int = 4, weights: Optional[Dict[Priority, int]] = None,
+                           reserved: Optional[Dict[Priority, int]] = None, max_depth: int = 10000,
+                           topic_priorities: Optional[Dict[str, Priority]] = None):
+        """
+        Switches publish to lane scheduling: guarded envelopes are queued per
+        priority and dispatched by `workers` shared tasks in weighted-fair order,
+        plus `reserved` workers pinned to a lane (one CRITICAL worker by default).
+        publish() then returns once the envelope is queued; use drain() to wait.
+        Queued subscriptions keep one buffer per lane and drain them in the
+        same weighted order, so CRITICAL envelopes do not wait behind BULK
+        ones there either.
+        """
+        await self.disable_lanes()
+        self._lanes = LaneScheduler(self._deliver, workers=workers, weights=weights,
+                                    reserved=reserved, max_depth=max_depth)
+        lane_weights = {int(p): lane.weight for p, lane in self._lanes.lanes.items()}
+        lane_weights[None] = lane_weights[Priority.NORMAL]   # delivered without a lane
+        self._set_lane_weights(lane_weights)
+        for pattern, priority in {**DEFAULT_TOPIC_PRIORITIES, **(topic_priorities or {})}.items():
+            self.set_topic_priority(pattern, priority)
+        print(f"🚦 AetherBus: Priority lanes enabled ({workers} shared worker(s))")
+
+    async def disable_lanes(self):
+        """ Dispatches whatever is queued, then returns publish to direct fan-out. """
+        lanes, self._lanes = self._lanes, None
+        if lanes is not None:
+            await lanes.join()
+            await lanes.close()
+            self._set_lane_weights(None)
+
+    def _set_lane_weights(self, weights: Optional[Dict[Optional[int], int]]):
+        self._lane_weights = weights
+        for subs in self.channels.values():
+            for sub in subs.values():
+                sub.lane_weights = weights
+
+    def set_topic_priority(self, pattern: str, priority: Priority):
+        """ Assigns a priority to a topic or wildcard pattern (e.g. 'cognition.#'). """
+        priority = Priority(priority)
+        previous = self._priorities.get(pattern)
+        if TopicTrie.is_wildcard(pattern):
+            if previous is not None:
+                self._priority_trie.remove(pattern, (pattern, previous))
+            self._priority_trie.insert(pattern, (pattern, priority))
+        self._priorities[pattern] = priority
+        self._priority_cache.clear()
+
+    def priority_for(self, topic: str, override: Optional[Priority] = None) -> Priority:
+        """
+        Per-envelope override first, then the exact topic, then the most urgent
+        matching wildcard pattern; NORMAL otherwise.
+        """
+        if override is not None:
+            return Priority(override)
+        priority = self._priority_cache.get(topic)
+        if priority is None:
+            priority = self._priorities.get(topic)
+            if priority is None:
+                matches = [p for _, p in self._priority_trie.match(topic)]
+                priority = min(matches) if matches else Priority.NORMAL
+            self._remember(self._priority_cache, topic, priority)
+        else:
+            self._priority_cache.move_to_end(topic)
+        return priority
+
+    def lane_stats(self) -> List[Dict[str, Any]]:
+        """ Per-lane depth, throughput and queueing latency. """
+        return self._lanes.stats() if self._lanes is not None else []
+
+    # --- Retention ---
+
+    def retain(self, pattern: str, max_count: Optional[int] = 1000, max_bytes: Optional[int] = None,
+               max_age: Optional[float] = None):
+        """
+        Keeps recent envelopes of every topic matching `pattern` (exact or
+        wildcard) in a per-topic ring, bounded by count, encoded bytes and/or
+        age in seconds, so `subscribe(..., replay_from=...)` can catch up.
+        Offsets are conductor-wide and increasing; each retained delivery
+        carries its offset in `meta["offset"]`.
+        """
+        spec = Retention(max_count=max_count, max_bytes=max_bytes, max_age=max_age)
+        previous = self._retention.get(pattern)
+        if TopicTrie.is_wildcard(pattern):
+            if previous is not None:
+                self._retention_trie.remove(pattern, pattern)
+            self._retention_trie.insert(pattern, pattern)
+        self._retention[pattern] = spec
+        self._reconfigure_rings()
+
+    def stop_retaining(self, pattern: str):
+        """ Forgets a retention pattern and the history only it was keeping. """
+        if self._retention.pop(pattern, None) is not None and TopicTrie.is_wildcard(pattern):
+            self._retention_trie.remove(pattern, pattern)
+        self._reconfigure_rings()
+
+    def _reconfigure_rings(self):
+        self._retention_cache.clear()
+        for topic in list(self._rings):
+            spec = self.retention_for(topic)
+            if spec is None:
+                del self._rings[topic]
+            else:
+                self._rings[topic].spec = spec
+
+    def retention_for(self, topic: str) -> Optional[Retention]:
+        """ The exact topic's retention, else the first-registered matching pattern's. """
+        try:
+            spec = self._retention_cache[topic]
+        except KeyError:
+            pass
+        else:
+            self._retention_cache.move_to_end(topic)
+            return spec
+        spec = self._retention.get(topic)
+        if spec is None and len(self._retention_trie):
+            matches = set(self._retention_trie.match(topic))
+            spec = next((s for p, s in self._retention.items() if p in matches), None)
+        self._remember(self._retention_cache, topic, spec)
+        return spec
+
+    def _retain(self, topic: str, envelopes: List[Envelope]):
+        spec = self.retention_for(topic)
+        if spec is None:
+            return
+        ring = self._rings.get(topic)
+        if ring is None:
+            ring = self._rings[topic] = RetentionRing(topic, spec)
+        now = get_clock().time()
+        for envelope in envelopes:
+            envelope = self._own(envelope)
+            envelope.meta["offset"] = self._next_offset
+            ring.append(self._next_offset, envelope, now)
+            self._next_offset += 1
+
+    def _backlog(self, pattern: str, replay_from: ReplayFrom) -> List[Tuple[str, EnvelopeView]]:
+        """ Retained envelopes of every topic matching `pattern`, in offset order. """
+        if TopicTrie.is_wildcard(pattern):
+            matcher = TopicTrie()
+            matcher.insert(pattern, pattern)
+            rings = [ring for topic, ring in self._rings.items() if matcher.match(topic)]
+        else:
+            rings = [self._rings[pattern]] if pattern in self._rings else []
+        now = get_clock().time()
+        merged = heapq.merge(*([(entry[0], ring.topic, entry[3]) for entry in ring.since(replay_from, now)]
+                               for ring in rings))
+        return [(topic, envelope.view()) for _, topic, envelope in merged]
+
+    async def _replay(self, sub: Subscription, backlog: List[Tuple[str, EnvelopeView]]):
+        """ Delivers the backlog, then whatever was held meanwhile, then goes live. """
+        try:
+            pending = backlog
+            while pending:
+                for topic, run in groupby(pending, key=lambda item: item[0]):
+                    tasks, rejected = [], []
+                    await self._deliver_to(sub, topic, [env for _, env in run], tasks, rejected)
+                    try:
+                        await self._settle(tasks, rejected)
+                    except BackpressureError:
+                        pass  # dropped by the subscription's own overflow policy (counted there)
+                pending, sub.held = sub.held, []
+        finally:
+            sub.held = None
+
+    def retention_stats(self) -> List[Dict[str, Any]]:
+        """ Per-topic retained count, bytes and offset range. """
+        return [ring.stats() for ring in self._rings.values()]
 
     # --- Job Registry Methods (The Governance Layer) ---
 
@@ -61,41 +962,73 @@ class AetherConductor:
         Registers a new Intent as a Job.
         """
         job_id = intent_data.get('id', str(uuid.uuid4()))
-
-        async with self._lock:
-            if job_id not in self._job_registry:
-                self._job_registry[job_id] = {
-                    "intent": intent_data,
-                    "status": initial_status,
-                    "history": [{
-                        "timestamp": time.time(),
-                        "status": initial_status,
-                        "note": "Job registered"
-                    }]
-                }
+        await self._jobs.register(job_id, intent_data, initial_status)
         return job_id
 
     async def update_job_status(self, job_id: str, new_status: str, note: str = "") -> bool:
         """ Updates the status of a tracked Job. """
-        async with self._lock:
-            if job_id in self._job_registry:
-                self._job_registry[job_id]["status"] = new_status
-                self._job_registry[job_id]["history"].append({
-                    "timestamp": time.time(),
-                    "status": new_status,
-                    "note": note
-                })
-                print(f"🔄 AetherBus: Job ID {job_id[:8]}... Status updated to: {new_status}")
-                return True
-            return False
+        if await self._jobs.update(job_id, new_status, note):
+            print(f"🔄 AetherBus: Job ID {job_id[:8]}... Status updated to: {new_status}")
+            return True
+        return False
+
+    async def enable_persistence(self, directory: str, **wal_options) -> int:
+        """
+        Makes the Job Registry durable: every register/update is appended to a
+        segmented WAL in `directory` (group-committed fsync), and the registry
+        is rebuilt from the latest snapshot + log tail. Returns recovered jobs.
+        A snapshot is taken automatically every `checkpoint_records` records
+        (a JobWAL option), so the tail replayed on restart stays short.
+        """
+        recovered = await self._jobs.attach_wal(JobWAL(directory, **wal_options))
+        print(f"💾 AetherBus: Job Registry persisted at {directory} ({recovered} job(s) recovered)")
+        return recovered
+
+    async def checkpoint_jobs(self) -> int:
+        """ Snapshots the registry so recovery only replays newer log records. """
+        return await self._jobs.checkpoint()
 
     async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """ Retrieves job details. """
-        async with self._lock:
-            # Return a copy to prevent mutation outside lock
-            data = self._job_registry.get(job_id)
-            if data:
-                return data.copy()
-            return None
+        """
+        Retrieves job details (lock-free). Only the most recent transitions are
+        kept verbatim; older ones are summarised under 'history_summary'.
+        """
+        return self._jobs.snapshot(job_id)
+
+    async def get_job(self, job_id: str) -> Optional[JobView]:
+        """ Read-only live view of a job (no copy). """
+        return self._jobs.view(job_id)
+
+    async def list_jobs(self, status: Optional[str] = None, intent_type: Optional[str] = None,
+                        since: Optional[float] = None, until: Optional[float] = None,
+                        order_by: str = "created", limit: int = 100,
+                        cursor: Optional[str] = None) -> Tuple[List[JobView], Optional[str]]:
+        """
+        Index-backed job listing. Returns (views, next_cursor); pass next_cursor
+        back to fetch the following page.
+        """
+        return self._jobs.query(status=status, intent_type=intent_type, since=since, until=until,
+                                order_by=order_by, limit=limit, cursor=cursor)
+
+    async def count_jobs(self, status: Optional[str] = None, intent_type: Optional[str] = None) -> int:
+        """ e.g. count_jobs(status="INTENT_GENERATED") without scanning the registry. """
+        return self._jobs.count(status=status, intent_type=intent_type)
+
+    def wait_for_job(self, job_id: str, statuses: Iterable[str],
+                     timeout: Optional[float] = None) -> Awaitable[Dict[str, Any]]:
+        """
+        Waits (without polling) until the job reaches one of `statuses`;
+        returns the matching history entry. Raises asyncio.TimeoutError.
+        The wait starts with this call, not when the result is awaited.
+        """
+        return self._jobs.wait_for(job_id, statuses, timeout)
+
+    def watch_job(self, job_id: str, statuses: Optional[Iterable[str]] = None,
+                  until: Optional[Iterable[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        async for transition in conductor.watch_job(job_id, until={"COMPLETED"}): ...
+        Transitions made after this call are seen, even before iteration starts.
+        """
+        return self._jobs.watch(job_id, statuses=statuses, until=until)
 
 conductor = AetherConductor()
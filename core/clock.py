@@ -0,0 +1,151 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Clock:
+    """ Wall-clock time for agents; see VirtualClock for simulations. """
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class VirtualClock(Clock):
+    """ Time as seen inside a VirtualClockLoop: starts at `start`, advances with the loop. """
+
+    def __init__(self, loop: 'VirtualClockLoop', start: datetime):
+        self._loop = loop
+        self.start = start
+
+    def time(self) -> float:
+        return self.start.timestamp() + self._loop.time()
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self._loop.time())
+
+
+class _VirtualSelector:
+    """
+    Wraps the loop's selector: ready I/O is still polled for real, but when
+    the loop would otherwise block until its next timer, virtual time jumps
+    straight to that timer instead of sleeping. While real work is in flight
+    (see VirtualClockLoop.waiting_on_real_work) it waits for real instead,
+    and virtual time moves by the real time that passed.
+    """
+
+    def __init__(self, selector, loop: 'VirtualClockLoop'):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout: Optional[float] = None):
+        events = self._selector.select(0)
+        if events:
+            return events
+        if timeout is None:
+            # No timers at all: only real I/O (threads, sockets) can wake us
+            return self._selector.select(None)
+        if timeout > 0:
+            if self._loop.waiting_on_real_work():
+                started = time.monotonic()
+                events = self._selector.select(timeout)
+                self._loop.advance(min(time.monotonic() - started, timeout))
+                return events
+            self._loop.advance(timeout)
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose clock only moves when every task is idle, jumping to
+    the next scheduled timer. asyncio.sleep, wait_for, call_later and the
+    conductor's deadlines/backoffs all run on this clock, so a day of agent
+    activity completes as fast as the CPU work allows, in a reproducible
+    order.
+
+    Jumps are suspended while executor jobs (asyncio.to_thread, the job WAL)
+    are running or any file descriptor is registered with the loop (sockets,
+    servers, subprocess pipes): time then passes at the real rate, so such
+    work is never timed out early. Simulations that keep a server or
+    connection open for their whole run therefore run in real time.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        super().__init__()
+        self._virtual_now = 0.0
+        self._executor_jobs = 0
+        # The loop's own wake-up pipe is always registered
+        self._idle_fds = len(self._selector.get_map())
+        self._selector = _VirtualSelector(self._selector, self)
+        self.clock = VirtualClock(self, start or datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    def time(self) -> float:
+        return self._virtual_now
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self._executor_jobs += 1
+        future.add_done_callback(self._executor_job_done)
+        return future
+
+    def _executor_job_done(self, future):
+        self._executor_jobs -= 1
+
+    def waiting_on_real_work(self) -> bool:
+        """ True while threads or registered I/O are in flight (virtual time must not jump). """
+        return self._executor_jobs > 0 or len(self._selector.get_map()) > self._idle_fds
+
+    def advance(self, seconds: float):
+        """ Moves virtual time forward (timers due by then fire on the next iteration). """
+        if seconds < 0:
+            raise ValueError("Virtual time cannot go backwards")
+        self._virtual_now += seconds
+
+
+def get_clock() -> Clock:
+    """ The virtual clock when running inside a simulation, else the system clock. """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return SYSTEM_CLOCK
+    return loop.clock if isinstance(loop, VirtualClockLoop) else SYSTEM_CLOCK
+
+
+def simulate(main: Awaitable[T], start: Optional[datetime] = None, seed: Optional[int] = None) -> T:
+    """
+    Runs `main` on a VirtualClockLoop (like asyncio.run), e.g.
+
+        simulate(scenario(), start=datetime(2025, 1, 1, tzinfo=timezone.utc), seed=7)
+
+    `seed` seeds `random` so agents that roll dice replay identically.
+    """
+    if seed is not None:
+        random.seed(seed)
+    loop = VirtualClockLoop(start)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Union
+
+from .envelope import Envelope
+
+KeyFunc = Callable[[str, Envelope], Hashable]
+MergeFunc = Callable[[Envelope, Envelope], Envelope]
+
+_KEYS: Dict[str, KeyFunc] = {
+    "flow_id": lambda topic, env: env.flow_id,
+    "sender_id": lambda topic, env: env.sender_id,
+    "topic": lambda topic, env: topic,
+}
+
+
+class Coalesce:
+    """
+    Subscription option: collapse bursts per key into one delivery.
+
+    Envelopes sharing a key (``flow_id``, ``sender_id``, ``topic`` or a
+    callable(topic, envelope)) within ``window`` seconds are delivered once:
+    the latest envelope, or ``merge(previous, latest)`` folded over the burst.
+    With ``debounce=True`` the window restarts on every new envelope (quiet
+    period), capped by ``max_wait`` so a constant stream still gets through.
+    """
+
+    def __init__(self, window: float = 0.05, key: Union[str, KeyFunc] = "flow_id",
+                 merge: Optional[MergeFunc] = None, debounce: bool = False,
+                 max_wait: Optional[float] = None):
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        if isinstance(key, str):
+            if key not in _KEYS:
+                raise ValueError(f"Unknown coalesce key '{key}' (use {sorted(_KEYS)} or a callable)")
+            key = _KEYS[key]
+        self.window = window
+        self.key = key
+        self.merge = merge
+        self.debounce = debounce
+        self.max_wait = max_wait if max_wait is not None else window * 10
+
+
+class _Slot:
+    __slots__ = ("topic", "envelope", "first_seen", "timer", "count")
+
+    def __init__(self, topic: str, envelope: Envelope, first_seen: float):
+        self.topic = topic
+        self.envelope = envelope
+        self.first_seen = first_seen
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.count = 1
+
+
+class Coalescer:
+    """ Per-subscription runtime for a Coalesce spec. """
+
+    def __init__(self, spec: Coalesce, deliver: Callable[[str, Envelope], Awaitable[Any]]):
+        self.spec = spec
+        self.deliver = deliver
+        self._slots: Dict[Hashable, _Slot] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # --- Counters ---
+        self.received = 0
+        self.flushed = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def offer(self, topic: str, envelope: Envelope):
+        self.received += 1
+        key = self.spec.key(topic, envelope)
+        slot = self._slots.get(key)
+        now = asyncio.get_running_loop().time()
+
+        if slot is None:
+            slot = self._slots[key] = _Slot(topic, envelope, now)
+            self._arm(key, slot, self.spec.window)
+            return
+
+        slot.count += 1
+        slot.topic = topic
+        slot.envelope = self.spec.merge(slot.envelope, envelope) if self.spec.merge else envelope
+        if self.spec.debounce:
+            slot.timer.cancel()
+            remaining = self.spec.max_wait - (now - slot.first_seen)
+            self._arm(key, slot, max(min(self.spec.window, remaining), 0))
+
+    def _arm(self, key: Hashable, slot: _Slot, delay: float):
+        slot.timer = asyncio.get_running_loop().call_later(delay, self._fire, key)
+
+    def _fire(self, key: Hashable):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        if slot.timer is not None:
+            slot.timer.cancel()
+        self.flushed += 1
+        task = asyncio.create_task(self.deliver(slot.topic, slot.envelope))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """ Delivers every pending window now and waits for the deliveries. """
+        for key in list(self._slots):
+            self._fire(key)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def close(self):
+        """ Discards pending windows and cancels in-flight deliveries. """
+        for slot in self._slots.values():
+            if slot.timer is not None:
+                slot.timer.cancel()
+        self._slots.clear()
+        tasks, self._tasks = list(self._tasks), set()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._slots), "received": self.received, "flushed": self.flushed}
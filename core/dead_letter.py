@@ -0,0 +1,140 @@
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .envelope import Envelope
+
+
+class RetryPolicy:
+    """
+    Exponential backoff: attempt n (1-based) waits base_delay * factor**(n-1),
+    capped at max_delay, with +/- `jitter` fraction of randomisation.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, factor: float = 2.0,
+                 max_delay: float = 30.0, jitter: float = 0.0):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def should_retry(self, attempts: int) -> bool:
+        return attempts < self.max_attempts
+
+    def delay(self, attempts: int) -> float:
+        delay = min(self.base_delay * self.factor ** (attempts - 1), self.max_delay)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(delay, 0.0)
+
+
+class DeadLetter:
+    __slots__ = ("key", "topic", "envelope", "handler", "subscription_id", "outcome",
+                 "error", "attempts", "first_failed", "last_failed", "retrying")
+
+    def __init__(self, key: str, topic: str, envelope: Envelope, handler: str,
+                 subscription_id: Optional[int]):
+        self.key = key
+        self.topic = topic
+        self.envelope = envelope
+        self.handler = handler
+        self.subscription_id = subscription_id   # None: the publish itself failed
+        self.outcome = ""
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.first_failed = time.time()
+        self.last_failed = self.first_failed
+        self.retrying = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "topic": self.topic,
+            "msg_id": self.envelope.msg_id,
+            "flow_id": self.envelope.flow_id,
+            "handler": self.handler,
+            "subscription": self.subscription_id,
+            "outcome": self.outcome,
+            "error": self.error,
+            "attempts": self.attempts,
+            "first_failed": self.first_failed,
+            "last_failed": self.last_failed,
+            "retrying": self.retrying,
+        }
+
+
+class DeadLetterStore:
+    """
+    Bounded store of failed deliveries, keyed per (handler, envelope) so
+    repeated failures of the same delivery bump one record's attempt count.
+    The oldest records are evicted once `maxlen` is reached.
+    """
+
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._letters: 'OrderedDict[str, DeadLetter]' = OrderedDict()
+
+        # --- Counters ---
+        self.recorded = 0
+        self.resolved = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key_for(subscription_id: Optional[int], envelope: Envelope) -> str:
+        owner = "publish" if subscription_id is None else str(subscription_id)
+        return f"{owner}:{envelope.msg_id}"
+
+    def record(self, topic: str, envelope: Envelope, handler: str, subscription_id: Optional[int],
+               outcome: str, error: Optional[BaseException] = None) -> DeadLetter:
+        key = self.key_for(subscription_id, envelope)
+        letter = self._letters.get(key)
+        if letter is None:
+            letter = DeadLetter(key, topic, envelope, handler, subscription_id)
+            self._letters[key] = letter
+            if len(self._letters) > self.maxlen:
+                self._letters.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._letters.move_to_end(key)
+        letter.outcome = outcome
+        letter.error = repr(error) if error is not None else None
+        letter.attempts += 1
+        letter.last_failed = time.time()
+        self.recorded += 1
+        return letter
+
+    def resolve(self, key: str) -> bool:
+        """ Drops a record whose delivery finally succeeded. """
+        if self._letters.pop(key, None) is None:
+            return False
+        self.resolved += 1
+        return True
+
+    def get(self, key: str) -> Optional[DeadLetter]:
+        return self._letters.get(key)
+
+    def list(self, topic: Optional[str] = None, handler: Optional[str] = None,
+             include_retrying: bool = False) -> List[DeadLetter]:
+        return [l for l in self._letters.values()
+                if (topic is None or l.topic == topic)
+                and (handler is None or l.handler == handler)
+                and (include_retrying or not l.retrying)]
+
+    def clear(self):
+        self._letters.clear()
+
+    def __len__(self) -> int:
+        return len(self._letters)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._letters),
+            "retrying": sum(1 for l in self._letters.values() if l.retrying),
+            "recorded": self.recorded,
+            "resolved": self.resolved,
+            "evicted": self.evicted,
+        }
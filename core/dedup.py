@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+
+class Deduplicator(ABC):
+    """
+    Drops envelopes whose msg_id was already published within `window`
+    seconds. An id is claimed when publish starts, committed once the
+    envelope is dispatched, and released if it was refused before dispatch
+    (so the sender's retry goes through). Subclasses decide how committed
+    ids are remembered.
+    """
+
+    mode = "abstract"
+
+    def __init__(self, window: float = 60.0):
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        self.window = window
+        self._inflight: Set[str] = set()
+
+        # --- Counters ---
+        self.checked = 0
+        self.dropped = 0
+        self.dropped_by_topic: Dict[str, int] = {}
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
+
+    def claim(self, msg_id: str, topic: str) -> bool:
+        """ False if msg_id is a duplicate (already seen or still in flight). """
+        self.checked += 1
+        if msg_id in self._inflight or self._seen(msg_id, self._now()):
+            self.dropped += 1
+            self.dropped_by_topic[topic] = self.dropped_by_topic.get(topic, 0) + 1
+            return False
+        self._inflight.add(msg_id)
+        return True
+
+    def commit(self, msg_id: str):
+        self._inflight.discard(msg_id)
+        self._add(msg_id, self._now())
+
+    def release(self, msg_id: str):
+        self._inflight.discard(msg_id)
+
+    @abstractmethod
+    def _seen(self, msg_id: str, now: float) -> bool:
+        """ True if msg_id was committed within the window. """
+
+    @abstractmethod
+    def _add(self, msg_id: str, now: float):
+        """ Remembers a committed msg_id. """
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "window": self.window,
+            "checked": self.checked,
+            "dropped": self.dropped,
+            "dropped_by_topic": dict(self.dropped_by_topic),
+            "in_flight": len(self._inflight),
+        }
+
+
+class WindowDedup(Deduplicator):
+    """
+    Exact time-windowed set. Memory is capped at `max_entries` ids; beyond
+    that the oldest ids are forgotten early (the window shrinks under load).
+    """
+
+    mode = "exact"
+
+    def __init__(self, window: float = 60.0, max_entries: int = 100000):
+        super().__init__(window)
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self._expiry: 'OrderedDict[str, float]' = OrderedDict()   # insertion order == expiry order
+        self.evicted_early = 0
+
+    def _expire(self, now: float):
+        expiry = self._expiry
+        while expiry and next(iter(expiry.values())) <= now:
+            expiry.popitem(last=False)
+
+    def _seen(self, msg_id: str, now: float) -> bool:
+        self._expire(now)
+        return msg_id in self._expiry
+
+    def _add(self, msg_id: str, now: float):
+        self._expire(now)
+        self._expiry[msg_id] = now + self.window
+        self._expiry.move_to_end(msg_id)
+        while len(self._expiry) > self.max_entries:
+            self._expiry.popitem(last=False)
+            self.evicted_early += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "entries": len(self._expiry), "evicted_early": self.evicted_early}
+
+
+class BloomDedup(Deduplicator):
+    """
+    Two rotating Bloom filter generations for very high id cardinality:
+    fixed memory, ids are remembered for one to two windows (a generation
+    also rotates early once it holds `capacity` ids), and up to roughly
+    `error_rate` of unique envelopes are dropped as false positives.
+    """
+
+    mode = "bloom"
+
+    def __init__(self, window: float = 60.0, capacity: int = 1000000, error_rate: float = 0.001):
+        super().__init__(window)
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.bits / capacity * math.log(2))))
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+        self._rotated_at: Optional[float] = None
+        self.rotations = 0
+
+    def _positions(self, msg_id: str):
+        digest = hashlib.blake2b(msg_id.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _test(generation: bytearray, positions) -> bool:
+        return all(generation[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def _rotate(self, now: float):
+        if self._rotated_at is None:
+            self._rotated_at = now
+        elif now - self._rotated_at >= self.window or self._count >= self.capacity:
+            self._previous = self._current
+            self._current = bytearray(len(self._previous))
+            self._count = 0
+            self._rotated_at = now
+            self.rotations += 1
+
+    def _seen(self, msg_id: str, now: float) -> bool:
+        self._rotate(now)
+        positions = self._positions(msg_id)
+        return self._test(self._current, positions) or self._test(self._previous, positions)
+
+    def _add(self, msg_id: str, now: float):
+        self._rotate(now)
+        for p in self._positions(msg_id):
+            self._current[p >> 3] |= 1 << (p & 7)
+        self._count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "bits": self.bits, "hashes": self.hashes,
+                "generation_count": self._count, "rotations": self.rotations,
+                "memory_bytes": len(self._current) * 2}
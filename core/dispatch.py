@@ -0,0 +1,421 @@
+import asyncio
+import inspect
+import itertools
+import time
+import weakref
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, List, Optional, Dict, Any, Union, Iterable
+
+from .envelope import Envelope
+from .dead_letter import RetryPolicy
+from .coalesce import Coalesce, Coalescer
+from .clock import get_clock
+from .flows import FlowTracker
+
+
+class OverflowPolicy(Enum):
+    """What a queued subscription does when its buffer is full."""
+    BLOCK = "block"              # publisher waits for a free slot
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued envelope
+    REJECT = "reject"            # refuse the new envelope (BackpressureError)
+
+
+class BackpressureError(Exception):
+    """Raised by publish when one or more REJECT subscriptions are full."""
+
+    def __init__(self, topic: str, subscriptions: List['Subscription']):
+        self.topic = topic
+        self.subscriptions = subscriptions
+        names = ", ".join(s.name for s in subscriptions)
+        super().__init__(f"Backpressure on '{topic}': queue full for [{names}]")
+
+
+_subscription_ids = itertools.count(1)
+
+
+def earliest_deadline(envelopes: Iterable[Envelope]) -> Optional[float]:
+    deadlines = [env.deadline for env in envelopes if env.deadline is not None]
+    return min(deadlines) if deadlines else None
+
+
+def _lane_of(envelope: Union[Envelope, List[Envelope]]) -> Optional[int]:
+    # meta["priority"] is stamped by the conductor's lane scheduler
+    if isinstance(envelope, list):
+        lanes = [env.meta.get("priority") for env in envelope]
+        lanes = [lane for lane in lanes if lane is not None]
+        return min(lanes) if lanes else None
+    return envelope.meta.get("priority")
+
+
+class _LaneBuffer:
+    """
+    Storage of a subscription queue: one FIFO per priority lane, drained by
+    smooth weighted round-robin (the lane scheduler's order), so envelopes
+    that reach a queued subscription keep their priority. Without weights
+    (lanes disabled) everything shares one FIFO.
+    """
+
+    def __init__(self, weights: Callable[[], Optional[Dict[Optional[int], int]]]):
+        self._weights = weights
+        self._lanes: Dict[Optional[int], Deque[tuple]] = {}
+        self._credit: Dict[Optional[int], int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: tuple):
+        lane = _lane_of(item[1]) if self._weights() else None
+        self._lanes.setdefault(lane, deque()).append(item)
+        self._size += 1
+
+    def popleft(self) -> tuple:
+        ready = [lane for lane, items in self._lanes.items() if items]
+        if len(ready) == 1:
+            best = ready[0]
+        else:
+            weights = self._weights() or {}
+            best, total = None, 0
+            for lane in ready:
+                weight = weights.get(lane, 1)
+                self._credit[lane] = self._credit.get(lane, 0) + weight
+                total += weight
+                if best is None or self._credit[lane] > self._credit[best]:
+                    best = lane
+            self._credit[best] -= total
+        self._size -= 1
+        return self._lanes[best].popleft()
+
+    def evict(self) -> tuple:
+        """ Removes the oldest item of the least urgent (lowest weight) lane. """
+        weights = self._weights() or {}
+        ready = [lane for lane, items in self._lanes.items() if items]
+        lane = min(ready, key=lambda l: weights.get(l, 1))
+        self._size -= 1
+        return self._lanes[lane].popleft()
+
+
+class _LaneQueue(asyncio.Queue):
+    """ asyncio.Queue over a _LaneBuffer (see asyncio.PriorityQueue for the pattern). """
+
+    def __init__(self, maxsize: int, weights: Callable[[], Optional[Dict[Optional[int], int]]]):
+        self._lane_weights = weights
+        super().__init__(maxsize)
+
+    def _init(self, maxsize):
+        self._queue = _LaneBuffer(self._lane_weights)
+
+    def evict_nowait(self):
+        item = self._queue.evict()
+        self.task_done()
+        return item
+
+
+class Subscription:
+    """
+    A handler attached to a topic.
+
+    With ``max_queue == 0`` the handler is dispatched inline by the conductor
+    (legacy behaviour). With ``max_queue > 0`` the subscription owns a bounded
+    queue drained by ``workers`` long-lived tasks, and publish returns as soon
+    as the envelope is enqueued.
+
+    Batch subscriptions receive a list of envelopes per publish call;
+    with_topic subscriptions are called as handler(topic, envelope), which
+    lets bridges forward wildcard traffic under its concrete topic.
+
+    ``timeout`` is the handler's budget per delivery; an envelope's own
+    ``deadline`` can shorten it. Overdue handlers are cancelled, and every
+    failure is contained and counted here rather than raised to siblings.
+    Failures are also passed to ``on_failure`` (the conductor's dead-letter
+    hook), which retries them according to ``retry``.
+
+    With ``coalesce`` set, bursts are collapsed per key before they reach
+    the handler (or its queue); see Coalesce.
+
+    While the conductor's priority lanes are enabled it sets ``lane_weights``,
+    and the queue is drained lane by lane in weighted order rather than FIFO.
+
+    The subscription is also the caller's handle: ``await sub.unsubscribe()``
+    (or ``async with``) detaches it. With ``weak=True`` only a weak reference
+    to the handler is kept, and the subscription detaches itself once the
+    handler's owner is garbage-collected.
+    """
+
+    def __init__(self, topic: str, handler: Callable, max_queue: int = 0,
+                 workers: int = 1, overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+                 batch: bool = False, with_topic: bool = False, timeout: Optional[float] = None,
+                 retry: Optional[RetryPolicy] = None, coalesce: Optional[Coalesce] = None,
+                 weak: bool = False):
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if with_topic and (max_queue or batch):
+            raise ValueError("with_topic is only supported for inline, per-envelope subscriptions")
+        if coalesce is not None and batch:
+            raise ValueError("coalesce cannot be combined with batch delivery")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be > 0")
+
+        self.id = next(_subscription_ids)
+        self.topic = topic
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.weak = weak
+        if weak:
+            ref = weakref.WeakMethod if inspect.ismethod(handler) else weakref.ref
+            self._handler_ref = ref(handler, self._handler_collected)
+            self._handler = None
+        else:
+            self._handler_ref = None
+            self._handler = handler
+        self.max_queue = max_queue
+        self.workers = workers
+        self.overflow = OverflowPolicy(overflow)
+        self.batch = batch
+        self.with_topic = with_topic
+        self.timeout = timeout
+        self.retry = retry
+        # on_failure(sub, topic, envelope_or_batch, outcome, error)
+        self.on_failure: Optional[Callable] = None
+        # on_unsubscribe(sub) -> awaitable bool, set by the owning conductor
+        self.on_unsubscribe: Optional[Callable] = None
+        # on_collected(sub), called (from the garbage collector) when a weak handler dies
+        self.on_collected: Optional[Callable] = None
+        # The conductor's FlowTracker (in-flight handlers per flow_id, see cancel_flow)
+        self.flows: Optional[FlowTracker] = None
+        # priority (meta["priority"], None if unstamped) -> weight, while lanes are enabled
+        self.lane_weights: Optional[Dict[Optional[int], int]] = None
+        self.active = True
+        self.coalescer = Coalescer(coalesce, self._deliver_coalesced) if coalesce is not None else None
+        # (topic, envelope) published while a retention replay is still running
+        self.held: Optional[List[tuple]] = None
+
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+        # --- Counters ---
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.timed_out = 0     # cancelled after exceeding the budget
+        self.expired = 0       # envelope deadline passed before the handler started
+        self.cancelled = 0     # dropped or interrupted by cancel_flow
+        self.max_elapsed = 0.0
+        self.last_incident: Optional[Dict[str, Any]] = None
+
+    @property
+    def queued(self) -> bool:
+        return self.max_queue > 0
+
+    @property
+    def handler(self) -> Optional[Callable]:
+        """ The handler, or None once a weakly held handler was collected. """
+        return self._handler if self._handler_ref is None else self._handler_ref()
+
+    def __repr__(self) -> str:
+        return f"<Subscription #{self.id} {self.topic!r} -> {self.name}>"
+
+    # --- Handle ---
+
+    async def unsubscribe(self) -> bool:
+        """ Detaches from the conductor and stops the workers; False if already detached. """
+        if self.on_unsubscribe is not None:
+            return await self.on_unsubscribe(self)
+        if not self.active:
+            return False
+        self.active = False
+        await self.close()
+        return True
+
+    async def __aenter__(self) -> 'Subscription':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.unsubscribe()
+
+    def _handler_collected(self, ref):
+        self.active = False
+        if self.on_collected is not None:
+            self.on_collected(self)
+
+    # --- Execution ---
+
+    async def run(self, args: tuple, deadline: Optional[float] = None,
+                  topic: Optional[str] = None) -> bool:
+        """
+        Calls the handler within its budget. Never raises (except for
+        cancellation of the caller); returns True if the handler completed.
+        """
+        handler = self.handler
+        if handler is None:
+            return False  # weak handler's owner is gone; detaching is under way
+        flows = self.flows
+        payload = args[-1]
+        if flows is not None and flows.dropping:
+            if self.batch:
+                kept = [env for env in payload if not flows.is_cancelled(env)]
+                if len(kept) < len(payload):
+                    self.cancelled += len(payload) - len(kept)
+                    if not kept:
+                        return False
+                    args = args[:-1] + (kept,)
+            elif flows.is_cancelled(payload):
+                self.cancelled += 1
+                return False
+        budget = self.timeout
+        if deadline is not None:
+            remaining = deadline - get_clock().time()
+            if remaining <= 0:
+                self.expired += 1
+                self._incident("expired", 0.0, budget)
+                self._failed(topic, args, "expired", None)
+                return False
+            budget = remaining if budget is None else min(budget, remaining)
+
+        # Batches mix flows: only single-envelope deliveries are cancellable per flow
+        task = asyncio.current_task() if flows is not None and not self.batch else None
+        if task is not None:
+            flows.track(payload.flow_id, task)
+        started = time.monotonic()
+        scope = None
+        try:
+            if budget is None:
+                await handler(*args)
+            else:
+                async with asyncio.timeout(budget) as scope:
+                    await handler(*args)
+            self.delivered += 1
+            return True
+        except asyncio.CancelledError:
+            if task is not None and flows.claim(task):
+                # cancel_flow, not our caller: absorb it so queue workers keep running
+                task.uncancel()
+                self.cancelled += 1
+                return False
+            raise
+        except asyncio.TimeoutError as e:
+            if scope is None or not scope.expired():
+                # Raised by the handler itself (e.g. an unanswered request): an ordinary failure
+                self._error(topic, args, started, budget, e)
+            else:
+                self.timed_out += 1
+                self._incident("timeout", time.monotonic() - started, budget)
+                print(f"⏱️ AetherBus: Handler {self.name} exceeded its {budget:.3f}s budget on '{self.topic}' (cancelled)")
+                self._failed(topic, args, "timeout", None)
+        except Exception as e:
+            self._error(topic, args, started, budget, e)
+        finally:
+            if task is not None:
+                flows.untrack(payload.flow_id, task)
+                if flows.claim(task):
+                    task.uncancel()  # the handler swallowed the cancellation itself
+            self.max_elapsed = max(self.max_elapsed, time.monotonic() - started)
+        return False
+
+    def _error(self, topic: Optional[str], args: tuple, started: float,
+               budget: Optional[float], error: Exception):
+        self.failed += 1
+        self._incident("error", time.monotonic() - started, budget, error)
+        print(f"⚠️ AetherBus: Handler {self.name} failed on '{self.topic}': {error}")
+        self._failed(topic, args, "error", error)
+
+    def _failed(self, topic: Optional[str], args: tuple, outcome: str, error: Optional[BaseException]):
+        if self.on_failure is not None:
+            self.on_failure(self, topic or self.topic, args[-1], outcome, error)
+
+    def _incident(self, outcome: str, elapsed: float, budget: Optional[float],
+                  error: Optional[BaseException] = None):
+        self.last_incident = {
+            "outcome": outcome,
+            "elapsed": elapsed,
+            "budget": budget,
+            "error": repr(error) if error is not None else None,
+            "at": time.time(),
+        }
+
+    async def _deliver_coalesced(self, topic: str, envelope: Envelope):
+        envelope = envelope.view()  # merge() may have derived a fresh envelope
+        if self.queued:
+            if not await self.offer(envelope, topic):
+                self._failed(topic, (envelope,), "rejected", None)
+        else:
+            await self.run((topic, envelope) if self.with_topic else (envelope,), envelope.deadline, topic)
+
+    # --- Queued Dispatch ---
+
+    async def offer(self, envelope: Union[Envelope, List[Envelope]], topic: Optional[str] = None) -> bool:
+        """ Enqueues an envelope (or a batch) for the worker pool. Returns False if rejected. """
+        self._ensure_workers()
+        item = (topic, envelope)
+
+        if self.overflow is OverflowPolicy.BLOCK:
+            await self.queue.put(item)
+            return True
+
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.overflow is OverflowPolicy.REJECT:
+                self.rejected += 1
+                return False
+            # DROP_OLDEST: make room by evicting the oldest of the least urgent lane
+            self.queue.evict_nowait()
+            self.dropped += 1
+            self.queue.put_nowait(item)
+        return True
+
+    def _ensure_workers(self):
+        # Created lazily so the queue binds to the running loop
+        if self.queue is None:
+            self.queue = _LaneQueue(self.max_queue, lambda: self.lane_weights)
+        if not self._worker_tasks:
+            self._worker_tasks = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
+
+    async def _worker(self):
+        while True:
+            topic, envelope = await self.queue.get()
+            try:
+                deadline = earliest_deadline(envelope) if self.batch else envelope.deadline
+                await self.run((envelope,), deadline, topic)
+            finally:
+                self.queue.task_done()
+
+    async def join(self):
+        """ Waits until every queued envelope has been handled. """
+        if self.coalescer is not None:
+            await self.coalescer.flush()
+        if self.queue is not None:
+            await self.queue.join()
+
+    async def close(self):
+        """ Stops the worker pool. Envelopes still queued are discarded. """
+        if self.coalescer is not None:
+            await self.coalescer.close()
+        tasks, self._worker_tasks = self._worker_tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "topic": self.topic,
+            "handler": self.name,
+            "depth": self.queue.qsize() if self.queue is not None else 0,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "expired": self.expired,
+            "cancelled": self.cancelled,
+        }
+        if self.coalescer is not None:
+            stats["coalesce"] = self.coalescer.stats()
+        return stats
@@ -1,6 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from collections.abc import Mapping
+from types import MappingProxyType
 import uuid
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 from datetime import datetime, timezone
 from enum import Enum
 import hashlib
@@ -29,8 +31,166 @@ class Envelope:
     timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     flow_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     trace: List[str] = field(default_factory=list)
+    # Absolute epoch seconds (get_clock().time() under simulate) after which handlers should not (keep) running
+    deadline: Optional[float] = None
+    # Request/reply: where the answer goes and which request it answers
+    reply_to: Optional[str] = None
+    correlation_id: Optional[str] = None
+    # Conductor annotations (trust, quarantine, ...); never part of the payload
+    meta: Dict[str, Any] = field(default_factory=dict)
 
     # Devordota/Akashic Integrity
     def get_canonical_hash(self) -> str:
-        canonical_data = json.dumps(self.payload, sort_keys=True, separators=(',', ':'))
+        canonical_data = json.dumps(payload_dict(self.payload), sort_keys=True, separators=(',', ':'),
+                                    default=_unwrap_view)
         return hashlib.sha256(canonical_data.encode('utf-8')).hexdigest()
+
+    def view(self) -> 'EnvelopeView':
+        return EnvelopeView(self)
+
+
+# Annotations still readable under their legacy payload keys
+_LEGACY_KEYS = {"_quarantine": "quarantine"}
+
+
+class PayloadView(Mapping):
+    """
+    Read-only view of a payload dict (no copy). Conductor annotations kept
+    in `meta` are also visible under their legacy keys, e.g. '_quarantine'.
+    Only the top level is protected; nested containers are shared as-is.
+    """
+    __slots__ = ("_data", "_meta")
+
+    def __init__(self, data: Dict[str, Any], meta: Dict[str, Any]):
+        self._data = data
+        self._meta = meta
+
+    def _overlay(self) -> Dict[str, Any]:
+        return {legacy: self._meta[name] for legacy, name in _LEGACY_KEYS.items()
+                if self._meta.get(name) and legacy not in self._data}
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            name = _LEGACY_KEYS.get(key)
+            if name is not None and self._meta.get(name):
+                return self._meta[name]
+            raise
+
+    def __contains__(self, key) -> bool:
+        if key in self._data:
+            return True
+        name = _LEGACY_KEYS.get(key)
+        return name is not None and bool(self._meta.get(name))
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._data
+        yield from self._overlay()
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._overlay())
+
+    def copy(self) -> Dict[str, Any]:
+        """ Shallow, mutable copy of the payload itself (annotations excluded). """
+        return dict(self._data)
+
+    def __repr__(self) -> str:
+        # Reads like the legacy payload dict (dashboards print payloads)
+        return repr(dict(self))
+
+
+def payload_dict(payload) -> Dict[str, Any]:
+    """ The underlying dict of a payload or PayloadView (no copy). """
+    return payload._data if isinstance(payload, PayloadView) else payload
+
+
+def _unwrap_view(obj) -> Dict[str, Any]:
+    if isinstance(obj, PayloadView):
+        return obj._data
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_default(obj) -> Any:
+    """
+    json.dumps hook for the codecs: PayloadViews (at any depth) and other
+    mappings encode as dicts, enums as their value, datetimes in ISO 8601.
+    Anything else raises TypeError, as json.dumps itself would.
+    """
+    if isinstance(obj, PayloadView):
+        return obj._data
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class EnvelopeView:
+    """
+    Read-only face of an Envelope handed to subscribers. Every handler of a
+    publish shares one view of the publisher's envelope, so fan-out copies
+    nothing; `derive()` makes a mutable Envelope when a handler needs to
+    change something and forward it.
+    """
+    __slots__ = ("_env", "payload")
+
+    def __init__(self, envelope: Envelope):
+        object.__setattr__(self, "_env", envelope)
+        object.__setattr__(self, "payload", PayloadView(payload_dict(envelope.payload), envelope.meta))
+
+    def __getattr__(self, name):
+        return getattr(self._env, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"EnvelopeView is read-only (tried to set '{name}'); use derive()")
+
+    @property
+    def context_snapshot(self) -> Mapping:
+        return MappingProxyType(self._env.context_snapshot)
+
+    @property
+    def trace(self) -> tuple:
+        return tuple(self._env.trace)
+
+    @property
+    def meta(self) -> Mapping:
+        return MappingProxyType(self._env.meta)
+
+    def view(self) -> 'EnvelopeView':
+        return self
+
+    def unwrap(self) -> Envelope:
+        """ The original envelope (for the conductor re-publishing it unchanged). """
+        return self._env
+
+    def derive(self, payload_updates: Optional[Dict[str, Any]] = None, **changes) -> Envelope:
+        """
+        Copy-on-write: a new mutable Envelope (fresh msg_id and timestamp,
+        same flow) whose payload is a shallow copy with `payload_updates`
+        applied; any other field can be overridden through `changes`.
+        """
+        env = self._env
+        payload = changes.pop("payload", None)
+        if payload is None:
+            payload = dict(payload_dict(env.payload))
+        if payload_updates:
+            payload.update(payload_updates)
+        changes.setdefault("msg_id", str(uuid.uuid4()))
+        changes.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+        changes.setdefault("context_snapshot", dict(env.context_snapshot))
+        changes.setdefault("trace", list(env.trace))
+        changes.setdefault("meta", {})
+        return replace(env, payload=payload, **changes)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EnvelopeView):
+            other = other._env
+        return self._env == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EnvelopeView({self._env!r})"
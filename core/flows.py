@@ -0,0 +1,94 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Set
+
+from .envelope import Envelope
+
+
+class FlowTracker:
+    """
+    In-flight handler tasks per flow_id, plus cancellation cut-offs.
+
+    cancel(flow_id, upto) cancels the flow's running handlers and records
+    `upto`, the conductor sequence number (meta["seq"]) of the newest
+    envelope accepted so far: envelopes of that flow at or below it are
+    dropped wherever they are still waiting (queues, lanes, coalesce
+    windows), while the flow's later publishes go through as usual.
+    """
+
+    def __init__(self, max_cancelled: int = 10000):
+        self.max_cancelled = max_cancelled
+        self._tasks: Dict[str, Set[asyncio.Task]] = {}
+        self._cutoffs: 'OrderedDict[str, int]' = OrderedDict()
+        # Tasks cancelled on behalf of a flow (to tell them from shutdown/caller cancellation)
+        self._cancelling: Set[asyncio.Task] = set()
+
+        # --- Counters ---
+        self.cancels = 0
+        self.handlers_cancelled = 0
+        self.dropped = 0
+
+    def track(self, flow_id: str, task: asyncio.Task):
+        tasks = self._tasks.get(flow_id)
+        if tasks is None:
+            tasks = self._tasks[flow_id] = set()
+        tasks.add(task)
+
+    def untrack(self, flow_id: str, task: asyncio.Task):
+        tasks = self._tasks.get(flow_id)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del self._tasks[flow_id]
+
+    @property
+    def dropping(self) -> bool:
+        return bool(self._cutoffs)
+
+    def is_cancelled(self, envelope: Envelope) -> bool:
+        cutoff = self._cutoffs.get(envelope.flow_id)
+        if cutoff is None:
+            return False
+        seq = envelope.meta.get("seq")
+        if seq is not None and seq <= cutoff:
+            self.dropped += 1
+            return True
+        return False
+
+    def cancel(self, flow_id: str, upto: int) -> int:
+        """ Cancels the flow's running handlers; returns how many were cancelled. """
+        self.cancels += 1
+        self._cutoffs[flow_id] = upto
+        self._cutoffs.move_to_end(flow_id)
+        while len(self._cutoffs) > self.max_cancelled:
+            self._cutoffs.popitem(last=False)
+
+        cancelled = 0
+        current = asyncio.current_task()  # a handler cancelling its own flow finishes its own work
+        for task in list(self._tasks.get(flow_id, ())):
+            if task is not current and task not in self._cancelling and not task.done():
+                self._cancelling.add(task)
+                task.cancel()
+                cancelled += 1
+        self.handlers_cancelled += cancelled
+        return cancelled
+
+    def claim(self, task: asyncio.Task) -> bool:
+        """ True (once) if `task` was cancelled by cancel() rather than by its owner. """
+        if task in self._cancelling:
+            self._cancelling.discard(task)
+            return True
+        return False
+
+    def in_flight(self, flow_id: str) -> int:
+        return len(self._tasks.get(flow_id, ()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "flows_in_flight": len(self._tasks),
+            "handlers_in_flight": sum(len(tasks) for tasks in self._tasks.values()),
+            "cancels": self.cancels,
+            "handlers_cancelled": self.handlers_cancelled,
+            "dropped": self.dropped,
+            "cut_offs": len(self._cutoffs),
+        }
@@ -0,0 +1,61 @@
+import asyncio
+import uuid
+from typing import Dict
+
+from .envelope import Envelope
+
+INBOX_PREFIX = "_reply."
+
+
+def inbox_topic() -> str:
+    """ A fresh private inbox topic (conductor or client). """
+    return f"{INBOX_PREFIX}{uuid.uuid4().hex[:12]}"
+
+
+def is_inbox(topic: str) -> bool:
+    """
+    True for reply traffic. Transports publish it straight from their frame
+    reader, ahead of the publishes they are still dispatching: the handler
+    waiting for the reply may be the one holding those publishes up.
+    """
+    return topic.startswith(INBOX_PREFIX)
+
+
+class ReplyInbox:
+    """
+    The requester's half of request/reply for conductor clients
+    (RemoteConductor, WorkerBus): a private inbox topic, subscribed on the
+    parent conductor, plus correlation_id -> future.
+
+    The client hands frames for `topic` to resolve() straight from its
+    reader, ahead of the deliveries it is still dispatching, so a handler
+    waiting for a reply never holds that reply up behind itself.
+    """
+
+    def __init__(self):
+        self.topic = inbox_topic()
+        self.opened = False    # SUBSCRIBE sent (lazily, on the first request)
+        self._replies: Dict[str, asyncio.Future] = {}
+        self.late_replies = 0
+
+    def expect(self, envelope: Envelope) -> asyncio.Future:
+        """ Addresses `envelope` to this inbox and returns the future its reply resolves. """
+        envelope.reply_to = self.topic
+        envelope.correlation_id = envelope.correlation_id or envelope.msg_id
+        future = asyncio.get_running_loop().create_future()
+        self._replies[envelope.correlation_id] = future
+        return future
+
+    def forget(self, envelope: Envelope):
+        self._replies.pop(envelope.correlation_id, None)
+
+    def resolve(self, envelope: Envelope):
+        future = self._replies.get(envelope.correlation_id)
+        if future is None or future.done():
+            # Requester timed out or a duplicate answer arrived
+            self.late_replies += 1
+            return
+        future.set_result(envelope.view())
+
+    def __len__(self) -> int:
+        return len(self._replies)
@@ -0,0 +1,637 @@
+import asyncio
+import bisect
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .job_wal import JobWAL
+
+# (timestamp, status, note)
+Transition = Tuple[float, str, str]
+
+
+class JobRecord:
+    """
+    One tracked Job. Recent transitions live in a plain list, which becomes
+    a fixed-size ring only once it reaches `history_limit` (most jobs never
+    get there, and a list is a fraction of a deque's size); anything older
+    is folded into a compact per-status summary.
+    """
+    __slots__ = ("job_id", "intent", "status", "created_at", "updated_at",
+                 "history", "folded", "folded_counts", "folded_since", "folded_until")
+
+    def __init__(self, job_id: str, intent: Dict[str, Any], status: str,
+                 timestamp: float, note: str = "Job registered"):
+        self.job_id = job_id
+        self.intent = intent
+        self.status = status
+        self.created_at = timestamp
+        self.updated_at = timestamp
+        self.history: Union[List[Transition], Deque[Transition]] = [(timestamp, status, note)]
+        self.folded = 0
+        self.folded_counts: Optional[Dict[str, int]] = None
+        self.folded_since: Optional[float] = None
+        self.folded_until: Optional[float] = None
+
+    def transition(self, status: str, note: str, timestamp: float, history_limit: int):
+        history = self.history
+        if len(history) >= history_limit:
+            if type(history) is list:
+                history = self.history = deque(history[-history_limit:], maxlen=history_limit)
+            self._fold(history[0])
+        history.append((timestamp, status, note))
+        self.status = status
+        self.updated_at = timestamp
+
+    def _fold(self, entry: Transition):
+        ts, status, _ = entry
+        if self.folded_counts is None:
+            self.folded_counts = {}
+            self.folded_since = ts
+        self.folded_counts[status] = self.folded_counts.get(status, 0) + 1
+        self.folded_until = ts
+        self.folded += 1
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if not self.folded:
+            return None
+        return {
+            "folded": self.folded,
+            "status_counts": dict(self.folded_counts),
+            "since": self.folded_since,
+            "until": self.folded_until,
+        }
+
+    def to_state(self) -> List[Any]:
+        """ Compact, JSON-friendly form used by WAL snapshots. """
+        return [self.job_id, self.intent, self.status, self.created_at, self.updated_at,
+                list(self.history), self.folded, self.folded_counts,
+                self.folded_since, self.folded_until]
+
+    @classmethod
+    def from_state(cls, state: List[Any], history_limit: int) -> 'JobRecord':
+        (job_id, intent, status, created_at, updated_at, history,
+         folded, folded_counts, folded_since, folded_until) = state
+        record = cls.__new__(cls)
+        record.job_id = job_id
+        record.intent = intent
+        record.status = status
+        record.created_at = created_at
+        record.updated_at = updated_at
+        history = [tuple(h) for h in history[-history_limit:]]
+        record.history = deque(history, maxlen=history_limit) if len(history) >= history_limit else history
+        record.folded = folded
+        record.folded_counts = folded_counts
+        record.folded_since = folded_since
+        record.folded_until = folded_until
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "intent": self.intent,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "history": [
+                {"timestamp": ts, "status": status, "note": note}
+                for ts, status, note in self.history
+            ],
+        }
+        summary = self.summary()
+        if summary:
+            data["history_summary"] = summary
+        return data
+
+
+class JobView:
+    """
+    Lightweight, read-only window onto a live JobRecord (no copying).
+    Attribute values always reflect the job's current state.
+    """
+    __slots__ = ("_record",)
+
+    def __init__(self, record: JobRecord):
+        self._record = record
+
+    job_id = property(lambda self: self._record.job_id)
+    status = property(lambda self: self._record.status)
+    created_at = property(lambda self: self._record.created_at)
+    updated_at = property(lambda self: self._record.updated_at)
+
+    @property
+    def intent(self) -> Mapping[str, Any]:
+        return MappingProxyType(self._record.intent)
+
+    @property
+    def intent_type(self) -> Optional[str]:
+        return _intent_type(self._record.intent)
+
+    @property
+    def history(self) -> Tuple[Transition, ...]:
+        return tuple(self._record.history)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._record.to_dict()
+
+    def __repr__(self) -> str:
+        return f"<JobView {self.job_id} {self.status}>"
+
+
+def _intent_type(intent: Any) -> Optional[str]:
+    return intent.get("type") if isinstance(intent, dict) else None
+
+
+class _TimeIndex:
+    """
+    Append-only (timestamp, job_id) log searchable with bisect.
+
+    Entries superseded by a newer timestamp for the same job are skipped on
+    read (`current` decides) and dropped when the log is compacted.
+    """
+    __slots__ = ("times", "ids", "stale")
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.ids: List[str] = []
+        self.stale = 0
+
+    def add(self, ts: float, job_id: str):
+        if self.times and ts < self.times[-1]:
+            # Clock stepped backwards: keep the log sorted
+            i = bisect.bisect_right(self.times, ts)
+            self.times.insert(i, ts)
+            self.ids.insert(i, job_id)
+        else:
+            self.times.append(ts)
+            self.ids.append(job_id)
+
+    def scan(self, start: Tuple[float, str], until: Optional[float]) -> Iterator[Tuple[float, str]]:
+        """ Yields entries strictly after `start` (ts, job_id), up to `until`. """
+        ts0, id0 = start
+        i = bisect.bisect_left(self.times, ts0)
+        times, ids = self.times, self.ids
+        while i < len(times):
+            ts = times[i]
+            if until is not None and ts > until:
+                return
+            if (ts, ids[i]) > (ts0, id0):
+                yield ts, ids[i]
+            i += 1
+
+    def compact(self, current: Callable[[str, float], bool]):
+        keep = [(t, j) for t, j in dict.fromkeys(zip(self.times, self.ids)) if current(j, t)]
+        self.times = [t for t, _ in keep]
+        self.ids = [j for _, j in keep]
+        self.stale = 0
+
+
+class _Watch:
+    """ A waiter (one-shot future) or a stream (queue) on one job's transitions. """
+    __slots__ = ("statuses", "future", "queue")
+
+    def __init__(self, statuses: Optional[frozenset], future: Optional[asyncio.Future] = None,
+                 queue: Optional[asyncio.Queue] = None):
+        self.statuses = statuses
+        self.future = future
+        self.queue = queue
+
+    def offer(self, entry: Dict[str, Any]):
+        if self.statuses is not None and entry["status"] not in self.statuses:
+            return
+        if self.future is not None:
+            if not self.future.done():
+                self.future.set_result(entry)
+        else:
+            self.queue.put_nowait(entry)
+
+
+class _WatchStream:
+    """
+    Async iterator returned by JobRegistry.watch(). Its watch is registered
+    when it is created, so transitions made before the first __anext__ are
+    queued rather than lost. Ends (and unregisters) after a status in
+    `terminal`, on aclose(), when the consumer is cancelled, or when dropped.
+    """
+
+    def __init__(self, registry: 'JobRegistry', job_id: str, watch: _Watch, terminal: frozenset):
+        self._registry = registry
+        self._job_id = job_id
+        self._watch = watch
+        self._terminal = terminal
+        self._done = False
+        registry._add_watch(job_id, watch)
+
+    def __aiter__(self) -> '_WatchStream':
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._done:
+            raise StopAsyncIteration
+        try:
+            entry = await self._watch.queue.get()
+        except asyncio.CancelledError:
+            self._close()
+            raise
+        if entry["status"] in self._terminal:
+            self._close()
+        return entry
+
+    async def aclose(self):
+        self._close()
+
+    def _close(self):
+        if not self._done:
+            self._done = True
+            self._registry._remove_watch(self._job_id, self._watch)
+
+    def __del__(self):
+        if hasattr(self, "_done"):
+            self._close()
+
+
+class _Shard:
+    __slots__ = ("jobs", "lock")
+
+    def __init__(self):
+        self.jobs: Dict[str, JobRecord] = {}
+        self.lock = asyncio.Lock()
+
+
+class JobRegistry:
+    """
+    Lock-striped Job Registry.
+
+    Jobs are spread over `shards` independent dicts, each guarded by its own
+    lock, so writers only contend when they hit the same stripe. Reads never
+    take a lock: a record is only ever replaced or mutated while its shard
+    lock is held, and a lookup is a single dict access.
+    """
+
+    def __init__(self, shards: int = 64, history_limit: int = 32):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        if history_limit < 1:
+            raise ValueError("history_limit must be >= 1")
+        self.history_limit = history_limit
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self.wal: Optional[JobWAL] = None
+        self._checkpointer: Optional[asyncio.Task] = None
+
+        # --- Secondary Indexes (ordered dicts used as sets) ---
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_type: Dict[str, Dict[str, None]] = {}
+        self._created = _TimeIndex()
+        self._updated = _TimeIndex()
+        # (attr, status) / (attr, intent_type) -> time-ordered log of that bucket,
+        # attr being "created_at" or "updated_at", so filtered pages are bisects too
+        self._status_order: Dict[Tuple[str, str], _TimeIndex] = {}
+        self._type_order: Dict[Tuple[str, str], _TimeIndex] = {}
+
+        # job_id -> active watches, woken directly by mutations
+        self._watchers: Dict[str, List[_Watch]] = {}
+
+    def _shard(self, job_id: str) -> _Shard:
+        return self._shards[hash(job_id) % len(self._shards)]
+
+    def __len__(self) -> int:
+        return sum(len(s.jobs) for s in self._shards)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._shard(job_id).jobs
+
+    async def register(self, job_id: str, intent: Dict[str, Any], status: str) -> bool:
+        """ Returns False if the job was already registered. """
+        shard = self._shard(job_id)
+        async with shard.lock:
+            if job_id in shard.jobs:
+                return False
+            ts = time.time()
+            # Logged first: an intent the WAL cannot encode leaves no trace
+            commit = self._log({"op": "register", "id": job_id, "intent": intent,
+                                "status": status, "ts": ts})
+            self._insert(JobRecord(job_id, intent, status, ts))
+        if commit is not None:
+            await commit
+        return True
+
+    async def update(self, job_id: str, status: str, note: str = "") -> bool:
+        shard = self._shard(job_id)
+        async with shard.lock:
+            record = shard.jobs.get(job_id)
+            if record is None:
+                return False
+            ts = time.time()
+            commit = self._log({"op": "update", "id": job_id, "status": status,
+                                "note": note, "ts": ts})
+            self._transition(record, status, note, ts)
+        if commit is not None:
+            await commit
+        return True
+
+    # --- Persistence ---
+
+    def _log(self, record: Dict[str, Any]) -> Optional[asyncio.Future]:
+        # The LSN is assigned in the same step as the in-memory mutation, so a
+        # snapshot taken between awaits always matches its LSN. Callers are
+        # only acknowledged after the group commit has hit the disk.
+        if self.wal is None:
+            return None
+        commit = self.wal.append(record)
+        if self.wal.checkpoint_due and self._checkpointer is None:
+            # Keeps the log tail that recovery replays bounded
+            self._checkpointer = asyncio.create_task(self._auto_checkpoint())
+        return commit
+
+    async def _auto_checkpoint(self):
+        try:
+            await self.checkpoint()
+        except Exception as e:
+            print(f"⚠️ JobRegistry: automatic checkpoint failed: {e}")
+        finally:
+            self._checkpointer = None
+
+    def _apply(self, record: Dict[str, Any]):
+        shard = self._shard(record["id"])
+        if record["op"] == "register":
+            if record["id"] not in shard.jobs:
+                self._insert(JobRecord(record["id"], record["intent"], record["status"], record["ts"]))
+        elif record["op"] == "update":
+            existing = shard.jobs.get(record["id"])
+            if existing is not None:
+                self._transition(existing, record["status"], record["note"], record["ts"])
+
+    async def attach_wal(self, wal: JobWAL) -> int:
+        """
+        Rebuilds the registry from the WAL's latest snapshot plus its log tail,
+        then logs every further mutation. Returns the number of recovered jobs.
+        """
+        jobs, tail = await wal.open()
+        for state in jobs:
+            record = JobRecord.from_state(state, self.history_limit)
+            self._shard(record.job_id).jobs[record.job_id] = record
+        self._rebuild_indexes()
+        for entry in tail:
+            self._apply(entry)
+        self.wal = wal
+        return len(self)
+
+    async def checkpoint(self) -> int:
+        """ Snapshots the registry into the WAL and prunes covered segments. """
+        if self.wal is None:
+            raise RuntimeError("JobRegistry has no WAL attached")
+        # Captured without awaiting, so it matches wal.next_lsn - 1 exactly
+        jobs = [record.to_state() for shard in self._shards for record in shard.jobs.values()]
+        return await self.wal.checkpoint(jobs)
+
+    async def detach_wal(self):
+        if self._checkpointer is not None:
+            await asyncio.gather(self._checkpointer, return_exceptions=True)
+        if self.wal is not None:
+            wal, self.wal = self.wal, None
+            await wal.close()
+
+    # --- Index Maintenance ---
+
+    def _insert(self, record: JobRecord):
+        self._shard(record.job_id).jobs[record.job_id] = record
+        self._by_status.setdefault(record.status, {})[record.job_id] = None
+        intent_type = _intent_type(record.intent)
+        if intent_type is not None:
+            self._by_type.setdefault(intent_type, {})[record.job_id] = None
+        self._created.add(record.created_at, record.job_id)
+        self._updated.add(record.updated_at, record.job_id)
+        for attr in ("created_at", "updated_at"):
+            ts = getattr(record, attr)
+            self._ordered(self._status_order, attr, record.status).add(ts, record.job_id)
+            if intent_type is not None:
+                self._ordered(self._type_order, attr, intent_type).add(ts, record.job_id)
+        self._notify(record.job_id, record.history[-1])
+
+    def _transition(self, record: JobRecord, status: str, note: str, ts: float):
+        old = record.status
+        record.transition(status, note, ts, self.history_limit)
+        job_id = record.job_id
+        if old != status:
+            bucket = self._by_status[old]
+            del bucket[job_id]
+            if not bucket:
+                del self._by_status[old]
+                # Every entry left in the old status' logs is stale now
+                self._status_order.pop(("created_at", old), None)
+                self._status_order.pop(("updated_at", old), None)
+            else:
+                self._supersede(self._status_order[("created_at", old)], self._status_current("created_at", old))
+                self._supersede(self._status_order[("updated_at", old)], self._status_current("updated_at", old))
+            self._by_status.setdefault(status, {})[job_id] = None
+            self._ordered(self._status_order, "created_at", status).add(record.created_at, job_id)
+            self._ordered(self._status_order, "updated_at", status).add(ts, job_id)
+        else:
+            index = self._status_order[("updated_at", status)]
+            index.add(ts, job_id)
+            self._supersede(index, self._status_current("updated_at", status))
+
+        intent_type = _intent_type(record.intent)
+        if intent_type is not None:
+            index = self._type_order[("updated_at", intent_type)]
+            index.add(ts, job_id)
+            self._supersede(index, self._is_current_update)
+
+        self._updated.add(ts, job_id)
+        self._supersede(self._updated, self._is_current_update)
+        self._notify(job_id, record.history[-1])
+
+    @staticmethod
+    def _ordered(indexes: Dict[Tuple[str, str], _TimeIndex], attr: str, key: str) -> _TimeIndex:
+        index = indexes.get((attr, key))
+        if index is None:
+            index = indexes[(attr, key)] = _TimeIndex()
+        return index
+
+    @staticmethod
+    def _supersede(index: _TimeIndex, current: Callable[[str, float], bool]):
+        index.stale += 1
+        if index.stale > len(index.ids) // 2 + 1024:
+            index.compact(current)
+
+    def _status_current(self, attr: str, status: str) -> Callable[[str, float], bool]:
+        def current(job_id: str, ts: float) -> bool:
+            record = self.get(job_id)
+            return record is not None and record.status == status and getattr(record, attr) == ts
+        return current
+
+    # --- Watches ---
+
+    def _notify(self, job_id: str, transition: Transition):
+        watches = self._watchers.get(job_id)
+        if watches:
+            ts, status, note = transition
+            entry = {"timestamp": ts, "status": status, "note": note}
+            for watch in list(watches):
+                watch.offer(entry)
+
+    def _add_watch(self, job_id: str, watch: _Watch):
+        self._watchers.setdefault(job_id, []).append(watch)
+
+    def _remove_watch(self, job_id: str, watch: _Watch):
+        watches = self._watchers.get(job_id)
+        if watches is not None:
+            watches.remove(watch)
+            if not watches:
+                del self._watchers[job_id]
+
+    def wait_for(self, job_id: str, statuses: Iterable[str],
+                 timeout: Optional[float] = None) -> Awaitable[Dict[str, Any]]:
+        """
+        Resolves with the first transition into one of `statuses` (immediately
+        if the job is already there). The job does not need to exist yet.
+        Raises asyncio.TimeoutError after `timeout` seconds. The watch is
+        registered by this call, so a transition made before the result is
+        awaited still counts.
+        """
+        wanted = frozenset([statuses] if isinstance(statuses, str) else statuses)
+        record = self.get(job_id)
+        if record is not None and record.status in wanted:
+            ts, status, note = record.history[-1]
+            return self._reached({"timestamp": ts, "status": status, "note": note})
+
+        watch = _Watch(wanted, future=asyncio.get_running_loop().create_future())
+        self._add_watch(job_id, watch)
+        return self._wait(job_id, watch, timeout)
+
+    @staticmethod
+    async def _reached(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return entry
+
+    async def _wait(self, job_id: str, watch: _Watch, timeout: Optional[float]) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(watch.future, timeout)
+        finally:
+            self._remove_watch(job_id, watch)
+
+    def watch(self, job_id: str, statuses: Optional[Iterable[str]] = None,
+              until: Optional[Iterable[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async iterator over a job's transitions from this call on, optionally
+        filtered by `statuses`. Stops after yielding a status listed in `until`.
+        """
+        wanted = frozenset([statuses] if isinstance(statuses, str) else statuses) if statuses else None
+        terminal = frozenset([until] if isinstance(until, str) else until) if until else frozenset()
+        return _WatchStream(self, job_id, _Watch(wanted, queue=asyncio.Queue()), terminal)
+
+    def _is_current_update(self, job_id: str, ts: float) -> bool:
+        record = self.get(job_id)
+        return record is not None and record.updated_at == ts
+
+    def _rebuild_indexes(self):
+        self._by_status.clear()
+        self._by_type.clear()
+        self._status_order.clear()
+        self._type_order.clear()
+        records = [r for shard in self._shards for r in shard.jobs.values()]
+        for record in records:
+            self._by_status.setdefault(record.status, {})[record.job_id] = None
+            intent_type = _intent_type(record.intent)
+            if intent_type is not None:
+                self._by_type.setdefault(intent_type, {})[record.job_id] = None
+        for index, attr in ((self._created, "created_at"), (self._updated, "updated_at")):
+            pairs = sorted((getattr(r, attr), r.job_id) for r in records)
+            index.times = [t for t, _ in pairs]
+            index.ids = [j for _, j in pairs]
+            index.stale = 0
+            for ts, job_id in pairs:
+                record = self.get(job_id)
+                self._ordered(self._status_order, attr, record.status).add(ts, job_id)
+                intent_type = _intent_type(record.intent)
+                if intent_type is not None:
+                    self._ordered(self._type_order, attr, intent_type).add(ts, job_id)
+
+    # --- Queries ---
+
+    def count(self, status: Optional[str] = None, intent_type: Optional[str] = None) -> int:
+        """ O(1) for a single filter; O(smaller set) when both are given. """
+        if status is None and intent_type is None:
+            return len(self)
+        if intent_type is None:
+            return len(self._by_status.get(status, ()))
+        if status is None:
+            return len(self._by_type.get(intent_type, ()))
+        a, b = self._by_status.get(status, {}), self._by_type.get(intent_type, {})
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(1 for job_id in a if job_id in b)
+
+    def query(self, status: Optional[str] = None, intent_type: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              order_by: str = "created", limit: int = 100,
+              cursor: Optional[str] = None) -> Tuple[List[JobView], Optional[str]]:
+        """
+        Lists jobs ordered by creation or last-update time, filtered by status,
+        intent type and a [since, until] window on that time. Returns a page of
+        read-only views and an opaque cursor for the next page (or None).
+        """
+        if order_by not in ("created", "updated"):
+            raise ValueError("order_by must be 'created' or 'updated'")
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        attr = "created_at" if order_by == "created" else "updated_at"
+
+        start = (float("-inf"), "")
+        if cursor:
+            ts, _, job_id = cursor.partition("|")
+            start = (float(ts), job_id)
+        if since is not None and (since, "") > start:
+            start = (since, "")
+
+        if status is None and intent_type is None:
+            rows = self._scan_index(self._created if order_by == "created" else self._updated,
+                                    attr, start, until, limit)
+        else:
+            # Walk the smaller bucket's time-ordered log; the other filter is checked per row
+            candidates = []
+            if status is not None:
+                candidates.append((len(self._by_status.get(status, ())), self._status_order.get((attr, status))))
+            if intent_type is not None:
+                candidates.append((len(self._by_type.get(intent_type, ())), self._type_order.get((attr, intent_type))))
+            _, index = min(candidates, key=lambda c: c[0])
+
+            def match(record: JobRecord) -> bool:
+                return (status is None or record.status == status) and \
+                       (intent_type is None or _intent_type(record.intent) == intent_type)
+
+            rows = self._scan_index(index, attr, start, until, limit, match) if index is not None else []
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            ts, job_id, _ = page[-1]
+            next_cursor = f"{ts!r}|{job_id}"
+        return [JobView(record) for _, _, record in page], next_cursor
+
+    def _scan_index(self, index: _TimeIndex, attr: str, start: Tuple[float, str],
+                    until: Optional[float], limit: int,
+                    match: Optional[Callable[[JobRecord], bool]] = None) -> List[Tuple[float, str, JobRecord]]:
+        rows = []
+        seen = set()
+        for ts, job_id in index.scan(start, until):
+            record = self.get(job_id)
+            if record is None or getattr(record, attr) != ts or job_id in seen \
+                    or (match is not None and not match(record)):
+                continue  # superseded entry, or filtered out
+            seen.add(job_id)
+            rows.append((ts, job_id, record))
+            if len(rows) > limit:
+                break
+        return rows
+
+    def view(self, job_id: str) -> Optional[JobView]:
+        record = self.get(job_id)
+        return JobView(record) if record is not None else None
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """ Lock-free read of the live record. """
+        return self._shard(job_id).jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        record = self.get(job_id)
+        return record.to_dict() if record is not None else None
@@ -0,0 +1,304 @@
+import asyncio
+import json
+import os
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .envelope import json_default
+
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_SUFFIX = ".json"
+
+
+def _segment_name(first_lsn: int) -> str:
+    return f"{SEGMENT_PREFIX}{first_lsn:016d}{SEGMENT_SUFFIX}"
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    body = json.dumps(record, separators=(",", ":"), default=json_default).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    """ Returns None for a torn or corrupt line. """
+    if not line.endswith(b"\n") or len(line) < 10:
+        return None
+    crc, body = line[:8], line[9:-1]
+    try:
+        if int(crc, 16) != zlib.crc32(body):
+            return None
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class WALGapError(Exception):
+    """Raised by recovery when LSNs are missing from the log (lost or corrupt records)."""
+
+    def __init__(self, segment: str, expected: int, found: int):
+        self.segment = segment
+        self.expected = expected
+        self.found = found
+        super().__init__(f"WAL gap in {segment}: expected LSN {expected}, found {found}")
+
+
+class JobWAL:
+    """
+    Append-only, segmented write-ahead log for the Job Registry.
+
+    append() assigns an LSN immediately and returns a future that resolves once
+    the record is on disk. A single flusher task collects everything appended
+    during `commit_interval` and persists it with one write + fsync (group
+    commit). Segments roll over at `segment_bytes`; checkpoint() writes a
+    snapshot and deletes the segments it covers, so recovery only replays the
+    tail written after the latest snapshot. The owner is told to checkpoint
+    (checkpoint_due) once `checkpoint_records` records were logged since the
+    last snapshot; 0 leaves checkpoints to the caller.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 1024 * 1024,
+                 commit_interval: float = 0.002, fsync: bool = True,
+                 checkpoint_records: int = 100000):
+        if checkpoint_records < 0:
+            raise ValueError("checkpoint_records must be >= 0")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.checkpoint_records = checkpoint_records
+
+        self.next_lsn = 1
+        self.snapshot_lsn = 0
+        self._buffer: List[Tuple[int, bytes, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._fh = None
+        self._segment_path: Optional[str] = None
+        self._segment_size = 0
+        self._io_lock = threading.RLock()
+
+        # --- Counters ---
+        self.commits = 0
+        self.records = 0
+
+    # --- Recovery ---
+
+    async def open(self) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Loads the latest snapshot and the log tail after it, then starts a fresh
+        segment for new appends. Returns (snapshot_jobs, tail_records).
+        Torn segment tails are truncated; missing LSNs raise WALGapError.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        jobs, tail = await asyncio.to_thread(self._recover)
+        last = tail[-1]["lsn"] if tail else self.snapshot_lsn
+        self.next_lsn = last + 1
+        await asyncio.to_thread(self._roll, self.next_lsn)
+
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+        return jobs, tail
+
+    def _recover(self) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        jobs: List[Any] = []
+        snapshots = sorted(f for f in os.listdir(self.directory)
+                           if f.startswith(SNAPSHOT_PREFIX) and f.endswith(SNAPSHOT_SUFFIX))
+        if snapshots:
+            with open(os.path.join(self.directory, snapshots[-1]), "r", encoding="utf-8") as fh:
+                snap = json.load(fh)
+            self.snapshot_lsn = snap["lsn"]
+            jobs = snap["jobs"]
+
+        tail: List[Dict[str, Any]] = []
+        expected = self.snapshot_lsn + 1
+        for name in self._segments():
+            path = os.path.join(self.directory, name)
+            offset = valid_end = 0
+            with open(path, "rb") as fh:
+                for line in fh:
+                    offset += len(line)
+                    record = _decode(line)
+                    if record is None:
+                        # Torn or partial write: every line carries its own CRC,
+                        # so skip it and keep reading
+                        continue
+                    valid_end = offset
+                    if record["lsn"] < expected:
+                        continue
+                    if record["lsn"] > expected:
+                        raise WALGapError(name, expected, record["lsn"])
+                    tail.append(record)
+                    expected = record["lsn"] + 1
+            if valid_end < offset:
+                # Cut the torn tail off, or the next record appended to this
+                # segment would be glued onto it and fail its CRC
+                self._truncate(path, valid_end)
+        return jobs, tail
+
+    def _truncate(self, path: str, size: int):
+        with open(path, "r+b") as fh:
+            fh.truncate(size)
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+
+    def _segments(self) -> List[str]:
+        return sorted(f for f in os.listdir(self.directory)
+                      if f.startswith(SEGMENT_PREFIX) and f.endswith(SEGMENT_SUFFIX))
+
+    # --- Append Path ---
+
+    def append(self, record: Dict[str, Any]) -> asyncio.Future:
+        """ Assigns the next LSN and queues the record for the next group commit. """
+        if self._closing:
+            raise RuntimeError("JobWAL is closed")
+        lsn = record["lsn"] = self.next_lsn
+        line = _encode(record)  # an unencodable record raises before it takes the LSN
+        self.next_lsn += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._buffer.append((lsn, line, fut))
+        self._wakeup.set()
+        return fut
+
+    @property
+    def checkpoint_due(self) -> bool:
+        return bool(self.checkpoint_records) and \
+            self.next_lsn - 1 - self.snapshot_lsn >= self.checkpoint_records
+
+    async def _flush_loop(self):
+        # Exits (rather than being cancelled) on close, so a commit whose
+        # write is still running in its thread always resolves its futures
+        while not self._closing:
+            await self._wakeup.wait()
+            if self.commit_interval and not self._closing:
+                # Let concurrent writers join this commit
+                await asyncio.sleep(self.commit_interval)
+            self._wakeup.clear()
+            await self._commit()
+
+    async def _commit(self):
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._write, b"".join(line for _, line, _ in batch), batch[-1][0])
+        except Exception as e:
+            # Records appended meanwhile would follow a hole on disk: fail
+            # them too and hand their LSNs out again, so recovery sees no gap
+            failed, self._buffer = batch + self._buffer, []
+            self.next_lsn = batch[0][0]
+            for _, _, fut in failed:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.commits += 1
+        self.records += len(batch)
+        for _, _, fut in batch:
+            if not fut.done():
+                fut.set_result(True)
+
+    def _write(self, data: bytes, last_lsn: int):
+        with self._io_lock:
+            try:
+                self._fh.write(data)
+                self._fh.flush()
+                if self.fsync:
+                    os.fsync(self._fh.fileno())
+            except OSError:
+                self._discard_partial()
+                raise
+            self._segment_size += len(data)
+            if self._segment_size >= self.segment_bytes:
+                # next_lsn may already be ahead (records buffered for the next
+                # commit), so name the new segment after the last LSN written
+                self._roll(last_lsn + 1)
+
+    def _discard_partial(self):
+        # Drop whatever part of a failed batch reached the file (or is still
+        # in the handle's buffer), or the next commit would be glued onto a
+        # torn line
+        try:
+            self._fh.close()
+        except OSError:
+            pass
+        try:
+            os.truncate(self._segment_path, self._segment_size)
+        except OSError:
+            pass
+        self._fh = open(self._segment_path, "ab")
+
+    def _roll(self, first_lsn: int):
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+            self._segment_path = os.path.join(self.directory, _segment_name(first_lsn))
+            self._fh = open(self._segment_path, "ab")
+            self._segment_size = self._fh.tell()
+
+    # --- Checkpointing ---
+
+    async def checkpoint(self, jobs: List[Any]) -> int:
+        """
+        Persists `jobs` as the state at the last assigned LSN and prunes the log
+        segments it makes redundant. The caller must capture `jobs` without
+        yielding to the event loop, so the state and the LSN agree.
+        """
+        lsn = self.next_lsn - 1
+        await asyncio.to_thread(self._write_snapshot, lsn, jobs)
+        self.snapshot_lsn = lsn
+        return lsn
+
+    def _write_snapshot(self, lsn: int, jobs: List[Any]):
+        path = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{lsn:016d}{SNAPSHOT_SUFFIX}")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"lsn": lsn, "jobs": jobs}, fh, separators=(",", ":"), default=json_default)
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+        with self._io_lock:
+            for name in os.listdir(self.directory):
+                if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX) \
+                        and name < os.path.basename(path):
+                    os.remove(os.path.join(self.directory, name))
+
+            # A segment is redundant once the next one starts at or before lsn + 1
+            segments = self._segments()
+            current = os.path.basename(self._segment_path)
+            for name, successor in zip(segments, segments[1:]):
+                if name == current:
+                    break
+                if int(successor[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) <= lsn + 1:
+                    os.remove(os.path.join(self.directory, name))
+
+    async def close(self):
+        """ Waits for the commit in progress, flushes pending records and closes the active segment. """
+        self._closing = True
+        if self._flusher is not None:
+            self._wakeup.set()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self._commit()
+        if self._fh is not None:
+            await asyncio.to_thread(self._close_segment)
+
+    def _close_segment(self):
+        with self._io_lock:
+            self._fh.close()
+            self._fh = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "next_lsn": self.next_lsn,
+            "snapshot_lsn": self.snapshot_lsn,
+            "commits": self.commits,
+            "records": self.records,
+            "pending": len(self._buffer),
+        }
@@ -0,0 +1,256 @@
+import asyncio
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .dispatch import BackpressureError
+from .envelope import Envelope
+
+
+class Priority(IntEnum):
+    CRITICAL = 0   # governance verdicts, audits
+    HIGH = 1       # replies someone is waiting on
+    NORMAL = 2
+    BULK = 3       # chatter where only throughput matters
+
+
+DEFAULT_WEIGHTS: Dict[Priority, int] = {
+    Priority.CRITICAL: 8,
+    Priority.HIGH: 4,
+    Priority.NORMAL: 2,
+    Priority.BULK: 1,
+}
+
+DEFAULT_TOPIC_PRIORITIES: Dict[str, Priority] = {
+    "aether.tasks.failed": Priority.CRITICAL,
+    "aether.tasks.pending": Priority.HIGH,
+    "query.response": Priority.HIGH,
+    "cognition.thought_stream": Priority.BULK,
+    "cognition.resonance": Priority.BULK,
+}
+
+
+class LaneOverflowError(BackpressureError):
+    """ Raised when a priority lane (or the quarantine sandbox) is at max_depth. """
+
+    def __init__(self, topic: str, priority: Union[Priority, str]):
+        self.topic = topic
+        self.priority = priority
+        self.subscriptions = []
+        name = getattr(priority, "name", priority)
+        Exception.__init__(self, f"Lane {name} is full; envelope on '{topic}' rejected")
+
+
+class Lane:
+    __slots__ = ("priority", "weight", "max_depth", "items", "current", "ready",
+                 "enqueued", "dispatched", "rejected", "wait_avg", "wait_max", "busy_time")
+
+    def __init__(self, priority: Priority, weight: int, max_depth: int):
+        self.priority = priority
+        self.weight = weight
+        self.max_depth = max_depth
+        self.items: Deque[Tuple[float, str, Envelope]] = deque()
+        self.current = 0          # smooth weighted round-robin credit
+        self.ready = asyncio.Event()
+
+        # --- Metrics ---
+        self.enqueued = 0
+        self.dispatched = 0
+        self.rejected = 0
+        self.wait_avg = 0.0       # EWMA of queueing delay (seconds)
+        self.wait_max = 0.0
+        self.busy_time = 0.0      # total time spent dispatching
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lane": self.priority.name,
+            "weight": self.weight,
+            "depth": len(self.items),
+            "enqueued": self.enqueued,
+            "dispatched": self.dispatched,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.wait_avg * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "busy_ms": round(self.busy_time * 1000, 3),
+        }
+
+
+class LaneScheduler:
+    """
+    Weighted-fair dispatcher over per-priority lanes.
+
+    Shared workers pick the next envelope with smooth weighted round-robin
+    across non-empty lanes, so BULK traffic still progresses but CRITICAL gets
+    `weight` times as many turns. `reserved` workers are pinned to one lane,
+    so that lane always has capacity even when shared workers are busy.
+    """
+
+    def __init__(self, dispatch: Callable[[str, Envelope], Awaitable[None]], workers: int = 4,
+                 weights: Optional[Dict[Priority, int]] = None,
+                 reserved: Optional[Dict[Priority, int]] = None, max_depth: int = 10000):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.dispatch = dispatch
+        self.shared_workers = workers
+        self.reserved = {Priority(p): n for p, n in (reserved if reserved is not None else {Priority.CRITICAL: 1}).items()}
+        self.lanes: Dict[Priority, Lane] = {p: Lane(p, weights[p], max_depth) for p in Priority}
+        self._ready = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._unfinished = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def submit(self, priority: Priority, topic: str, envelope: Envelope):
+        lane = self.lanes[priority]
+        if len(lane.items) >= lane.max_depth:
+            lane.rejected += 1
+            raise LaneOverflowError(topic, priority)
+        self._ensure_workers()
+        # Queued subscriptions read it to keep the order past dispatch
+        envelope.meta["priority"] = int(priority)
+        lane.items.append((time.monotonic(), topic, envelope))
+        lane.enqueued += 1
+        self._unfinished += 1
+        self._idle.clear()
+        lane.ready.set()
+        self._ready.set()
+
+    def _ensure_workers(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(None)) for _ in range(self.shared_workers)]
+        for priority, count in self.reserved.items():
+            self._tasks.extend(asyncio.create_task(self._worker(self.lanes[priority]))
+                               for _ in range(count))
+
+    def _pick(self) -> Optional[Lane]:
+        """ Smooth weighted round-robin (as used by nginx upstreams). """
+        best, total = None, 0
+        for lane in self.lanes.values():
+            if not lane.items:
+                continue
+            lane.current += lane.weight
+            total += lane.weight
+            if best is None or lane.current > best.current:
+                best = lane
+        if best is not None:
+            best.current -= total
+        return best
+
+    async def _worker(self, pinned: Optional[Lane]):
+        while True:
+            lane = pinned if pinned is not None else self._pick()
+            if lane is None or not lane.items:
+                event = pinned.ready if pinned is not None else self._ready
+                event.clear()
+                await event.wait()
+                continue
+
+            enqueued_at, topic, envelope = lane.items.popleft()
+            started = time.monotonic()
+            wait = started - enqueued_at
+            lane.wait_avg = wait if not lane.dispatched else lane.wait_avg * 0.9 + wait * 0.1
+            lane.wait_max = max(lane.wait_max, wait)
+            try:
+                await self.dispatch(topic, envelope)
+            except Exception as e:
+                print(f"⚠️ AetherBus: {lane.priority.name} lane dispatch on '{topic}' failed: {e}")
+            finally:
+                lane.dispatched += 1
+                lane.busy_time += time.monotonic() - started
+                self._unfinished -= 1
+                if not self._unfinished:
+                    self._idle.set()
+
+    async def join(self):
+        """ Waits until every submitted envelope has been dispatched. """
+        await self._idle.wait()
+
+    async def close(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [lane.stats() for lane in self.lanes.values()]
+
+
+class SandboxLane:
+    """
+    Capacity-capped lane for quarantined envelopes. It has its own bounded
+    queue and worker pool, so untrusted traffic can occupy at most `workers`
+    concurrent dispatches and `max_depth` buffered envelopes, whatever the
+    volume; beyond that it is refused (LaneOverflowError).
+    """
+
+    name = "QUARANTINE"
+
+    def __init__(self, dispatch: Callable[[str, Envelope], Awaitable[None]], workers: int = 1,
+                 max_depth: int = 1000):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.dispatch = dispatch
+        self.workers = workers
+        self.max_depth = max_depth
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        # --- Metrics ---
+        self.enqueued = 0
+        self.dispatched = 0
+        self.rejected = 0
+        self.wait_avg = 0.0
+        self.wait_max = 0.0
+
+    def submit(self, topic: str, envelope: Envelope):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_depth)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        try:
+            self._queue.put_nowait((time.monotonic(), topic, envelope))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise LaneOverflowError(topic, self.name)
+        self.enqueued += 1
+
+    async def _worker(self):
+        while True:
+            enqueued_at, topic, envelope = await self._queue.get()
+            wait = time.monotonic() - enqueued_at
+            self.wait_avg = wait if not self.dispatched else self.wait_avg * 0.9 + wait * 0.1
+            self.wait_max = max(self.wait_max, wait)
+            try:
+                await self.dispatch(topic, envelope)
+            except Exception as e:
+                print(f"⚠️ AetherBus: {self.name} lane dispatch on '{topic}' failed: {e}")
+            finally:
+                self.dispatched += 1
+                self._queue.task_done()
+
+    async def join(self):
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lane": self.name,
+            "workers": self.workers,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "dispatched": self.dispatched,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.wait_avg * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
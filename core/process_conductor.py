@@ -0,0 +1,298 @@
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .aether_conductor import AetherConductor, conductor as default_conductor
+from .dispatch import Subscription
+from .envelope import Envelope
+from .inbox import ReplyInbox, is_inbox
+from .shm_ring import ShmRing
+from .wire import PUBLISH, DELIVER, SUBSCRIBE, UNSUBSCRIBE, READY, STOP, encode_frame, decode_frame
+
+# factory(bus) -> iterable of agents (or an awaitable of one); agents are started
+# inside the worker. Must be importable (module-level) for the spawn start method.
+AgentFactory = Callable[['WorkerBus'], Any]
+
+
+class WorkerBus:
+    """
+    The conductor as seen from inside a worker process.
+
+    Exposes the same subscribe/publish surface as AetherConductor, so agents
+    built on BaseAgent run unchanged: subscriptions are served by a local
+    conductor and announced to the parent, publishes go to the parent, which
+    guards and routes them (back to this worker too, if it subscribed).
+    request() waits on a private inbox that the worker loop serves ahead of
+    regular deliveries.
+    """
+
+    def __init__(self, local: AetherConductor, outbound: ShmRing):
+        self.local = local
+        self.outbound = outbound
+        self._announced: Set[str] = set()
+        self.inbox = ReplyInbox()
+
+    async def subscribe(self, topic: str, handler: Callable, **options):
+        sub = await self.local.subscribe(topic, handler, **options)
+        sub.on_unsubscribe = self.unsubscribe
+        if topic not in self._announced:
+            self._announced.add(topic)
+            await self.outbound.put(encode_frame(SUBSCRIBE, topic))
+        return sub
+
+    async def unsubscribe(self, sub: Subscription) -> bool:
+        """ Detaches locally; the parent stops forwarding once no local subscriber is left. """
+        if not await self.local.unsubscribe(sub):
+            return False
+        if sub.topic not in self.local.channels and sub.topic in self._announced:
+            self._announced.discard(sub.topic)
+            await self.outbound.put(encode_frame(UNSUBSCRIBE, sub.topic))
+        return True
+
+    async def publish(self, topic: str, envelope: Envelope):
+        await self.outbound.put(encode_frame(PUBLISH, topic, envelope))
+
+    async def request(self, topic: str, envelope: Envelope, timeout: float = 5.0) -> Envelope:
+        """
+        Publishes `envelope` through the parent and waits for the single reply
+        addressed to it. Raises asyncio.TimeoutError.
+        """
+        if not self.inbox.opened:
+            # The ring is ordered: the parent forwards the inbox before it sees the request
+            self.inbox.opened = True
+            await self.outbound.put(encode_frame(SUBSCRIBE, self.inbox.topic))
+        future = self.inbox.expect(envelope)
+        try:
+            await self.publish(topic, envelope)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.inbox.forget(envelope)
+
+    async def reply(self, request: Envelope, envelope: Envelope):
+        """ Answers a request made on the parent conductor (routed to its inbox). """
+        if request.reply_to:
+            envelope.correlation_id = request.correlation_id or request.msg_id
+            envelope.flow_id = request.flow_id
+            await self.publish(request.reply_to, envelope)
+
+
+def _worker_main(factory: AgentFactory, inbound_name: str, outbound_name: str):
+    asyncio.run(_worker_loop(factory, inbound_name, outbound_name))
+
+
+async def _worker_loop(factory: AgentFactory, inbound_name: str, outbound_name: str):
+    inbound, outbound = ShmRing(inbound_name), ShmRing(outbound_name)
+    local = AetherConductor()
+    bus = WorkerBus(local, outbound)
+    agents = factory(bus)
+    if asyncio.iscoroutine(agents):
+        agents = await agents
+    agents = list(agents or ())
+    for agent in agents:
+        await agent.start()
+    await outbound.put(encode_frame(READY))
+
+    # Deliveries run in their own task so replies (for handlers blocked in
+    # bus.request) are read and resolved while those handlers are running
+    deliveries = asyncio.Queue(maxsize=1024)
+    dispatcher = asyncio.create_task(_dispatch_loop(local, deliveries))
+    try:
+        while True:
+            kind, topic, envelope = decode_frame(await inbound.get())
+            if kind == STOP:
+                await deliveries.join()
+                break
+            if kind == DELIVER:
+                if topic == bus.inbox.topic:
+                    bus.inbox.resolve(envelope)
+                else:
+                    await deliveries.put((topic, envelope))
+    finally:
+        dispatcher.cancel()
+        await asyncio.gather(dispatcher, return_exceptions=True)
+        for agent in agents:
+            await agent.stop()
+        await local.shutdown()
+        inbound.close()
+        outbound.close()
+
+
+async def _dispatch_loop(local: AetherConductor, deliveries: asyncio.Queue):
+    while True:
+        topic, envelope = await deliveries.get()
+        try:
+            await local.deliver(topic, envelope)
+        except Exception as e:
+            print(f"⚠️ AetherWorker: delivery on '{topic}' failed: {e}")
+        finally:
+            deliveries.task_done()
+
+
+class _WorkerHandle:
+    def __init__(self, name: str, process, inbound: ShmRing, outbound: ShmRing):
+        self.name = name
+        self.process = process
+        self.inbound = inbound      # parent -> worker
+        self.outbound = outbound    # worker -> parent
+        self.topics: Set[str] = set()
+        self.forwarders: Dict[str, Subscription] = {}   # pattern -> forwarding subscription in the parent
+        self.recent: 'OrderedDict[tuple, str]' = OrderedDict()   # (seq, topic) -> forwarding pattern
+        self.ready = asyncio.Event()
+        self.alive = True
+        self.reader: Optional[asyncio.Task] = None
+        self.publishes: Optional[asyncio.Queue] = None
+        self.dispatcher: Optional[asyncio.Task] = None
+
+
+class ProcessConductor:
+    """
+    Multi-process front for AetherConductor.
+
+    The parent process keeps the real conductor (signature checks, quarantine,
+    routing, job registry). Agents spawned with `spawn()` run in worker
+    processes; each worker is connected by a pair of shared-memory rings.
+    A worker's subscription becomes a forwarding subscription in the parent,
+    so every envelope is guarded once and copied into the ring of each worker
+    that listens to its topic.
+
+    A worker's publishes are dispatched by a separate task, at most
+    `max_inflight` frames behind its reader, so a parent handler may
+    request() an agent in the very worker whose publish it is handling.
+    """
+
+    def __init__(self, local: AetherConductor = default_conductor, ring_bytes: int = 4 << 20,
+                 max_inflight: int = 1024):
+        self.local = local
+        self.ring_bytes = ring_bytes
+        self.max_inflight = max_inflight
+        self.workers: Dict[str, _WorkerHandle] = {}
+        self._ctx = multiprocessing.get_context("spawn")
+
+    # --- Same surface as AetherConductor (for agents in the parent) ---
+
+    async def subscribe(self, topic: str, handler: Callable, **options):
+        return await self.local.subscribe(topic, handler, **options)
+
+    async def publish(self, topic: str, envelope: Envelope):
+        await self.local.publish(topic, envelope)
+
+    # --- Worker Management ---
+
+    async def spawn(self, factory: AgentFactory, name: Optional[str] = None,
+                    ready_timeout: float = 30.0) -> str:
+        """ Starts a worker process running the agents built by `factory`. """
+        name = name or f"worker-{len(self.workers) + 1}"
+        if name in self.workers:
+            raise ValueError(f"Worker '{name}' already exists")
+
+        inbound, outbound = ShmRing(capacity=self.ring_bytes), ShmRing(capacity=self.ring_bytes)
+        process = self._ctx.Process(
+            target=_worker_main, args=(factory, inbound.name, outbound.name),
+            name=f"aether-{name}", daemon=True
+        )
+        process.start()
+
+        worker = _WorkerHandle(name, process, inbound, outbound)
+        self.workers[name] = worker
+        worker.publishes = asyncio.Queue(maxsize=self.max_inflight)
+        worker.dispatcher = asyncio.create_task(self._dispatch_worker(worker))
+        worker.reader = asyncio.create_task(self._read_worker(worker))
+        try:
+            await asyncio.wait_for(worker.ready.wait(), ready_timeout)
+        except asyncio.TimeoutError:
+            await self._stop_worker(worker)
+            raise
+        print(f"🧬 AetherBus: Worker '{name}' online (pid {process.pid}, topics: {sorted(worker.topics)})")
+        return name
+
+    async def _read_worker(self, worker: _WorkerHandle):
+        while worker.alive:
+            kind, topic, envelope = decode_frame(await worker.outbound.get())
+            if kind == PUBLISH:
+                if is_inbox(topic):
+                    await self._publish_from(worker, topic, envelope)
+                else:
+                    await worker.publishes.put((topic, envelope))
+            elif kind == SUBSCRIBE:
+                await self._forward(worker, topic)
+            elif kind == UNSUBSCRIBE:
+                worker.topics.discard(topic)
+                sub = worker.forwarders.pop(topic, None)
+                if sub is not None:
+                    await self.local.unsubscribe(sub)
+            elif kind == READY:
+                worker.ready.set()
+
+    async def _dispatch_worker(self, worker: _WorkerHandle):
+        while True:
+            topic, envelope = await worker.publishes.get()
+            await self._publish_from(worker, topic, envelope)
+
+    async def _publish_from(self, worker: _WorkerHandle, topic: str, envelope: Envelope):
+        try:
+            await self.local.publish(topic, envelope)
+        except Exception as e:
+            print(f"⚠️ AetherBus: publish from '{worker.name}' on '{topic}' failed: {e}")
+
+    async def _forward(self, worker: _WorkerHandle, pattern: str):
+        if pattern in worker.topics:
+            return
+        worker.topics.add(pattern)
+
+        async def forward(topic: str, envelope: Envelope):
+            # Overlapping patterns (e.g. 'a.#' and 'a.*') must not ship the
+            # same publish twice; the worker re-resolves the concrete topic.
+            # The first pattern to see a publish owns it, so its own retries
+            # and repeated publishes of the same envelope still go through
+            if not worker.alive:
+                return
+            key = (envelope.meta.get("seq", envelope.msg_id), topic)
+            owner = worker.recent.setdefault(key, pattern)
+            if owner != pattern:
+                return
+            worker.recent.move_to_end(key)
+            if len(worker.recent) > 1024:
+                worker.recent.popitem(last=False)
+            await worker.inbound.put(encode_frame(DELIVER, topic, envelope))
+
+        forward.__qualname__ = f"{worker.name}:{pattern}"
+        worker.forwarders[pattern] = await self.local.subscribe(pattern, forward, with_topic=True)
+
+    async def _stop_worker(self, worker: _WorkerHandle, timeout: float = 5.0):
+        if worker.alive and worker.process.is_alive():
+            try:
+                await asyncio.wait_for(worker.inbound.put(encode_frame(STOP)), timeout)
+            except asyncio.TimeoutError:
+                pass
+        worker.alive = False
+        # Forwarders of a stopped worker would otherwise stay in the conductor for good
+        forwarders, worker.forwarders = list(worker.forwarders.values()), {}
+        for sub in forwarders:
+            await self.local.unsubscribe(sub)
+        await asyncio.to_thread(worker.process.join, timeout)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            await asyncio.to_thread(worker.process.join, timeout)
+        for task in (worker.reader, worker.dispatcher):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        worker.inbound.close()
+        worker.outbound.close()
+
+    async def close(self):
+        """ Stops every worker and releases the shared memory. """
+        workers, self.workers = list(self.workers.values()), {}
+        for worker in workers:
+            await self._stop_worker(worker)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [{
+            "name": w.name,
+            "pid": w.process.pid,
+            "alive": w.alive and w.process.is_alive(),
+            "topics": sorted(w.topics),
+            "inbound_bytes": len(w.inbound) if w.alive else 0,
+            "outbound_bytes": len(w.outbound) if w.alive else 0,
+        } for w in self.workers.values()]
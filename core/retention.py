@@ -0,0 +1,105 @@
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from .envelope import Envelope, json_default
+from .wire import envelope_to_dict
+
+# offset | stamp (epoch seconds) | encoded size (0 unless bytes-bounded) | envelope
+Entry = Tuple[int, float, int, Envelope]
+
+ReplayFrom = Union[int, float, datetime]
+
+
+class Retention:
+    """
+    Topic option: keep recent envelopes for late subscribers, bounded by
+    count, encoded bytes and/or age (seconds). The oldest entries go first.
+    """
+
+    def __init__(self, max_count: Optional[int] = 1000, max_bytes: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        if max_count is None and max_bytes is None and max_age is None:
+            raise ValueError("Retention needs at least one bound (max_count, max_bytes or max_age)")
+        for name, value in (("max_count", max_count), ("max_bytes", max_bytes), ("max_age", max_age)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0")
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+
+def encoded_size(envelope: Envelope) -> int:
+    """ Size of the envelope as the wire format would encode it. """
+    return len(json.dumps(envelope_to_dict(envelope), separators=(",", ":"), default=_estimate).encode("utf-8"))
+
+
+def _estimate(obj) -> Any:
+    # Retained payloads may never leave the process, so they need not be
+    # wire-encodable: anything json_default refuses is sized by its repr
+    try:
+        return json_default(obj)
+    except TypeError:
+        return repr(obj)
+
+
+class RetentionRing:
+    """ Bounded, offset-ordered history of one concrete topic. """
+
+    def __init__(self, topic: str, spec: Retention):
+        self.topic = topic
+        self.spec = spec
+        self._entries: Deque[Entry] = deque()
+        self.bytes = 0
+
+        # --- Counters ---
+        self.appended = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, offset: int, envelope: Envelope, now: float):
+        size = encoded_size(envelope) if self.spec.max_bytes is not None else 0
+        self._entries.append((offset, now, size, envelope))
+        self.bytes += size
+        self.appended += 1
+        self._evict(now)
+
+    def _evict(self, now: float):
+        spec, entries = self.spec, self._entries
+        while entries and (
+                (spec.max_count is not None and len(entries) > spec.max_count)
+                or (spec.max_bytes is not None and self.bytes > spec.max_bytes)
+                or (spec.max_age is not None and now - entries[0][1] > spec.max_age)):
+            self.bytes -= entries.popleft()[2]
+            self.evicted += 1
+
+    def since(self, replay_from: ReplayFrom, now: float) -> List[Entry]:
+        """
+        Entries at or after `replay_from`: an int is an offset, a float
+        (epoch seconds) or datetime is a point in time.
+        """
+        self._evict(now)
+        if isinstance(replay_from, datetime):
+            replay_from = replay_from.timestamp()
+        field = 0 if isinstance(replay_from, int) else 1
+        entries = self._entries
+        # Most replays ask for the recent tail: scan back from the newest entry
+        start = len(entries)
+        while start and entries[start - 1][field] >= replay_from:
+            start -= 1
+        return [entries[i] for i in range(start, len(entries))]
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries
+        return {
+            "topic": self.topic,
+            "retained": len(entries),
+            "bytes": self.bytes,
+            "first_offset": entries[0][0] if entries else None,
+            "last_offset": entries[-1][0] if entries else None,
+            "appended": self.appended,
+            "evicted": self.evicted,
+        }
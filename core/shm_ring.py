@@ -0,0 +1,120 @@
+import asyncio
+import struct
+from multiprocessing import shared_memory
+from typing import Optional
+
+# capacity | head (bytes ever written) | tail (bytes ever read)
+_HEADER = struct.Struct("<QQQ")
+_LEN = struct.Struct("<I")
+_WRAP = 0xFFFFFFFF
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The creating process owns the segment; don't let our tracker unlink it
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+class ShmRing:
+    """
+    Single-producer / single-consumer byte ring in shared memory.
+
+    Frames are length-prefixed and never split: when a frame does not fit
+    before the end of the buffer the producer leaves a wrap marker and starts
+    again at offset 0. The producer only ever writes `head` and the consumer
+    only ever writes `tail`, so neither side needs a lock.
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 1 << 20):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity)
+            self.owner = True
+            _HEADER.pack_into(self.shm.buf, 0, capacity, 0, 0)
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+        self.capacity = _HEADER.unpack_from(self.shm.buf, 0)[0]
+        self._data = self.shm.buf[_HEADER.size:_HEADER.size + self.capacity]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _head(self) -> int:
+        return struct.unpack_from("<Q", self.shm.buf, 8)[0]
+
+    def _tail(self) -> int:
+        return struct.unpack_from("<Q", self.shm.buf, 16)[0]
+
+    def __len__(self) -> int:
+        """ Bytes currently buffered (including framing). """
+        return self._head() - self._tail()
+
+    # --- Producer ---
+
+    def try_put(self, frame: bytes) -> bool:
+        size = _LEN.size + len(frame)
+        if size > self.capacity // 2:
+            # Larger frames could need a wrap that never fits, even when empty
+            raise ValueError(f"Frame of {len(frame)} bytes exceeds half the ring capacity ({self.capacity})")
+
+        head, tail = self._head(), self._tail()
+        pos = head % self.capacity
+        to_end = self.capacity - pos
+        skip = to_end if to_end < size else 0
+        if head + skip + size - tail > self.capacity:
+            return False
+
+        if skip:
+            if to_end >= _LEN.size:
+                _LEN.pack_into(self._data, pos, _WRAP)
+            head += skip
+            pos = 0
+        _LEN.pack_into(self._data, pos, len(frame))
+        self._data[pos + _LEN.size:pos + size] = frame
+        # Publish only after the frame is fully written
+        struct.pack_into("<Q", self.shm.buf, 8, head + size)
+        return True
+
+    async def put(self, frame: bytes, poll: float = 0.0005, max_poll: float = 0.01):
+        """ Waits (with backoff) while the consumer catches up. """
+        delay = poll
+        while not self.try_put(frame):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll)
+
+    # --- Consumer ---
+
+    def try_get(self) -> Optional[bytes]:
+        head, tail = self._head(), self._tail()
+        if head == tail:
+            return None
+
+        pos = tail % self.capacity
+        to_end = self.capacity - pos
+        if to_end < _LEN.size or _LEN.unpack_from(self._data, pos)[0] == _WRAP:
+            tail += to_end
+            pos = 0
+
+        (length,) = _LEN.unpack_from(self._data, pos)
+        frame = bytes(self._data[pos + _LEN.size:pos + _LEN.size + length])
+        struct.pack_into("<Q", self.shm.buf, 16, tail + _LEN.size + length)
+        return frame
+
+    async def get(self, poll: float = 0.0005, max_poll: float = 0.01) -> bytes:
+        """ Polls with exponential backoff; resets to `poll` after every frame. """
+        delay = poll
+        while True:
+            frame = self.try_get()
+            if frame is not None:
+                return frame
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll)
+
+    def close(self):
+        self._data.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,5 +1,8 @@
+from collections import OrderedDict
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 import hashlib
 import time
 
@@ -10,6 +13,85 @@ class AISource(Enum):
     HUMAN_ARCHITECT = "Human-Creator"
     UNKNOWN_ECHO = "Unknown"
 
+# Payload fields that carry an explicit provenance claim
+MARKER_FIELDS: Tuple[str, ...] = ("_security_context",)
+
+# Optional payload field with a producer-supplied content digest (e.g. of a
+# KCP context blob); lets deep-mode classifications be cached without a scan
+DIGEST_FIELD = "_digest"
+
+# (marker, source) in priority order
+_SOURCE_MARKERS: Tuple[Tuple[str, AISource], ...] = (
+    ("AGIO-CODEX", AISource.GEMINI_CORE),
+    ("gep_constitution", AISource.GEMINI_CORE),
+    ("Architect", AISource.HUMAN_ARCHITECT),
+)
+
+def _classify(texts: List[str]) -> AISource:
+    for marker, src in _SOURCE_MARKERS:
+        for text in texts:
+            if marker in text:
+                return src
+    return AISource.UNKNOWN_ECHO
+
+def _text_leaves(payload: Any) -> List[str]:
+    """ Collects every string key/value in a nested payload without rendering it. """
+    leaves = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            leaves.append(node)
+        elif isinstance(node, Mapping):
+            for k, v in node.items():
+                if isinstance(k, str):
+                    leaves.append(k)
+                stack.append(v)
+        elif isinstance(node, (list, tuple, set, frozenset)):
+            stack.extend(node)
+    return leaves
+
+_END = object()
+
+def _bounded_digest(payload: Any, budget: int) -> Tuple[str, ...]:
+    """
+    Cheap identity of a payload: blake2b over its text in iteration order,
+    stopping after `budget` characters. Every container visited adds its
+    size and every string its full length, so the cost is bounded however
+    large the payload is.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    stack = [iter((payload,))]
+    left = budget
+    while stack and left > 0:
+        node = next(stack[-1], _END)
+        if node is _END:
+            stack.pop()
+        elif isinstance(node, str):
+            chunk = node[:left]
+            h.update(b"s%d:" % len(node))
+            h.update(chunk.encode("utf-8", "surrogatepass"))
+            left -= len(chunk)
+        elif isinstance(node, Mapping):
+            h.update(b"m%d:" % len(node))
+            stack.append(iter(node.items()))
+        elif isinstance(node, (list, tuple, set, frozenset)):
+            h.update(b"l%d:" % len(node))
+            stack.append(iter(node))
+        elif node is None or isinstance(node, (bool, int, float)):
+            h.update(b"v%r:" % (node,))
+        else:
+            h.update(b"o%s:" % type(node).__name__.encode())
+    return ("~bounded", h.hexdigest())
+
+def _marker_values(payload: Dict[str, Any], marker_fields: Iterable[str]) -> List[str]:
+    values = []
+    for name in marker_fields:
+        value = payload.get(name)
+        if value is not None:
+            values.append(value if isinstance(value, str) else str(value))
+    return values
+
 @dataclass
 class OriginMetadata:
     source: AISource
@@ -26,3 +108,91 @@ class OriginMetadata:
 
         h = hashlib.md5(f"{src.value}:{content_str[:50]}".encode()).hexdigest()
         return OriginMetadata(source=src, style_hash=h)
+
+    @staticmethod
+    def analyze_payload(payload: Dict[str, Any], deep: bool = True,
+                        marker_fields: Iterable[str] = MARKER_FIELDS) -> 'OriginMetadata':
+        """
+        Field-targeted variant of analyze_code_style.
+        Marker fields are checked first; with deep=True the remaining string
+        keys/values are scanned as well, but the payload is never stringified.
+        """
+        return OriginMetadata._from_texts(_marker_values(payload, marker_fields),
+                                          _text_leaves(payload) if deep else None)
+
+    @staticmethod
+    def _from_texts(markers: List[str], leaves: Optional[List[str]]) -> 'OriginMetadata':
+        src = _classify(markers)
+        evidence = markers
+        if src is AISource.UNKNOWN_ECHO and leaves:
+            src = _classify(leaves)
+            evidence = leaves
+        sample = evidence[0][:50] if evidence else ""
+        h = hashlib.md5(f"{src.value}:{sample}".encode()).hexdigest()
+        return OriginMetadata(source=src, style_hash=h)
+
+
+class TrustCache:
+    """
+    LRU cache of origin classifications keyed by (sender_id, payload digest).
+
+    Keys are cheap to build: the marker field values when they decide the
+    verdict (always, in shallow mode), else the marker values plus the
+    payload's DIGEST_FIELD, else a bounded digest of its first
+    `digest_bytes` characters and container sizes. Payloads that only
+    differ past that prefix share a verdict; producers of large blobs whose
+    tail matters should set DIGEST_FIELD.
+    """
+
+    def __init__(self, maxsize: int = 4096, deep: bool = True,
+                 marker_fields: Iterable[str] = MARKER_FIELDS, digest_bytes: int = 4096):
+        self.maxsize = maxsize
+        self.deep = deep
+        self.marker_fields = tuple(marker_fields)
+        self.digest_bytes = digest_bytes
+        self._entries: 'OrderedDict[Hashable, OriginMetadata]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def analyze(self, sender_id: str, payload: Dict[str, Any]) -> OriginMetadata:
+        markers = _marker_values(payload, self.marker_fields)
+        scan = self.deep and _classify(markers) is AISource.UNKNOWN_ECHO
+        if not scan:
+            # The rest of the payload cannot change the verdict
+            key = (sender_id, tuple(markers))
+        else:
+            digest = payload.get(DIGEST_FIELD)
+            if digest is None:
+                digest = _bounded_digest(payload, self.digest_bytes)
+            elif not isinstance(digest, str):
+                digest = str(digest)
+            key = (sender_id, tuple(markers), digest)
+
+        sig = self._entries.get(key)
+        if sig is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return sig
+
+        self.misses += 1
+        sig = OriginMetadata._from_texts(markers, _text_leaves(payload) if scan else None)
+        self._entries[key] = sig
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return sig
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,364 @@
+import asyncio
+import struct
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from .aether_conductor import AetherConductor, conductor as default_conductor
+from .dispatch import Subscription
+from .envelope import Envelope
+from .inbox import ReplyInbox, is_inbox
+from .wire import PUBLISH, DELIVER, SUBSCRIBE, UNSUBSCRIBE, encode_frame, decode_frame
+
+_FRAME_LEN = struct.Struct("!I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (n,) = _FRAME_LEN.unpack(await reader.readexactly(_FRAME_LEN.size))
+    if n > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {n} bytes exceeds limit")
+    return await reader.readexactly(n)
+
+
+class FrameWriter:
+    """
+    Length-prefixed frame writer that coalesces small frames.
+
+    Frames sent during one loop iteration are joined into a single write;
+    the buffer is flushed early (and the transport drained) once it grows
+    past `max_batch_bytes`.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, max_batch_bytes: int = 64 * 1024):
+        self.writer = writer
+        self.max_batch_bytes = max_batch_bytes
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._scheduled = False
+        self.frames = 0
+        self.writes = 0
+
+    async def send(self, frame: bytes):
+        self._chunks.append(_FRAME_LEN.pack(len(frame)))
+        self._chunks.append(frame)
+        self._size += _FRAME_LEN.size + len(frame)
+        self.frames += 1
+        if self._size >= self.max_batch_bytes:
+            self.flush()
+            await self.writer.drain()
+        elif not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self):
+        self._scheduled = False
+        if not self._chunks or self.writer.is_closing():
+            return
+        self.writer.write(b"".join(self._chunks))
+        self.writes += 1
+        self._chunks.clear()
+        self._size = 0
+
+    async def close(self):
+        self.flush()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+# --- Server ---
+
+class ConductorServer:
+    """
+    Exposes a conductor to agents in other processes over a Unix domain
+    socket (`path`) or localhost TCP (`host`/`port`).
+
+    Each connection may carry many agents: the client multiplexes its local
+    subscriptions and the server keeps one forwarding subscription per
+    pattern, tagging every delivery with the pattern it matched.
+
+    A connection's publishes are dispatched by a separate task, at most
+    `max_inflight` frames behind its reader, so a handler here may request()
+    an agent on the very connection whose publish it is handling.
+    """
+
+    def __init__(self, conductor: AetherConductor = default_conductor, path: Optional[str] = None,
+                 host: str = "127.0.0.1", port: int = 0, max_inflight: int = 1024):
+        self.conductor = conductor
+        self.path = path
+        self.host = host
+        self.port = port
+        self.max_inflight = max_inflight
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: List[FrameWriter] = []
+
+    async def start(self):
+        if self.path:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host=self.host, port=self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        where = self.path or f"{self.host}:{self.port}"
+        print(f"🔌 AetherBus: Conductor listening on {where}")
+        return self
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = FrameWriter(writer)
+        self._connections.append(conn)
+        alive = True
+        forwarders: Dict[str, Subscription] = {}
+
+        def forwarder(pattern: str):
+            async def forward(envelope: Envelope):
+                if alive:
+                    await conn.send(encode_frame(DELIVER, pattern, envelope))
+            forward.__qualname__ = f"remote:{pattern}"
+            return forward
+
+        async def publish(topic: str, envelope: Envelope):
+            try:
+                await self.conductor.publish(topic, envelope)
+            except Exception as e:
+                print(f"⚠️ AetherBus: remote publish on '{topic}' failed: {e}")
+
+        async def dispatch():
+            while True:
+                await publish(*await publishes.get())
+                publishes.task_done()
+
+        publishes: asyncio.Queue = asyncio.Queue(maxsize=self.max_inflight)
+        dispatcher = asyncio.create_task(dispatch())
+        try:
+            while True:
+                kind, topic, envelope = decode_frame(await read_frame(reader))
+                if kind == PUBLISH:
+                    if is_inbox(topic):
+                        await publish(topic, envelope)
+                    else:
+                        await publishes.put((topic, envelope))
+                elif kind == SUBSCRIBE and topic not in forwarders:
+                    forwarders[topic] = await self.conductor.subscribe(topic, forwarder(topic))
+                elif kind == UNSUBSCRIBE and topic in forwarders:
+                    await self.conductor.unsubscribe(forwarders.pop(topic))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # The client is gone, but what it published before leaving still counts
+            await publishes.join()
+        finally:
+            alive = False
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+            # A closed connection must not leave its forwarders pinned in the conductor
+            for sub in forwarders.values():
+                await self.conductor.unsubscribe(sub)
+            self._connections.remove(conn)
+            await conn.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            if hasattr(self._server, "close_clients"):  # Python 3.13+
+                # Also covers connections accepted but not yet handed to _handle
+                self._server.close_clients()
+            for conn in list(self._connections):
+                await conn.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+# --- Client ---
+
+class RemoteConductor:
+    """
+    Conductor client with the same subscribe/publish surface as
+    AetherConductor, so it can be passed to any BaseAgent as its bus.
+
+    One connection serves every agent using this client. If the connection
+    drops, the client reconnects with exponential backoff, re-sends all
+    subscriptions and flushes publishes buffered while offline (up to
+    `max_pending`, oldest dropped first).
+
+    Deliveries are dispatched by a separate task, at most `max_inflight`
+    frames behind the reader, so replies to request() are picked up even
+    while the handler that is waiting for them is still running.
+    """
+
+    def __init__(self, path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None,
+                 reconnect_delay: float = 0.05, max_reconnect_delay: float = 5.0,
+                 max_pending: int = 10000, max_inflight: int = 1024):
+        if path is None and port is None:
+            raise ValueError("RemoteConductor needs a socket path or a TCP port")
+        self.path = path
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._subs: Dict[str, Dict[int, Subscription]] = {}
+        self._pending: deque = deque(maxlen=max_pending)
+        self._writer: Optional[FrameWriter] = None
+        self._connected = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._closed = False
+        self._inbox = ReplyInbox()
+        self._deliveries: asyncio.Queue = asyncio.Queue(maxsize=max_inflight)
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # --- Counters ---
+        self.connects = 0
+        self.dropped = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    async def connect(self, timeout: float = 5.0) -> 'RemoteConductor':
+        """ Starts the connection loop and waits for the first connection. """
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        await asyncio.wait_for(self._connected.wait(), timeout)
+        return self
+
+    async def _open(self):
+        if self.path:
+            return await asyncio.open_unix_connection(self.path)
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while not self._closed:
+            try:
+                reader, writer = await self._open()
+            except OSError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            delay = self.reconnect_delay
+            self._writer = FrameWriter(writer)
+            self.connects += 1
+            try:
+                # Resubscribe before flushing so replies to backlog are not missed
+                for pattern in self._subs:
+                    await self._writer.send(encode_frame(SUBSCRIBE, pattern))
+                if self._inbox.opened:
+                    await self._writer.send(encode_frame(SUBSCRIBE, self._inbox.topic))
+                while self._pending:
+                    await self._writer.send(self._pending.popleft())
+                self._connected.set()
+                await self._read_loop(reader)
+            except (asyncio.IncompleteReadError, ConnectionError, OSError):
+                pass
+            finally:
+                self._connected.clear()
+                w, self._writer = self._writer, None
+                await w.close()
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            kind, pattern, envelope = decode_frame(await read_frame(reader))
+            if kind != DELIVER:
+                continue
+            if pattern == self._inbox.topic:
+                self._inbox.resolve(envelope)
+                continue
+            await self._deliveries.put((pattern, envelope.view()))
+
+    async def _dispatch_loop(self):
+        while True:
+            pattern, envelope = await self._deliveries.get()
+            tasks = []
+            for sub in list(self._subs.get(pattern, {}).values()):
+                if sub.queued:
+                    await sub.offer(envelope)
+                else:
+                    tasks.append(asyncio.create_task(sub.run((envelope,), envelope.deadline)))
+            if tasks:
+                await asyncio.wait(tasks)
+
+    async def _send(self, frame: bytes):
+        if self._writer is not None and self.connected:
+            await self._writer.send(frame)
+        else:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(frame)
+
+    async def subscribe(self, topic: str, handler: Callable, max_queue: int = 0, workers: int = 1,
+                        overflow=None, timeout: Optional[float] = None, **unsupported) -> Subscription:
+        """
+        Like AetherConductor.subscribe, limited to what a client can honour:
+        deliveries arrive one envelope at a time under the subscribed pattern,
+        and retries, coalescing and replay live on the server. Other options
+        (batch, with_topic, coalesce, replay_from, weak, retry) raise TypeError.
+        """
+        requested = sorted(name for name, value in unsupported.items()
+                           if value is not None and value is not False)
+        if requested:
+            raise TypeError(f"RemoteConductor.subscribe does not support: {', '.join(requested)}")
+        options = {"max_queue": max_queue, "workers": workers, "timeout": timeout}
+        if overflow is not None:
+            options["overflow"] = overflow
+        sub = Subscription(topic, handler, **options)
+        sub.on_unsubscribe = self.unsubscribe
+        first = topic not in self._subs
+        self._subs.setdefault(topic, {})[sub.id] = sub
+        if first and self.connected:
+            await self._writer.send(encode_frame(SUBSCRIBE, topic))
+        return sub
+
+    async def unsubscribe(self, sub: Subscription) -> bool:
+        """ Detaches a local subscription; the server stops forwarding a pattern nobody uses. """
+        subs = self._subs.get(sub.topic)
+        if not subs or subs.pop(sub.id, None) is None:
+            return False
+        if not subs:
+            del self._subs[sub.topic]
+            if self.connected:
+                await self._writer.send(encode_frame(UNSUBSCRIBE, sub.topic))
+        sub.active = False
+        await sub.close()
+        return True
+
+    async def publish(self, topic: str, envelope: Envelope):
+        await self._send(encode_frame(PUBLISH, topic, envelope))
+
+    async def request(self, topic: str, envelope: Envelope, timeout: float = 5.0) -> Envelope:
+        """
+        Publishes `envelope` and waits for the single reply addressed to it
+        (on this client's private inbox). Raises asyncio.TimeoutError.
+        """
+        if not self._inbox.opened:
+            # Sent ahead of the request on the same connection, so the
+            # server forwards the inbox before anyone can answer
+            self._inbox.opened = True
+            await self._send(encode_frame(SUBSCRIBE, self._inbox.topic))
+        future = self._inbox.expect(envelope)
+        try:
+            await self.publish(topic, envelope)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._inbox.forget(envelope)
+
+    async def reply(self, request: Envelope, envelope: Envelope):
+        """ Answers a request made on the parent conductor (routed to its inbox). """
+        if request.reply_to:
+            envelope.correlation_id = request.correlation_id or request.msg_id
+            envelope.flow_id = request.flow_id
+            await self.publish(request.reply_to, envelope)
+
+    async def close(self):
+        self._closed = True
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        for subs in self._subs.values():
+            for sub in subs.values():
+                await sub.close()
@@ -0,0 +1,95 @@
+from typing import Any, Dict, List
+
+SINGLE = "*"   # matches exactly one segment
+MULTI = "#"    # matches zero or more segments
+
+
+class _Node:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.items: List[Any] = []
+
+
+class TopicTrie:
+    """
+    Segment-wise topic matcher for wildcard subscriptions.
+
+    Patterns are split on '.', e.g. 'aether.tasks.*' matches 'aether.tasks.pending'
+    and 'cognition.#' matches 'cognition', 'cognition.resonance' and deeper topics.
+    """
+
+    def __init__(self, separator: str = "."):
+        self.separator = separator
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def is_wildcard(pattern: str, separator: str = ".") -> bool:
+        return any(seg in (SINGLE, MULTI) for seg in pattern.split(separator))
+
+    def _segments(self, pattern: str) -> List[str]:
+        segments = pattern.split(self.separator)
+        for seg in segments:
+            if seg not in (SINGLE, MULTI) and (SINGLE in seg or MULTI in seg):
+                raise ValueError(f"Wildcards must span a whole segment: '{pattern}'")
+        return segments
+
+    def insert(self, pattern: str, item: Any):
+        node = self._root
+        for seg in self._segments(pattern):
+            node = node.children.setdefault(seg, _Node())
+        node.items.append(item)
+        self._size += 1
+
+    def remove(self, pattern: str, item: Any) -> bool:
+        """ Removes an item and prunes branches left empty. """
+        path = [self._root]
+        segments = self._segments(pattern)
+        for seg in segments:
+            child = path[-1].children.get(seg)
+            if child is None:
+                return False
+            path.append(child)
+
+        try:
+            path[-1].items.remove(item)
+        except ValueError:
+            return False
+        self._size -= 1
+
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.items or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+        return True
+
+    def match(self, topic: str) -> List[Any]:
+        """ Returns every item whose pattern matches the concrete topic. """
+        found: Dict[int, Any] = {}
+        self._match(self._root, topic.split(self.separator), 0, found)
+        return list(found.values())
+
+    def _match(self, node: _Node, segments: List[str], i: int, found: Dict[int, Any]):
+        multi = node.children.get(MULTI)
+        if multi is not None:
+            # '#' may swallow any number of the remaining segments (including none)
+            for j in range(i, len(segments) + 1):
+                self._match(multi, segments, j, found)
+
+        if i == len(segments):
+            for item in node.items:
+                found.setdefault(id(item), item)
+            return
+
+        exact = node.children.get(segments[i])
+        if exact is not None:
+            self._match(exact, segments, i + 1, found)
+        single = node.children.get(SINGLE)
+        if single is not None:
+            self._match(single, segments, i + 1, found)
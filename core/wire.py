@@ -0,0 +1,68 @@
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from .envelope import Envelope, AetherIntent, payload_dict, json_default
+
+# --- Frame Kinds ---
+PUBLISH = b"P"      # node -> conductor: publish an envelope
+DELIVER = b"D"      # conductor -> node: envelope for a local subscription
+SUBSCRIBE = b"S"    # node -> conductor: start forwarding a topic pattern
+UNSUBSCRIBE = b"U"  # node -> conductor: stop forwarding a topic pattern
+READY = b"R"        # node -> conductor: start-up finished
+STOP = b"X"         # conductor -> node: shut down
+
+_TOPIC_LEN = struct.Struct("<H")
+
+
+def envelope_to_dict(envelope: Envelope) -> Dict[str, Any]:
+    return {
+        "intent": envelope.intent.value,
+        "sender_id": envelope.sender_id,
+        "payload": payload_dict(envelope.payload),
+        "context_snapshot": dict(envelope.context_snapshot),
+        "msg_id": envelope.msg_id,
+        "timestamp": envelope.timestamp,
+        "flow_id": envelope.flow_id,
+        "trace": list(envelope.trace),
+        "deadline": envelope.deadline,
+        "reply_to": envelope.reply_to,
+        "correlation_id": envelope.correlation_id,
+        "meta": dict(envelope.meta),
+    }
+
+
+def envelope_from_dict(data: Dict[str, Any]) -> Envelope:
+    return Envelope(
+        intent=AetherIntent(data["intent"]),
+        sender_id=data["sender_id"],
+        payload=data["payload"],
+        context_snapshot=data.get("context_snapshot", {}),
+        msg_id=data["msg_id"],
+        timestamp=data["timestamp"],
+        flow_id=data["flow_id"],
+        trace=data.get("trace", []),
+        deadline=data.get("deadline"),
+        reply_to=data.get("reply_to"),
+        correlation_id=data.get("correlation_id"),
+        meta=data.get("meta", {}),
+    )
+
+
+def encode_frame(kind: bytes, topic: str = "", envelope: Optional[Envelope] = None) -> bytes:
+    """ kind (1 byte) | topic length (u16) | topic | envelope JSON (optional) """
+    t = topic.encode("utf-8")
+    body = b""
+    if envelope is not None:
+        body = json.dumps(envelope_to_dict(envelope), separators=(",", ":"), default=json_default).encode("utf-8")
+    return kind + _TOPIC_LEN.pack(len(t)) + t + body
+
+
+def decode_frame(frame: bytes) -> Tuple[bytes, str, Optional[Envelope]]:
+    kind = frame[:1]
+    (n,) = _TOPIC_LEN.unpack_from(frame, 1)
+    start = 1 + _TOPIC_LEN.size
+    topic = frame[start:start + n].decode("utf-8")
+    body = frame[start + n:]
+    envelope = envelope_from_dict(json.loads(body)) if body else None
+    return kind, topic, envelope
@@ -1,6 +1,8 @@
 import asyncio
+import sys
 from core.aether_conductor import conductor
 from core.envelope import Envelope, AetherIntent
+from core.clock import simulate
 from agents.gep_enforcer import GEPPolicyEnforcer
 from agents.agio_sage_agent import AgioSageAgent
 from agents.analysis_agent import AnalysisAgent
@@ -41,4 +43,8 @@ async def run_simulation():
     print("\n--- END OF SIMULATION ---")
 
 if __name__ == "__main__":
-    asyncio.run(run_simulation())
+    # --virtual: run on simulated time (the sleeps above take no wall-clock time)
+    if "--virtual" in sys.argv:
+        simulate(run_simulation())
+    else:
+        asyncio.run(run_simulation())
@@ -61,8 +61,8 @@ async def main():
     # Publish to Bus
     await conductor.publish("user_interaction", Envelope(payload))
 
-    # Give time for async processing
-    await asyncio.sleep(1)
+    # รอจน Job เสร็จ (ไม่ต้อง poll / sleep)
+    await conductor.wait_for_job(job_id, {"COMPLETED"}, timeout=5)
 
     print("\n--- 🎬 SCENE 2: Empathy Test (High Fatigue) ---")
     # ทดสอบระบบ Sati (ความเห็นอกเห็นใจ)
@@ -75,7 +75,7 @@ async def main():
     }
     
     await conductor.publish("user_interaction", Envelope(payload_fatigue))
-    await asyncio.sleep(1)
+    await conductor.wait_for_job(job_id_2, {"COMPLETED"}, timeout=5)
 
     # 4. Check Governance Logs
     print("\n📜 GOVERNANCE LOGS (AetherConductor):")
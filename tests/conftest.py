@@ -1,7 +1,7 @@
 import pytest
 import asyncio
 from core.aether_conductor import AetherConductor
-from core.signature import OriginMetadata, AISource
+from core.envelope import Envelope, AetherIntent
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -11,21 +11,19 @@ def event_loop():
     loop.close()
 
 @pytest.fixture
-def clean_conductor():
-    """Returns a clean AetherConductor instance for each test.
+async def clean_conductor():
+    """Returns a fresh AetherConductor for each test (conductors are not shared)."""
+    conductor = AetherConductor()
+    yield conductor
+    await conductor.shutdown()
 
-    Since AetherConductor is a singleton, we need to reset its state
-    between tests to ensure isolation.
+def make_env(i=0, msg=None, sender="tester", payload=None, intent=AetherIntent.SHARE_INFO, **fields):
     """
-    # Reset the singleton instance (if possible, or just clear channels)
-    # The current implementation of AetherConductor uses __new__ for singleton.
-    # We can clear the state of the existing instance.
-
-    conductor = AetherConductor()
-    conductor.channels.clear()
-    conductor.trust_scores = {
-        AISource.HUMAN_ARCHITECT: 100,
-        AISource.GEMINI_CORE: 95,
-        AISource.UNKNOWN_ECHO: 10
-    }
-    return conductor
+    Envelope factory shared by the test modules (import it from conftest).
+    The payload defaults to {"msg": "Architect <i>", "n": i}; the "Architect"
+    marker makes it trusted, so pass e.g. msg="no marker" for an untrusted one.
+    Other Envelope fields (flow_id, msg_id, deadline, ...) pass straight through.
+    """
+    if payload is None:
+        payload = {"msg": f"Architect {i}" if msg is None else msg, "n": i}
+    return Envelope(intent=intent, sender_id=sender, payload=payload, **fields)
@@ -0,0 +1,85 @@
+import pytest
+import asyncio
+import time
+from core.envelope import AetherIntent
+from core.admission import AdmissionError, TokenBucket, trust_tier
+from core.dispatch import BackpressureError
+from agents.base_agent import BaseAgent
+from conftest import make_env
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=10, burst=2, now=0.0)
+    assert bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == pytest.approx(0.1)
+    assert bucket.take(0.1) == 0.0
+
+def test_trust_tiers():
+    assert [trust_tier(t) for t in (100, 95, 60, 10)] == ["trusted", "trusted", "standard", "low"]
+
+@pytest.mark.asyncio
+async def test_low_trust_flood_is_rate_limited_per_sender(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.sender_id)
+
+    await clean_conductor.subscribe("admission.topic", handler)
+    await clean_conductor.enable_admission(limits={"low": (1.0, 3.0)})
+    try:
+        refused = []
+        for _ in range(10):
+            try:
+                await clean_conductor.publish("admission.topic", make_env(sender="flooder", msg="no marker"))
+            except AdmissionError as e:
+                refused.append(e)
+
+        assert len(received) == 3
+        assert len(refused) == 7
+        assert isinstance(refused[0], BackpressureError)
+        assert refused[0].reason == "rate_limited" and refused[0].tier == "low"
+        assert refused[0].retry_after > 0
+
+        # Another low-trust sender has its own bucket; trusted senders are unlimited
+        await clean_conductor.publish("admission.topic", make_env(sender="other", msg="no marker"))
+        for _ in range(20):
+            await clean_conductor.publish("admission.topic", make_env(sender="Architect", msg="Architect"))
+        assert len(received) == 24
+
+        stats = clean_conductor.admission_stats()
+        assert stats["rejected"] == {"rate_limited:low": 7}
+        assert stats["admitted"] == 24
+    finally:
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_overload_sheds_untrusted_but_admits_trusted(clean_conductor):
+    async def handler(envelope):
+        pass
+
+    await clean_conductor.subscribe("admission.shed", handler)
+    await clean_conductor.enable_admission(max_lag=0.01, sample_interval=0.01)
+    try:
+        await clean_conductor.publish("admission.shed", make_env(sender="stranger", msg="no marker"))  # starts the monitor
+        time.sleep(0.1)          # block the loop so the monitor sees lag
+        await asyncio.sleep(0.02)
+        assert clean_conductor.admission_stats()["overloaded"]
+
+        with pytest.raises(AdmissionError) as exc:
+            await clean_conductor.publish("admission.shed", make_env(sender="stranger", msg="no marker"))
+        assert exc.value.reason == "overloaded"
+        await clean_conductor.publish("admission.shed", make_env(sender="Architect", msg="Architect"))
+    finally:
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_agent_sees_refusal_without_dead_lettering(clean_conductor):
+    await clean_conductor.enable_admission(limits={"low": (1.0, 1.0)})
+    try:
+        agent = BaseAgent("Flooder", clean_conductor)
+        for _ in range(3):
+            await agent.publish("admission.agent", AetherIntent.SHARE_INFO, {"msg": "spam"})
+        assert clean_conductor.admission_stats()["rejected"] == {"rate_limited:low": 2}
+        assert len(clean_conductor.dead_letters) == 0
+    finally:
+        await clean_conductor.shutdown()
@@ -6,9 +6,7 @@ from core.aether_conductor import AetherConductor
 
 @pytest.fixture
 def clean_conductor():
-    conductor = AetherConductor()
-    conductor.channels.clear()
-    return conductor
+    return AetherConductor()
 
 @pytest.fixture
 def agio_agent(clean_conductor):
@@ -0,0 +1,85 @@
+import pytest
+import asyncio
+from core.coalesce import Coalesce
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_burst_is_collapsed_to_latest_per_flow(clean_conductor):
+    received = []
+
+    async def console(envelope):
+        received.append((envelope.flow_id, envelope.payload["n"]))
+
+    sub = await clean_conductor.subscribe("cognition.thought_stream", console,
+                                          coalesce=Coalesce(window=0.02))
+    for i in range(500):
+        await clean_conductor.publish("cognition.thought_stream",
+                                      make_env(i, flow_id="flow-a" if i % 2 else "flow-b"))
+    assert received == []  # nothing delivered inside the window
+
+    await asyncio.sleep(0.05)
+    assert sorted(received) == [("flow-a", 499), ("flow-b", 498)]
+    assert sub.stats()["coalesce"] == {"pending": 0, "received": 500, "flushed": 2}
+
+@pytest.mark.asyncio
+async def test_merge_folds_the_burst(clean_conductor):
+    received = []
+
+    def merge(previous, latest):
+        # Deliveries are read-only views: derive a new envelope instead
+        return latest.derive({"n": previous.payload["n"] + latest.payload["n"]})
+
+    async def handler(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("cognition.resonance", handler,
+                                    coalesce=Coalesce(window=0.01, key="sender_id", merge=merge))
+    for i in range(1, 11):
+        await clean_conductor.publish("cognition.resonance", make_env(i, flow_id=f"f{i}"))
+
+    await clean_conductor.drain()  # flushes the open window immediately
+    assert received == [55]
+
+@pytest.mark.asyncio
+async def test_debounce_waits_for_quiet_period_but_honours_max_wait(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("coalesce.debounce", handler,
+                                    coalesce=Coalesce(window=0.03, debounce=True, max_wait=0.12))
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    i = 0
+    # Keep the stream busy (gap < window) for longer than max_wait
+    while loop.time() - started < 0.2:
+        await clean_conductor.publish("coalesce.debounce", make_env(i, flow_id="flow-a"))
+        i += 1
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+
+    assert 1 <= len(received) <= 3
+    assert received[-1] == i - 1
+
+@pytest.mark.asyncio
+async def test_coalesced_queued_subscription(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("coalesce.queued", handler, max_queue=4,
+                                    coalesce=Coalesce(window=0.01, key="topic"))
+    for i in range(50):
+        await clean_conductor.publish("coalesce.queued", make_env(i, flow_id=str(i)))
+    await clean_conductor.drain()
+
+    assert received == [49]
+    await clean_conductor.shutdown()
+
+def test_invalid_options_are_rejected():
+    with pytest.raises(ValueError):
+        Coalesce(key="nonsense")
+    with pytest.raises(ValueError):
+        Coalesce(window=0)
@@ -0,0 +1,93 @@
+import pytest
+import asyncio
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_publish_many_delivers_in_order(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.payload["msg"])
+
+    await clean_conductor.subscribe("replay.topic", handler)
+    await clean_conductor.publish_many(
+        "replay.topic", [make_env(sender="replayer", msg=f"Architect {i}") for i in range(50)]
+    )
+
+    assert received == [f"Architect {i}" for i in range(50)]
+
+@pytest.mark.asyncio
+async def test_batch_subscriber_receives_list_once(clean_conductor):
+    calls = []
+
+    async def batch_handler(envelopes):
+        calls.append(len(envelopes))
+
+    await clean_conductor.subscribe("replay.topic", batch_handler, batch=True)
+    await clean_conductor.publish_many("replay.topic", [make_env(sender="replayer", msg="Architect") for _ in range(10)])
+
+    assert calls == [10]
+
+@pytest.mark.asyncio
+async def test_publish_many_marks_quarantine_per_envelope(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope)
+
+    await clean_conductor.subscribe("replay.topic", handler)
+    await clean_conductor.publish_many("replay.topic", [make_env(sender="replayer", msg="Architect"), make_env(sender="replayer", msg="intruder")])
+
+    assert "_quarantine" not in received[0].payload
+    assert received[1].payload["_quarantine"] is True
+
+@pytest.mark.asyncio
+async def test_publish_batch_groups_mixed_topics(clean_conductor):
+    received = {"a": [], "b": []}
+
+    async def handler_a(envelope):
+        received["a"].append(envelope.payload["msg"])
+
+    async def handler_b(envelope):
+        received["b"].append(envelope.payload["msg"])
+
+    await clean_conductor.subscribe("topic.a", handler_a)
+    await clean_conductor.subscribe("topic.b", handler_b)
+
+    await clean_conductor.publish_batch([
+        ("topic.a", make_env(sender="replayer", msg="Architect a1")),
+        ("topic.b", make_env(sender="replayer", msg="Architect b1")),
+        ("topic.a", make_env(sender="replayer", msg="Architect a2")),
+    ])
+
+    assert received == {"a": ["Architect a1", "Architect a2"], "b": ["Architect b1"]}
+
+@pytest.mark.asyncio
+async def test_publish_many_isolates_handler_errors(clean_conductor):
+    received = []
+
+    async def flaky(envelope):
+        if envelope.payload["msg"] == "Architect bad":
+            raise RuntimeError("boom")
+        received.append(envelope.payload["msg"])
+
+    await clean_conductor.subscribe("replay.topic", flaky)
+    await clean_conductor.publish_many(
+        "replay.topic", [make_env(sender="replayer", msg="Architect ok"), make_env(sender="replayer", msg="Architect bad"), make_env(sender="replayer", msg="Architect ok2")]
+    )
+
+    assert received == ["Architect ok", "Architect ok2"]
+
+@pytest.mark.asyncio
+async def test_publish_many_into_queued_subscription(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope)
+
+    await clean_conductor.subscribe("replay.topic", handler, max_queue=100, workers=2)
+    await clean_conductor.publish_many("replay.topic", [make_env(sender="replayer", msg="Architect") for _ in range(20)])
+    await clean_conductor.drain()
+
+    assert len(received) == 20
+    await clean_conductor.shutdown()
@@ -0,0 +1,120 @@
+import pytest
+import asyncio
+from core.dispatch import OverflowPolicy, BackpressureError
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_queued_publish_returns_before_handler_runs(clean_conductor):
+    gate = asyncio.Event()
+    received = []
+
+    async def slow_handler(envelope):
+        await gate.wait()
+        received.append(envelope)
+
+    await clean_conductor.subscribe("queued.topic", slow_handler, max_queue=10)
+
+    # Would hang forever with inline dispatch
+    await asyncio.wait_for(clean_conductor.publish("queued.topic", make_env()), timeout=1)
+    assert received == []
+
+    gate.set()
+    await clean_conductor.drain()
+    assert len(received) == 1
+    await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_handlers_concurrently(clean_conductor):
+    active = 0
+    peak = 0
+
+    async def handler(envelope):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    sub = await clean_conductor.subscribe("pool.topic", handler, max_queue=10, workers=3)
+    for i in range(6):
+        await clean_conductor.publish("pool.topic", make_env(i))
+
+    await clean_conductor.drain()
+    assert peak == 3
+    assert sub.delivered == 6
+    await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy(clean_conductor):
+    gate = asyncio.Event()
+    received = []
+
+    async def handler(envelope):
+        await gate.wait()
+        received.append(envelope.payload["msg"])
+
+    sub = await clean_conductor.subscribe(
+        "drop.topic", handler, max_queue=2, overflow=OverflowPolicy.DROP_OLDEST
+    )
+    await clean_conductor.publish("drop.topic", make_env(0))
+    await asyncio.sleep(0)  # worker picks up #0 and blocks on the gate
+    for i in range(1, 5):
+        await clean_conductor.publish("drop.topic", make_env(i))
+
+    gate.set()
+    await clean_conductor.drain()
+    assert received == ["Architect 0", "Architect 3", "Architect 4"]
+    assert sub.dropped == 2
+    await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_reject_policy_raises_backpressure(clean_conductor):
+    gate = asyncio.Event()
+    other = []
+
+    async def blocked(envelope):
+        await gate.wait()
+
+    async def inline(envelope):
+        other.append(envelope)
+
+    sub = await clean_conductor.subscribe(
+        "reject.topic", blocked, max_queue=1, overflow=OverflowPolicy.REJECT
+    )
+    await clean_conductor.subscribe("reject.topic", inline)
+
+    await clean_conductor.publish("reject.topic", make_env(0))
+    await asyncio.sleep(0)
+    await clean_conductor.publish("reject.topic", make_env(1))
+
+    with pytest.raises(BackpressureError) as exc:
+        await clean_conductor.publish("reject.topic", make_env(2))
+
+    assert exc.value.subscriptions == [sub]
+    assert sub.rejected == 1
+    # Sibling subscribers still receive the envelope
+    assert len(other) == 3
+
+    gate.set()
+    await clean_conductor.drain()
+    await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_handler_error_does_not_kill_worker(clean_conductor):
+    received = []
+
+    async def flaky(envelope):
+        if envelope.payload["msg"].endswith("0"):
+            raise RuntimeError("boom")
+        received.append(envelope)
+
+    sub = await clean_conductor.subscribe("flaky.topic", flaky, max_queue=5)
+    await clean_conductor.publish("flaky.topic", make_env(0))
+    await clean_conductor.publish("flaky.topic", make_env(1))
+    await clean_conductor.drain()
+
+    assert sub.failed == 1
+    assert len(received) == 1
+    stats = clean_conductor.dispatch_stats()
+    assert stats[0]["failed"] == 1 and stats[0]["delivered"] == 1
+    await clean_conductor.shutdown()
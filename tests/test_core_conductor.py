@@ -5,11 +5,24 @@ from core.envelope import Envelope, AetherIntent
 from core.signature import AISource
 
 @pytest.mark.asyncio
-async def test_conductor_singleton(clean_conductor):
-    c1 = AetherConductor()
-    c2 = AetherConductor()
-    assert c1 is c2
-    assert c1 is clean_conductor
+async def test_conductors_are_isolated(clean_conductor):
+    from core.aether_conductor import conductor as default_conductor
+    other = AetherConductor()
+    assert other is not clean_conductor
+    assert isinstance(default_conductor, AetherConductor)
+
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope)
+
+    await other.subscribe("tenant.topic", handler)
+    await clean_conductor.publish("tenant.topic", Envelope(
+        intent=AetherIntent.SHARE_INFO, sender_id="tester", payload={"msg": "Architect"}
+    ))
+    assert received == []
+    assert other.inbox != clean_conductor.inbox
+    assert other._job_store is None  # built on first job call, not at construction
 
 @pytest.mark.asyncio
 async def test_subscribe_and_publish(clean_conductor):
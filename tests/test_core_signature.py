@@ -1,5 +1,6 @@
 import pytest
-from core.signature import OriginMetadata, AISource
+from unittest.mock import patch
+from core.signature import OriginMetadata, AISource, TrustCache
 
 def test_analyze_code_style_gemini():
     content = "This code was generated by AGIO-CODEX for the system."
@@ -23,3 +24,57 @@ def test_analyze_code_style_gep_constitution():
     content = "import gep_constitution"
     meta = OriginMetadata.analyze_code_style(content)
     assert meta.source == AISource.GEMINI_CORE
+
+def test_analyze_payload_matches_full_scan():
+    payload = {"msg": "hello", "nested": {"items": ["approved by Architect"]}}
+    meta = OriginMetadata.analyze_payload(payload)
+    assert meta.source == AISource.HUMAN_ARCHITECT
+
+def test_analyze_payload_marker_fields_only():
+    payload = {"msg": "Architect", "_security_context": "AGIO-CODEX System Message"}
+    assert OriginMetadata.analyze_payload(payload, deep=False).source == AISource.GEMINI_CORE
+    # Without a marker field, shallow mode ignores the rest of the payload
+    assert OriginMetadata.analyze_payload({"msg": "Architect"}, deep=False).source == AISource.UNKNOWN_ECHO
+
+def test_trust_cache_hits_and_eviction():
+    cache = TrustCache(maxsize=2)
+    cache.analyze("a", {"msg": "Architect", "_digest": "kcp-1"})
+    cache.analyze("a", {"msg": "Architect", "_digest": "kcp-1"})
+    assert cache.hits == 1 and cache.misses == 1
+
+    # Same payload from a different sender is a separate entry
+    cache.analyze("b", {"msg": "Architect", "_digest": "kcp-1"})
+    cache.analyze("c", {"msg": "Architect", "_digest": "kcp-1"})
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+def test_trust_cache_distinguishes_payload_content():
+    cache = TrustCache()
+    assert cache.analyze("a", {"msg": "Architect"}).source == AISource.HUMAN_ARCHITECT
+    assert cache.analyze("a", {"msg": "intruder"}).source == AISource.UNKNOWN_ECHO
+
+def test_trust_cache_hit_does_not_walk_the_payload():
+    cache = TrustCache()
+    blob = {"_security_context": "AGIO-CODEX System Message", "kcp": [{"chunk": "x" * 10} for _ in range(1000)]}
+    assert cache.analyze("a", blob).source == AISource.GEMINI_CORE
+    with patch("core.signature._text_leaves", side_effect=AssertionError("walked the payload")):
+        assert cache.analyze("a", blob).source == AISource.GEMINI_CORE
+    assert cache.hits == 1
+
+def test_trust_cache_without_markers_or_digest_uses_a_bounded_digest():
+    cache = TrustCache(digest_bytes=256)
+    assert cache.analyze("a", {"msg": "Architect"}).source == AISource.HUMAN_ARCHITECT
+    assert cache.analyze("a", {"msg": "intruder"}).source == AISource.UNKNOWN_ECHO
+    assert cache.misses == 2
+
+    # A repeated marker-less KCP blob is recognised without another scan
+    blob = {"kcp": [{"chunk": "x" * 10, "n": i} for i in range(10000)], "note": "Architect"}
+    assert cache.analyze("a", blob).source == AISource.HUMAN_ARCHITECT
+    with patch("core.signature._text_leaves", side_effect=AssertionError("walked the payload")):
+        assert cache.analyze("a", blob).source == AISource.HUMAN_ARCHITECT
+    assert cache.hits == 1
+
+    # A producer digest is trusted as the content's identity
+    assert cache.analyze("a", {"msg": "Architect", "_digest": "d1"}).source == AISource.HUMAN_ARCHITECT
+    with patch("core.signature._text_leaves", side_effect=AssertionError("walked the payload")):
+        assert cache.analyze("a", {"msg": "Architect", "_digest": "d1"}).source == AISource.HUMAN_ARCHITECT
@@ -0,0 +1,133 @@
+import pytest
+import asyncio
+from core.envelope import AetherIntent
+from core.dead_letter import RetryPolicy, DeadLetterStore
+from core.dispatch import OverflowPolicy
+from agents.base_agent import BaseAgent
+from conftest import make_env
+
+def test_retry_policy_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(max_attempts=4, base_delay=0.1, factor=2, max_delay=0.3)
+    assert [policy.delay(n) for n in (1, 2, 3)] == [0.1, 0.2, 0.3]
+    assert policy.should_retry(3) and not policy.should_retry(4)
+
+def test_store_bumps_attempts_per_delivery_and_evicts_oldest():
+    store = DeadLetterStore(maxlen=2)
+    envs = [make_env(i) for i in range(3)]
+    store.record("t", envs[0], "h", 1, "error")
+    letter = store.record("t", envs[0], "h", 1, "error")
+    assert letter.attempts == 2 and len(store) == 1
+
+    store.record("t", envs[1], "h", 1, "error")
+    store.record("t", envs[2], "h", 1, "error")
+    assert len(store) == 2 and store.evicted == 1
+    assert store.get(DeadLetterStore.key_for(1, envs[0])) is None
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_dead_lettered_with_context(clean_conductor):
+    async def broken(envelope):
+        raise ValueError("bad payload")
+
+    sub = await clean_conductor.subscribe("dlq.#", broken)
+    env = make_env()
+    await clean_conductor.publish("dlq.orders", env)
+
+    [letter] = clean_conductor.dead_letters.list()
+    assert letter.topic == "dlq.orders"
+    assert letter.envelope.msg_id == env.msg_id
+    assert letter.handler == broken.__qualname__
+    assert letter.subscription_id == sub.id
+    assert "bad payload" in letter.error
+    assert letter.attempts == 1
+
+@pytest.mark.asyncio
+async def test_retry_policy_recovers_transient_failures(clean_conductor):
+    calls = 0
+
+    async def flaky(envelope):
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise RuntimeError("transient")
+
+    await clean_conductor.subscribe("dlq.flaky", flaky,
+                                    retry=RetryPolicy(max_attempts=3, base_delay=0.01))
+    await clean_conductor.publish("dlq.flaky", make_env())
+    for _ in range(100):
+        if calls == 3 and not clean_conductor._retry_tasks:
+            break
+        await asyncio.sleep(0.01)
+
+    assert calls == 3
+    assert len(clean_conductor.dead_letters) == 0
+    assert clean_conductor.dead_letters.resolved == 1
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_stay_dead(clean_conductor):
+    async def broken(envelope):
+        raise RuntimeError("permanent")
+
+    await clean_conductor.subscribe("dlq.dead", broken,
+                                    retry=RetryPolicy(max_attempts=2, base_delay=0.01))
+    await clean_conductor.publish("dlq.dead", make_env())
+    for _ in range(100):
+        letters = clean_conductor.dead_letters.list()
+        if letters and letters[0].attempts == 2 and not clean_conductor._retry_tasks:
+            break
+        await asyncio.sleep(0.01)
+
+    [letter] = clean_conductor.dead_letters.list()
+    assert letter.attempts == 2 and not letter.retrying
+
+@pytest.mark.asyncio
+async def test_replay_redelivers_only_to_failed_subscription_in_batches(clean_conductor):
+    fixed = False
+    broken_calls, healthy_calls = [], []
+
+    async def sometimes(envelope):
+        broken_calls.append(envelope.msg_id)
+        if not fixed:
+            raise RuntimeError("bug")
+
+    async def healthy(envelope):
+        healthy_calls.append(envelope.msg_id)
+
+    await clean_conductor.subscribe("dlq.replay", sometimes)
+    await clean_conductor.subscribe("dlq.replay", healthy)
+    for i in range(5):
+        await clean_conductor.publish("dlq.replay", make_env(i))
+    assert len(clean_conductor.dead_letters) == 5
+
+    fixed = True
+    resolved = await clean_conductor.replay_dead_letters(batch_size=2)
+
+    assert resolved == 5
+    assert len(clean_conductor.dead_letters) == 0
+    assert len(broken_calls) == 10
+    assert len(healthy_calls) == 5  # healthy subscriber is not re-notified
+
+@pytest.mark.asyncio
+async def test_agent_publish_failure_is_kept_and_replayed(clean_conductor):
+    gate = asyncio.Event()
+    received = []
+
+    async def slow(envelope):
+        await gate.wait()
+        received.append(envelope)
+
+    await clean_conductor.subscribe("dlq.agent", slow, max_queue=2, overflow=OverflowPolicy.REJECT)
+    agent = BaseAgent("DLQAgent", clean_conductor)
+    for i in range(4):
+        await agent.publish("dlq.agent", AetherIntent.SHARE_INFO, {"msg": f"Architect {i}"})
+
+    # The queue holds two envelopes; the other two are refused
+    letters = clean_conductor.dead_letters.list()
+    assert len(letters) == 2
+    assert all(l.handler == "publish:DLQAgent" and l.outcome == "publish" for l in letters)
+
+    gate.set()
+    await clean_conductor.drain()
+    assert await clean_conductor.replay_dead_letters(batch_size=2) == 2
+    await clean_conductor.drain()
+    assert len(received) == 4
+    await clean_conductor.shutdown()
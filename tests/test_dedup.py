@@ -0,0 +1,148 @@
+import pytest
+import asyncio
+from core.admission import AdmissionError
+from core.dedup import Deduplicator, WindowDedup, BloomDedup
+from core.clock import simulate
+from core.aether_conductor import AetherConductor
+from conftest import make_env
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["exact", "bloom"])
+async def test_duplicate_msg_ids_are_delivered_once(clean_conductor, mode):
+    clean_conductor.enable_dedup(window=60, mode=mode)
+    received = []
+
+    async def worker(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("dedup.topic", worker)
+    for i in range(5):
+        await clean_conductor.publish("dedup.topic", make_env(i, msg_id="same"))
+    await clean_conductor.publish("dedup.topic", make_env(9))
+    await clean_conductor.publish_many("dedup.topic", [make_env(7, msg_id="batch"), make_env(8, msg_id="batch")])
+
+    assert received == [0, 9, 7]
+    stats = clean_conductor.dedup_stats()
+    assert stats["mode"] == mode
+    assert stats["checked"] == 8
+    assert stats["dropped"] == 5
+    assert stats["dropped_by_topic"] == {"dedup.topic": 5}
+    assert stats["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_in_flight_are_dropped(clean_conductor):
+    clean_conductor.enable_dedup()
+    received = []
+
+    async def slow(envelope):
+        received.append(envelope.msg_id)
+        await asyncio.sleep(0.01)
+
+    await clean_conductor.subscribe("dedup.topic", slow)
+    await asyncio.gather(*(clean_conductor.publish("dedup.topic", make_env(i, msg_id="same"))
+                           for i in range(3)))
+    assert received == ["same"]
+
+@pytest.mark.asyncio
+async def test_refused_publish_can_be_retried_with_same_msg_id(clean_conductor):
+    clean_conductor.enable_dedup()
+    await clean_conductor.enable_admission(limits={"low": (0.001, 1)})
+    received = []
+
+    async def worker(envelope):
+        received.append(envelope.msg_id)
+
+    await clean_conductor.subscribe("dedup.topic", worker)
+    await clean_conductor.publish("dedup.topic", make_env(0, msg_id="first", sender="stranger", msg="no marker"))
+    with pytest.raises(AdmissionError):
+        await clean_conductor.publish("dedup.topic", make_env(1, msg_id="retry-me", sender="stranger", msg="no marker"))
+
+    await clean_conductor.disable_admission()
+    await clean_conductor.publish("dedup.topic", make_env(1, msg_id="retry-me", sender="stranger", msg="no marker"))
+    assert received == ["first", "retry-me"]
+
+@pytest.mark.asyncio
+async def test_dead_letter_replay_bypasses_dedup(clean_conductor):
+    clean_conductor.enable_dedup()
+    calls = []
+
+    async def broken(envelope):
+        calls.append(envelope.msg_id)
+        raise RuntimeError("boom")
+
+    await clean_conductor.subscribe("dedup.topic", broken)
+    await clean_conductor.publish("dedup.topic", make_env(msg_id="letter"))
+    assert len(clean_conductor.dead_letters) == 1
+
+    # The subscription goes away: the letter is re-published, not redelivered
+    clean_conductor.clear_subscriptions()
+    received = []
+
+    async def fixed(envelope):
+        received.append(envelope.msg_id)
+
+    await clean_conductor.subscribe("dedup.topic", fixed)
+    assert await clean_conductor.replay_dead_letters() == 1
+    assert received == ["letter"]
+    assert clean_conductor.dedup_stats()["dropped"] == 0
+
+def test_window_expires_in_virtual_time():
+    async def scenario():
+        bus = AetherConductor()
+        bus.enable_dedup(window=60)
+        received = []
+
+        async def worker(envelope):
+            received.append(envelope.payload["n"])
+
+        await bus.subscribe("dedup.topic", worker)
+        await bus.publish("dedup.topic", make_env(0, msg_id="same"))
+        await asyncio.sleep(30)
+        await bus.publish("dedup.topic", make_env(1, msg_id="same"))
+        await asyncio.sleep(31)
+        await bus.publish("dedup.topic", make_env(2, msg_id="same"))
+        await bus.shutdown()
+        return received
+
+    assert simulate(scenario()) == [0, 2]
+
+@pytest.mark.asyncio
+async def test_exact_window_memory_is_bounded():
+    dedup = WindowDedup(window=60, max_entries=100)
+    for i in range(1000):
+        assert dedup.claim(f"id-{i}", "t")
+        dedup.commit(f"id-{i}")
+    stats = dedup.stats()
+    assert stats["entries"] == 100
+    assert stats["evicted_early"] == 900
+    assert not dedup.claim("id-999", "t")
+
+@pytest.mark.asyncio
+async def test_bloom_filter_stays_fixed_size_with_low_false_positives():
+    dedup = BloomDedup(window=60, capacity=20000, error_rate=0.01)
+    size = dedup.stats()["memory_bytes"]
+    for i in range(20000):
+        dedup.claim(f"id-{i}", "t")
+        dedup.commit(f"id-{i}")
+    false_positives = sum(not dedup.claim(f"other-{i}", "t") for i in range(5000))
+
+    assert dedup.stats()["memory_bytes"] == size
+    assert false_positives < 5000 * 0.03
+    assert not dedup.claim("id-123", "t")
+
+def test_invalid_options_are_rejected():
+    bus = AetherConductor()
+    with pytest.raises(ValueError):
+        bus.enable_dedup(mode="nonsense")
+    with pytest.raises(ValueError):
+        WindowDedup(window=0)
+    with pytest.raises(ValueError):
+        BloomDedup(error_rate=1.5)
+
+def test_subclass_missing_a_hook_fails_at_construction():
+    class SeenOnly(Deduplicator):
+        def _seen(self, msg_id, now):
+            return False
+
+    with pytest.raises(TypeError):
+        SeenOnly()
@@ -0,0 +1,102 @@
+import pytest
+from core.envelope import EnvelopeView, PayloadView
+from core.wire import encode_frame, decode_frame, DELIVER
+from conftest import make_env
+
+def nested_payload(msg="hello Architect"):
+    return {"msg": msg, "nested": {"k": 1}}
+
+def test_view_is_read_only_and_shares_the_payload():
+    env = make_env(payload=nested_payload())
+    view = env.view()
+
+    assert isinstance(view.payload, PayloadView)
+    assert view.payload["msg"] == "hello Architect"
+    assert view.flow_id == env.flow_id
+    with pytest.raises(TypeError):
+        view.payload["msg"] = "tampered"
+    with pytest.raises(AttributeError):
+        view.flow_id = "other"
+    with pytest.raises(TypeError):
+        view.context_snapshot["x"] = 1
+
+    # No copy: the view reads the publisher's dict
+    env.payload["late"] = True
+    assert view.payload["late"] is True
+
+def test_derive_is_copy_on_write():
+    env = make_env(payload=nested_payload())
+    derived = env.view().derive({"msg": "forwarded"}, sender_id="relay")
+
+    assert derived.payload["msg"] == "forwarded"
+    assert env.payload["msg"] == "hello Architect"
+    assert derived.sender_id == "relay"
+    assert derived.flow_id == env.flow_id
+    assert derived.msg_id != env.msg_id
+    assert derived.meta == {}
+
+def test_legacy_quarantine_key_comes_from_meta():
+    env = make_env(payload=nested_payload())
+    env.meta["quarantine"] = True
+    view = env.view()
+
+    assert view.payload["_quarantine"] is True
+    assert "_quarantine" in view.payload
+    assert set(view.payload) == {"msg", "nested", "_quarantine"}
+    assert "_quarantine" not in env.payload
+    assert "_quarantine" not in view.payload.copy()
+
+@pytest.mark.asyncio
+async def test_fan_out_delivers_one_shared_view_and_never_mutates_payload(clean_conductor):
+    received = []
+
+    async def a(envelope):
+        received.append(envelope)
+
+    async def b(envelope):
+        received.append(envelope)
+
+    await clean_conductor.subscribe("views.topic", a)
+    await clean_conductor.subscribe("views.topic", b)
+    env = make_env(sender="stranger", payload=nested_payload("no trusted marker"))
+    payload = env.payload
+
+    await clean_conductor.publish("views.topic", env)
+
+    assert received[0] is received[1]
+    assert isinstance(received[0], EnvelopeView)
+    assert received[0].payload["_quarantine"] is True
+    assert env.payload is payload and "_quarantine" not in payload
+    assert env.meta["quarantine"] is True and env.meta["trust"] < 50
+
+def test_meta_travels_on_the_wire_separately_from_payload():
+    env = make_env(payload=nested_payload())
+    env.meta["quarantine"] = True
+    _, _, decoded = decode_frame(encode_frame(DELIVER, "t", env.view()))
+
+    assert decoded.payload == {"msg": "hello Architect", "nested": {"k": 1}}
+    assert decoded.meta["quarantine"] is True
+    assert decoded.view().payload["_quarantine"] is True
+
+def test_nested_view_is_unwrapped_by_codec_and_canonical_hash():
+    received = make_env(payload=nested_payload()).view()
+    # What GEPEnforcer does: ship the received payload as context of a new one
+    outgoing = make_env(payload=nested_payload())
+    outgoing.payload = {"reason": "rejected", "context": received.payload}
+    plain = make_env(payload=nested_payload())
+    plain.payload = {"reason": "rejected", "context": {"msg": "hello Architect", "nested": {"k": 1}}}
+
+    _, _, decoded = decode_frame(encode_frame(DELIVER, "t", outgoing))
+
+    assert decoded.payload == plain.payload
+    assert outgoing.get_canonical_hash() == plain.get_canonical_hash()
+
+def test_codec_refuses_unserializable_objects_and_views_print_as_dicts():
+    env = make_env(payload={"msg": "hello Architect", "handle": object()})
+    with pytest.raises(TypeError):
+        encode_frame(DELIVER, "t", env)
+
+    env.meta["quarantine"] = True
+    view = make_env(payload=nested_payload()).view()
+    assert repr(view.payload) == repr({"msg": "hello Architect", "nested": {"k": 1}})
+    assert "'_quarantine': True" in str(env.view().payload)
@@ -0,0 +1,120 @@
+import pytest
+import asyncio
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_running_handlers_of_the_flow_are_cancelled(clean_conductor):
+    finished = []
+
+    async def expensive(envelope):
+        await asyncio.sleep(10)
+        finished.append(envelope.flow_id)
+
+    async def resonance(envelope):
+        await asyncio.sleep(0.01)
+        finished.append(envelope.flow_id)
+
+    sub = await clean_conductor.subscribe("flow.work", expensive)
+    await clean_conductor.subscribe("flow.other", resonance)
+    doomed = asyncio.create_task(clean_conductor.publish("flow.work", make_env(flow_id="flow-a")))
+    survivor = asyncio.create_task(clean_conductor.publish("flow.other", make_env(flow_id="flow-b")))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert clean_conductor.flows.in_flight("flow-a") == 1
+
+    assert clean_conductor.cancel_flow("flow-a") == 1
+    await asyncio.wait_for(asyncio.gather(doomed, survivor), timeout=1)
+
+    assert finished == ["flow-b"]
+    assert sub.cancelled == 1
+    assert len(clean_conductor.dead_letters) == 0  # an abort is not a failure
+    assert clean_conductor.flow_stats()["handlers_in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_queued_envelopes_are_dropped_and_worker_survives(clean_conductor):
+    received = []
+    gate = asyncio.Event()
+
+    async def worker(envelope):
+        if envelope.payload["n"] == 0:
+            await gate.wait()  # hangs until cancelled
+        received.append((envelope.flow_id, envelope.payload["n"]))
+
+    sub = await clean_conductor.subscribe("flow.queue", worker, max_queue=100)
+    for i in range(4):
+        await clean_conductor.publish("flow.queue", make_env(i, flow_id="flow-a" if i % 2 == 0 else "flow-b"))
+    await asyncio.sleep(0)
+
+    clean_conductor.cancel_flow("flow-a")
+    # Published after the abort: delivered as usual
+    await clean_conductor.publish("flow.queue", make_env(4, flow_id="flow-a"))
+    await asyncio.wait_for(clean_conductor.drain(), timeout=1)
+
+    assert received == [("flow-b", 1), ("flow-b", 3), ("flow-a", 4)]
+    assert sub.stats()["cancelled"] == 2
+    assert clean_conductor.flow_stats()["dropped"] == 1
+
+@pytest.mark.asyncio
+async def test_handler_can_cancel_its_own_flow_and_finish(clean_conductor):
+    notices = []
+
+    async def audit(envelope):
+        clean_conductor.cancel_flow(envelope.flow_id)
+        await asyncio.sleep(0)
+        await clean_conductor.publish("flow.failed", make_env(flow_id=envelope.flow_id))
+
+    async def executor(envelope):
+        await asyncio.sleep(10)
+
+    async def console(envelope):
+        notices.append(envelope.flow_id)
+
+    await clean_conductor.subscribe("flow.audit", audit)
+    await clean_conductor.subscribe("flow.audit", executor)
+    await clean_conductor.subscribe("flow.failed", console)
+
+    await asyncio.wait_for(clean_conductor.publish("flow.audit", make_env(flow_id="flow-x")), timeout=1)
+    assert notices == ["flow-x"]
+
+@pytest.mark.asyncio
+async def test_envelopes_waiting_in_lanes_are_dropped(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append((envelope.flow_id, envelope.payload["n"]))
+
+    await clean_conductor.subscribe("flow.lane", handler)
+    await clean_conductor.enable_lanes(workers=1, reserved={})
+    for i in range(6):
+        await clean_conductor.publish("flow.lane", make_env(i, flow_id="flow-a" if i % 2 == 0 else "flow-b"))
+    clean_conductor.cancel_flow("flow-a")
+    await clean_conductor.drain()
+
+    assert received == [("flow-b", 1), ("flow-b", 3), ("flow-b", 5)]
+
+@pytest.mark.asyncio
+async def test_batch_subscribers_get_the_rest_of_the_batch(clean_conductor):
+    batches = []
+
+    async def batch_handler(envelopes):
+        batches.append([env.flow_id for env in envelopes])
+
+    await clean_conductor.subscribe("flow.batch", batch_handler, max_queue=10, batch=True)
+    await clean_conductor.publish_many("flow.batch", [make_env(flow_id="flow-a"), make_env(flow_id="flow-b")])
+    clean_conductor.cancel_flow("flow-a")
+    await clean_conductor.drain()
+
+    assert batches == [["flow-b"]]
+
+@pytest.mark.asyncio
+async def test_outer_cancellation_is_not_swallowed(clean_conductor):
+    async def slow(envelope):
+        await asyncio.sleep(10)
+
+    sub = await clean_conductor.subscribe("flow.shutdown", slow)
+    task = asyncio.create_task(sub.run((make_env(flow_id="flow-z"),)))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sub.cancelled == 0
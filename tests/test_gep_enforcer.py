@@ -1,4 +1,5 @@
 import pytest
+import asyncio
 from unittest.mock import AsyncMock, patch
 from agents.gep_enforcer import GEPPolicyEnforcer
 from core.envelope import Envelope, AetherIntent
@@ -53,20 +54,44 @@ async def test_handle_audit_requires_agio(gep_agent, mock_conductor):
         sender_id="analysis",
         payload={"tool_call": "economic_transaction", "amount": 100}
     )
+    mock_conductor.request = AsyncMock(return_value=Envelope(
+        intent=AetherIntent.SHARE_INFO,
+        sender_id="AGIO",
+        payload={"status": "SAFE"},
+        flow_id=env.flow_id
+    ))
 
     await gep_agent.handle_audit(env)
 
-    # Should publish query to AGIO
-    mock_conductor.publish.assert_called_once()
-    args = mock_conductor.publish.call_args[0]
-    topic, published_env = args
+    # Should ask AGIO through request/reply
+    mock_conductor.request.assert_awaited_once()
+    topic, query_env, timeout = mock_conductor.request.call_args[0]
 
     assert topic == "query.knowledge.retrieve"
-    assert published_env.intent == AetherIntent.QUERY_TRUTH
-    assert "Check Collective Stability impact" in published_env.payload["query"]
+    assert query_env.intent == AetherIntent.QUERY_TRUTH
+    assert query_env.flow_id == env.flow_id
+    assert "Check Collective Stability impact" in query_env.payload["query"]
 
-    # Check internal state
-    assert env.flow_id in gep_agent.pending_audits
+    # The verdict settles the audit
+    topic, published_env = mock_conductor.publish.call_args[0]
+    assert topic == "aether.tasks.approved"
+    assert env.flow_id not in gep_agent.pending_audits
+
+@pytest.mark.asyncio
+async def test_handle_audit_rejects_when_agio_times_out(gep_agent, mock_conductor):
+    env = Envelope(
+        intent=AetherIntent.REQUEST_ACTION,
+        sender_id="analysis",
+        payload={"tool_call": "economic_transaction", "amount": 100}
+    )
+    mock_conductor.request = AsyncMock(side_effect=asyncio.TimeoutError)
+
+    await gep_agent.handle_audit(env)
+
+    topic, published_env = mock_conductor.publish.call_args[0]
+    assert topic == "aether.tasks.failed"
+    assert published_env.payload["reason"] == "AGIO Timeout"
+    assert env.flow_id not in gep_agent.pending_audits
 
 @pytest.mark.asyncio
 async def test_handle_audit_auto_approve(gep_agent, mock_conductor):
@@ -141,3 +166,33 @@ async def test_handle_agio_response_unsafe(gep_agent, mock_conductor):
 
     assert topic == "aether.tasks.failed"
     assert published_env.payload["reason"] == "AGIO Denied"
+
+@pytest.mark.asyncio
+async def test_legacy_broadcast_releases_the_pending_request(mock_conductor):
+    gep_agent = GEPPolicyEnforcer(mock_conductor, agio_timeout=30)
+    env = Envelope(
+        intent=AetherIntent.REQUEST_ACTION,
+        sender_id="analysis",
+        payload={"tool_call": "economic_transaction", "amount": 100}
+    )
+
+    async def unanswered(*args):
+        await asyncio.sleep(30)
+
+    mock_conductor.request = unanswered
+    audit = asyncio.create_task(gep_agent.handle_audit(env))
+    await asyncio.sleep(0)
+
+    # A legacy responder broadcasts its verdict on query.response instead of replying
+    await gep_agent.handle_agio_response(Envelope(
+        intent=AetherIntent.SHARE_INFO,
+        sender_id="AGIO",
+        payload={"status": "UNSAFE"},
+        flow_id=env.flow_id
+    ))
+    await asyncio.wait_for(audit, timeout=1)
+
+    topic, published_env = mock_conductor.publish.call_args[0]
+    assert topic == "aether.tasks.failed"
+    assert published_env.payload["reason"] == "AGIO Denied"
+    assert gep_agent._escalations == {}
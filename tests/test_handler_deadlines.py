@@ -0,0 +1,95 @@
+import pytest
+import asyncio
+import time
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_hung_handler_is_cancelled_and_siblings_are_unaffected(clean_conductor):
+    cancelled = asyncio.Event()
+    received = []
+
+    async def hung(envelope):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def broken(envelope):
+        raise RuntimeError("boom")
+
+    async def healthy(envelope):
+        received.append(envelope.msg_id)
+
+    hung_sub = await clean_conductor.subscribe("deadline.topic", hung, timeout=0.05)
+    broken_sub = await clean_conductor.subscribe("deadline.topic", broken)
+    healthy_sub = await clean_conductor.subscribe("deadline.topic", healthy)
+
+    env = make_env()
+    await asyncio.wait_for(clean_conductor.publish("deadline.topic", env), timeout=1)
+
+    assert cancelled.is_set()
+    assert received == [env.msg_id]
+    assert (hung_sub.timed_out, broken_sub.failed, healthy_sub.delivered) == (1, 1, 1)
+
+    report = clean_conductor.slow_handler_report()
+    assert report[0]["subscription"] == hung_sub.id
+    assert report[0]["handler"] == hung.__qualname__
+    assert report[0]["last_incident"]["outcome"] == "timeout"
+    assert report[1]["last_incident"]["outcome"] == "error"
+    assert all(r["subscription"] != healthy_sub.id for r in report)
+
+@pytest.mark.asyncio
+async def test_envelope_deadline_shortens_budget_and_skips_expired(clean_conductor):
+    calls = []
+
+    async def slow(envelope):
+        calls.append(envelope.msg_id)
+        await asyncio.sleep(60)
+
+    sub = await clean_conductor.subscribe("deadline.envelope", slow, timeout=30)
+
+    started = time.monotonic()
+    await clean_conductor.publish("deadline.envelope", make_env(deadline=time.time() + 0.05))
+    assert time.monotonic() - started < 1
+    assert sub.timed_out == 1
+
+    await clean_conductor.publish("deadline.envelope", make_env(deadline=time.time() - 1))
+    assert sub.expired == 1
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_queued_handler_respects_budget(clean_conductor):
+    async def hung(envelope):
+        await asyncio.sleep(60)
+
+    sub = await clean_conductor.subscribe("deadline.queued", hung, max_queue=4, timeout=0.02)
+    for _ in range(2):
+        await clean_conductor.publish("deadline.queued", make_env())
+    await asyncio.wait_for(clean_conductor.drain(), timeout=1)
+
+    assert sub.stats()["timed_out"] == 2
+    await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_timeout_raised_by_the_handler_is_an_ordinary_failure(clean_conductor):
+    received = []
+
+    async def flaky(envelope):
+        if envelope.payload.get("n") == 0:
+            raise asyncio.TimeoutError()  # e.g. an unanswered conductor.request()
+        received.append(envelope.payload["n"])
+
+    unbounded = await clean_conductor.subscribe("deadline.raised", flaky, max_queue=10)
+    bounded = await clean_conductor.subscribe("deadline.raised", flaky, timeout=5)
+    for n in range(3):
+        env = make_env()
+        env.payload["n"] = n
+        await clean_conductor.publish("deadline.raised", env)
+    await asyncio.wait_for(clean_conductor.drain(), timeout=1)
+
+    assert sorted(received) == [1, 1, 2, 2]  # the worker survived
+    for sub in (unbounded, bounded):
+        assert (sub.failed, sub.timed_out, sub.delivered) == (1, 0, 2)
+        assert sub.last_incident["outcome"] == "error"
+    assert len(clean_conductor.dead_letters) == 2
@@ -0,0 +1,257 @@
+import pytest
+import tracemalloc
+import asyncio
+from core.job_registry import JobRegistry
+
+@pytest.mark.asyncio
+async def test_register_is_idempotent():
+    registry = JobRegistry(shards=4)
+    assert await registry.register("J1", {"id": "J1"}, "INTENT_GENERATED") is True
+    assert await registry.register("J1", {"id": "J1"}, "OTHER") is False
+    assert registry.get("J1").status == "INTENT_GENERATED"
+    assert len(registry) == 1 and "J1" in registry
+
+@pytest.mark.asyncio
+async def test_update_unknown_job_returns_false():
+    registry = JobRegistry()
+    assert await registry.update("missing", "PROCESSING") is False
+    assert registry.snapshot("missing") is None
+
+@pytest.mark.asyncio
+async def test_history_ring_folds_old_transitions():
+    registry = JobRegistry(history_limit=3)
+    await registry.register("J1", {}, "INTENT_GENERATED")
+    for status in ["A", "B", "A", "C"]:
+        await registry.update("J1", status)
+
+    data = registry.snapshot("J1")
+    assert [h["status"] for h in data["history"]] == ["B", "A", "C"]
+    summary = data["history_summary"]
+    assert summary["folded"] == 2
+    assert summary["status_counts"] == {"INTENT_GENERATED": 1, "A": 1}
+    assert summary["since"] <= summary["until"]
+
+@pytest.mark.asyncio
+async def test_short_lived_jobs_stay_compact():
+    registry = JobRegistry(shards=4, history_limit=32)
+    ids = [f"J{i}" for i in range(5000)]
+    intents = [{} for _ in ids]
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for job_id, intent in zip(ids, intents):
+            await registry.register(job_id, intent, "INTENT_GENERATED")
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    per_job = sum(d.size_diff for d in after.compare_to(before, "filename")) / len(ids)
+    # A deque(maxlen=32) alone is ~760 bytes; one-transition jobs keep a plain list
+    assert per_job < 600
+    assert type(registry.get("J0").history) is list
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_across_shards():
+    registry = JobRegistry(shards=8, history_limit=64)
+    ids = [f"J{i}" for i in range(100)]
+    await asyncio.gather(*(registry.register(j, {}, "NEW") for j in ids))
+    await asyncio.gather(*(registry.update(j, f"STEP_{n}") for j in ids for n in range(5)))
+
+    assert len(registry) == 100
+    assert all(len(registry.get(j).history) == 6 for j in ids)
+
+@pytest.mark.asyncio
+async def test_snapshot_is_detached_from_record():
+    registry = JobRegistry()
+    await registry.register("J1", {}, "NEW")
+    data = registry.snapshot("J1")
+    data["history"].clear()
+    assert len(registry.get("J1").history) == 1
+
+async def seeded_registry():
+    registry = JobRegistry(shards=4)
+    for i in range(10):
+        intent_type = "greeting" if i % 2 == 0 else "work"
+        await registry.register(f"J{i}", {"id": f"J{i}", "type": intent_type}, "INTENT_GENERATED")
+    for i in range(0, 10, 3):
+        await registry.update(f"J{i}", "COMPLETED")
+    return registry
+
+@pytest.mark.asyncio
+async def test_counts_by_status_and_type():
+    registry = await seeded_registry()
+    assert registry.count(status="INTENT_GENERATED") == 6
+    assert registry.count(status="COMPLETED") == 4
+    assert registry.count(intent_type="greeting") == 5
+    assert registry.count(status="COMPLETED", intent_type="greeting") == 2  # J0, J6
+    assert registry.count() == 10
+
+@pytest.mark.asyncio
+async def test_query_pages_with_cursor():
+    registry = await seeded_registry()
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = registry.query(status="INTENT_GENERATED", limit=4, cursor=cursor)
+        seen.extend(v.job_id for v in page)
+        if cursor is None:
+            break
+    assert seen == ["J1", "J2", "J4", "J5", "J7", "J8"]
+
+@pytest.mark.asyncio
+async def test_filtered_pages_follow_status_changes():
+    registry = await seeded_registry()
+    await registry.update("J3", "INTENT_GENERATED")  # back again
+    await registry.update("J1", "COMPLETED")
+    await registry.update("J1", "COMPLETED", "again")
+
+    def brute(status=None, intent_type=None, attr="created_at"):
+        jobs = [registry.get(f"J{i}") for i in range(10)]
+        jobs = [j for j in jobs if (status is None or j.status == status)
+                and (intent_type is None or j.intent["type"] == intent_type)]
+        return [j.job_id for j in sorted(jobs, key=lambda j: (getattr(j, attr), j.job_id))]
+
+    for order_by in ("created", "updated"):
+        for status, intent_type in [("INTENT_GENERATED", None), ("COMPLETED", None),
+                                    (None, "work"), ("COMPLETED", "greeting")]:
+            seen, cursor = [], None
+            while True:
+                page, cursor = registry.query(status=status, intent_type=intent_type,
+                                              order_by=order_by, limit=2, cursor=cursor)
+                seen.extend(v.job_id for v in page)
+                if cursor is None:
+                    break
+            assert seen == brute(status, intent_type, order_by + "_at")
+
+@pytest.mark.asyncio
+async def test_filtered_page_does_not_scan_the_bucket():
+    registry = JobRegistry(shards=4)
+    for i in range(5000):
+        await registry.register(f"J{i:05d}", {"type": "bulk"}, "INTENT_GENERATED")
+    pivot = registry.get("J02500").created_at
+
+    lookups = 0
+    get = registry.get
+
+    def counting_get(job_id):
+        nonlocal lookups
+        lookups += 1
+        return get(job_id)
+
+    registry.get = counting_get
+    for filters in ({"status": "INTENT_GENERATED"}, {"intent_type": "bulk"}):
+        page, cursor = registry.query(since=pivot, limit=10, **filters)
+        assert page[0].created_at >= pivot and len(page) == 10 and cursor
+    assert lookups <= 2 * 11
+
+@pytest.mark.asyncio
+async def test_query_by_time_window_without_filters():
+    registry = await seeded_registry()
+    pivot = registry.get("J5").created_at
+    page, cursor = registry.query(since=pivot, limit=100)
+    assert [v.job_id for v in page] == [f"J{i}" for i in range(5, 10)]
+    assert cursor is None
+
+    page, _ = registry.query(order_by="updated", limit=100)
+    # Updated jobs move to the end of the update-time order, without duplicates
+    assert [v.job_id for v in page][-4:] == ["J0", "J3", "J6", "J9"]
+    assert len(page) == 10
+
+@pytest.mark.asyncio
+async def test_views_are_live_and_read_only():
+    registry = await seeded_registry()
+    view = registry.view("J1")
+    assert view.intent_type == "work"
+    with pytest.raises(TypeError):
+        view.intent["type"] = "hacked"
+    with pytest.raises(AttributeError):
+        view.status = "HACKED"
+
+    await registry.update("J1", "PROCESSING")
+    assert view.status == "PROCESSING"
+
+@pytest.mark.asyncio
+async def test_conductor_list_jobs(clean_conductor):
+    await clean_conductor.register_job({"id": "LIST-1", "type": "audit"})
+    await clean_conductor.register_job({"id": "LIST-2", "type": "audit"})
+    await clean_conductor.update_job_status("LIST-2", "COMPLETED")
+
+    assert await clean_conductor.count_jobs(intent_type="audit") == 2
+    jobs, _ = await clean_conductor.list_jobs(status="COMPLETED", intent_type="audit")
+    assert [j.job_id for j in jobs] == ["LIST-2"]
+    assert (await clean_conductor.get_job("LIST-1")).status == "INTENT_GENERATED"
+
+@pytest.mark.asyncio
+async def test_wait_for_is_woken_by_update():
+    registry = JobRegistry()
+    await registry.register("W1", {}, "INTENT_GENERATED")
+
+    waiter = asyncio.create_task(registry.wait_for("W1", {"COMPLETED"}, timeout=1))
+    await asyncio.sleep(0)
+    await registry.update("W1", "PROCESSING")
+    assert not waiter.done()
+
+    await registry.update("W1", "COMPLETED", "done")
+    entry = await waiter
+    assert entry["status"] == "COMPLETED" and entry["note"] == "done"
+    assert registry._watchers == {}
+
+@pytest.mark.asyncio
+async def test_wait_for_returns_immediately_and_times_out():
+    registry = JobRegistry()
+    await registry.register("W1", {}, "COMPLETED")
+    assert (await registry.wait_for("W1", "COMPLETED"))["status"] == "COMPLETED"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await registry.wait_for("W1", {"FAILED"}, timeout=0.01)
+    assert registry._watchers == {}
+
+@pytest.mark.asyncio
+async def test_wait_for_job_registered_later():
+    registry = JobRegistry()
+    waiter = asyncio.create_task(registry.wait_for("LATE", {"INTENT_GENERATED"}, timeout=1))
+    await asyncio.sleep(0)
+    await registry.register("LATE", {}, "INTENT_GENERATED")
+    assert (await waiter)["note"] == "Job registered"
+
+@pytest.mark.asyncio
+async def test_watch_streams_transitions_until_terminal():
+    registry = JobRegistry()
+    await registry.register("S1", {}, "NEW")
+    seen = []
+
+    async def consume():
+        async for entry in registry.watch("S1", until={"COMPLETED"}):
+            seen.append(entry["status"])
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    for status in ["PROCESSING", "REVIEW", "COMPLETED", "ARCHIVED"]:
+        await registry.update("S1", status)
+    await asyncio.wait_for(consumer, timeout=1)
+
+    assert seen == ["PROCESSING", "REVIEW", "COMPLETED"]
+    assert registry._watchers == {}
+
+@pytest.mark.asyncio
+async def test_watch_sees_transitions_made_before_iteration(clean_conductor):
+    await clean_conductor.register_job({"id": "EAGER"})
+    stream = clean_conductor.watch_job("EAGER", until={"COMPLETED"})
+    waiter = clean_conductor.wait_for_job("EAGER", {"COMPLETED"}, timeout=1)
+    await clean_conductor.update_job_status("EAGER", "COMPLETED")
+    await clean_conductor.update_job_status("EAGER", "ARCHIVED")
+
+    assert (await stream.__anext__())["status"] == "COMPLETED"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert (await waiter)["status"] == "COMPLETED"
+    assert clean_conductor._jobs._watchers == {}
+
+@pytest.mark.asyncio
+async def test_conductor_wait_for_job(clean_conductor):
+    await clean_conductor.register_job({"id": "WAIT-JOB"})
+    waiter = asyncio.create_task(clean_conductor.wait_for_job("WAIT-JOB", {"COMPLETED"}, timeout=1))
+    await asyncio.sleep(0)
+    await clean_conductor.update_job_status("WAIT-JOB", "COMPLETED")
+    assert (await waiter)["status"] == "COMPLETED"
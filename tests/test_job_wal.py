@@ -0,0 +1,178 @@
+import pytest
+import asyncio
+import os
+import time
+from unittest.mock import patch
+from core.job_registry import JobRegistry
+from core.job_wal import JobWAL, WALGapError
+
+async def open_registry(path, **wal_options):
+    registry = JobRegistry(shards=4, history_limit=8)
+    await registry.attach_wal(JobWAL(str(path), **wal_options))
+    return registry
+
+@pytest.mark.asyncio
+async def test_registry_recovers_from_log(tmp_path):
+    registry = await open_registry(tmp_path)
+    await registry.register("J1", {"id": "J1", "type": "greeting"}, "INTENT_GENERATED")
+    await registry.update("J1", "PROCESSING", "started")
+    await registry.register("J2", {"id": "J2"}, "INTENT_GENERATED")
+    await registry.detach_wal()
+
+    recovered = await open_registry(tmp_path)
+    assert len(recovered) == 2
+    job = recovered.snapshot("J1")
+    assert job["status"] == "PROCESSING"
+    assert job["intent"]["type"] == "greeting"
+    assert [h["note"] for h in job["history"]] == ["Job registered", "started"]
+    await recovered.detach_wal()
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_share_group_commits(tmp_path):
+    registry = await open_registry(tmp_path, commit_interval=0.01)
+    await asyncio.gather(*(registry.register(f"J{i}", {}, "NEW") for i in range(50)))
+
+    stats = registry.wal.stats()
+    assert stats["records"] == 50
+    assert stats["commits"] < 50
+    await registry.detach_wal()
+
+@pytest.mark.asyncio
+async def test_checkpoint_prunes_segments_and_replays_tail(tmp_path):
+    registry = await open_registry(tmp_path, segment_bytes=256)
+    for i in range(20):
+        await registry.register(f"J{i}", {}, "NEW")
+    segments_before = [f for f in os.listdir(tmp_path) if f.startswith("wal-")]
+    assert len(segments_before) > 1
+
+    lsn = await registry.checkpoint()
+    assert lsn == 20
+    await registry.update("J0", "DONE")
+    await registry.detach_wal()
+
+    segments_after = [f for f in os.listdir(tmp_path) if f.startswith("wal-")]
+    assert len(segments_after) < len(segments_before)
+
+    wal = JobWAL(str(tmp_path))
+    jobs, tail = await wal.open()
+    assert len(jobs) == 20
+    assert [r["op"] for r in tail] == ["update"]
+    await wal.close()
+
+    recovered = await open_registry(tmp_path)
+    assert recovered.get("J0").status == "DONE"
+    assert len(recovered) == 20
+    await recovered.detach_wal()
+
+@pytest.mark.asyncio
+async def test_torn_tail_is_ignored(tmp_path):
+    registry = await open_registry(tmp_path)
+    await registry.register("J1", {}, "NEW")
+    await registry.detach_wal()
+
+    segment = sorted(f for f in os.listdir(tmp_path) if f.startswith("wal-"))[-1]
+    with open(tmp_path / segment, "ab") as fh:
+        fh.write(b'deadbeef {"op":"update","id":"J1"')
+
+    recovered = await open_registry(tmp_path)
+    assert recovered.get("J1").status == "NEW"
+    await recovered.update("J1", "PROCESSING")
+    await recovered.detach_wal()
+
+    again = await open_registry(tmp_path)
+    assert again.get("J1").status == "PROCESSING"
+    await again.detach_wal()
+
+    # The restart opened a fresh (empty) segment; its first write is torn
+    segment = sorted(f for f in os.listdir(tmp_path) if f.startswith("wal-"))[-1]
+    with open(tmp_path / segment, "ab") as fh:
+        fh.write(b'deadbeef {"op":"update","id":"J1"')
+
+    # Recovery reopens the same segment name: the torn bytes must be gone
+    recovered = await open_registry(tmp_path)
+    await recovered.update("J1", "DONE")
+    await recovered.detach_wal()
+
+    again = await open_registry(tmp_path)
+    assert again.get("J1").status == "DONE"
+    await again.detach_wal()
+
+@pytest.mark.asyncio
+async def test_lsn_gap_is_detected(tmp_path):
+    registry = await open_registry(tmp_path)
+    for i in range(3):
+        await registry.register(f"J{i}", {}, "NEW")
+    await registry.detach_wal()
+
+    segment = sorted(f for f in os.listdir(tmp_path) if f.startswith("wal-"))[0]
+    lines = (tmp_path / segment).read_bytes().splitlines(keepends=True)
+    (tmp_path / segment).write_bytes(lines[0] + lines[2])  # LSN 2 lost
+
+    with pytest.raises(WALGapError) as err:
+        await JobWAL(str(tmp_path)).open()
+    assert (err.value.expected, err.value.found) == (2, 3)
+
+@pytest.mark.asyncio
+async def test_close_waits_for_the_commit_in_flight(tmp_path):
+    registry = await open_registry(tmp_path, commit_interval=0)
+    write = registry.wal._write
+
+    def slow_write(data, last_lsn):
+        time.sleep(0.05)
+        write(data, last_lsn)
+
+    registry.wal._write = slow_write
+    pending = asyncio.create_task(registry.register("J1", {}, "NEW"))
+    await asyncio.sleep(0.01)  # the commit is now inside its thread
+    await registry.detach_wal()
+    assert await asyncio.wait_for(pending, timeout=1) is True
+
+    recovered = await open_registry(tmp_path)
+    assert "J1" in recovered
+    await recovered.detach_wal()
+
+@pytest.mark.asyncio
+async def test_failed_write_leaves_no_lsn_gap(tmp_path):
+    registry = await open_registry(tmp_path)
+    fsync = os.fsync
+    failures = [OSError("disk full")]
+
+    def flaky_fsync(fd):
+        # The batch reached the file but could not be made durable
+        if failures:
+            raise failures.pop()
+        fsync(fd)
+
+    with patch("core.job_wal.os.fsync", flaky_fsync):
+        with pytest.raises(OSError):
+            await registry.register("J1", {}, "NEW")
+        await registry.register("J2", {}, "NEW")
+    await registry.detach_wal()
+
+    recovered = await open_registry(tmp_path)
+    assert "J2" in recovered and "J1" not in recovered
+    await recovered.detach_wal()
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_taken_automatically(tmp_path):
+    registry = await open_registry(tmp_path, checkpoint_records=5)
+    for i in range(12):
+        await registry.register(f"J{i}", {}, "NEW")
+    await registry.detach_wal()
+
+    wal = JobWAL(str(tmp_path))
+    jobs, tail = await wal.open()
+    assert wal.snapshot_lsn >= 10 and len(tail) < 5
+    assert len(jobs) + len(tail) == 12
+    await wal.close()
+
+@pytest.mark.asyncio
+async def test_conductor_persistence_mode(clean_conductor, tmp_path):
+    await clean_conductor.enable_persistence(str(tmp_path / "jobs"))
+    await clean_conductor.register_job({"id": "JOB-WAL"})
+    await clean_conductor.update_job_status("JOB-WAL", "COMPLETED")
+    await clean_conductor.shutdown()
+
+    registry = await open_registry(tmp_path / "jobs")
+    assert registry.get("JOB-WAL").status == "COMPLETED"
+    await registry.detach_wal()
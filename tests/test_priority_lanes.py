@@ -0,0 +1,135 @@
+import pytest
+import asyncio
+from core.dispatch import BackpressureError
+from core.lanes import Priority, LaneOverflowError
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_topic_priorities_resolve_exact_wildcard_and_override(clean_conductor):
+    await clean_conductor.enable_lanes(workers=1)
+    try:
+        clean_conductor.set_topic_priority("lanes.audit.#", Priority.HIGH)
+        clean_conductor.set_topic_priority("lanes.audit.*", Priority.CRITICAL)
+
+        assert clean_conductor.priority_for("aether.tasks.failed") == Priority.CRITICAL
+        assert clean_conductor.priority_for("cognition.thought_stream") == Priority.BULK
+        assert clean_conductor.priority_for("lanes.audit.gep") == Priority.CRITICAL
+        assert clean_conductor.priority_for("lanes.audit.gep.deep") == Priority.HIGH
+        assert clean_conductor.priority_for("lanes.other") == Priority.NORMAL
+        assert clean_conductor.priority_for("lanes.other", Priority.BULK) == Priority.BULK
+    finally:
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_critical_lane_gets_weighted_share_of_shared_workers(clean_conductor):
+    order = []
+
+    async def handler(topic, envelope):
+        order.append(topic)
+
+    await clean_conductor.subscribe("lanes.#", handler, with_topic=True)
+    await clean_conductor.enable_lanes(workers=1, reserved={},
+                                       topic_priorities={"lanes.bulk": Priority.BULK,
+                                                         "lanes.critical": Priority.CRITICAL})
+    try:
+        # Bulk backlog is queued first, governance traffic arrives behind it
+        for i in range(20):
+            await clean_conductor.publish("lanes.bulk", make_env(i))
+        for i in range(8):
+            await clean_conductor.publish("lanes.critical", make_env(i))
+
+        await clean_conductor.drain()
+        assert len(order) == 28
+        # Weights 8:1 -> the critical burst is served within the first 9 turns
+        assert order[:9].count("lanes.critical") == 8
+
+        stats = {s["lane"]: s for s in clean_conductor.lane_stats()}
+        assert stats["CRITICAL"]["dispatched"] == 8
+        assert stats["BULK"]["dispatched"] == 20
+        assert stats["BULK"]["depth"] == 0
+    finally:
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_reserved_worker_serves_critical_while_shared_workers_are_stuck(clean_conductor):
+    gate = asyncio.Event()
+    critical = asyncio.Event()
+
+    async def slow_bulk(envelope):
+        await gate.wait()
+
+    async def on_critical(envelope):
+        critical.set()
+
+    await clean_conductor.subscribe("cognition.thought_stream", slow_bulk)
+    await clean_conductor.subscribe("aether.tasks.failed", on_critical)
+    await clean_conductor.enable_lanes(workers=2)
+    try:
+        for i in range(5):
+            await clean_conductor.publish("cognition.thought_stream", make_env(i))
+        await asyncio.sleep(0)
+        await clean_conductor.publish("aether.tasks.failed", make_env())
+
+        await asyncio.wait_for(critical.wait(), timeout=1)
+        assert {s["lane"]: s["depth"] for s in clean_conductor.lane_stats()}["BULK"] > 0
+    finally:
+        gate.set()
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_full_lane_rejects_publish(clean_conductor):
+    gate = asyncio.Event()
+
+    async def slow(envelope):
+        await gate.wait()
+
+    await clean_conductor.subscribe("lanes.full", slow)
+    await clean_conductor.enable_lanes(workers=1, reserved={}, max_depth=2)
+    try:
+        await clean_conductor.publish("lanes.full", make_env(0))
+        await asyncio.sleep(0)  # worker takes the first envelope and blocks
+        await clean_conductor.publish("lanes.full", make_env(1))
+        await clean_conductor.publish("lanes.full", make_env(2))
+
+        with pytest.raises(BackpressureError) as exc:
+            await clean_conductor.publish("lanes.full", make_env(3))
+        assert isinstance(exc.value, LaneOverflowError)
+        assert exc.value.priority == Priority.NORMAL
+
+        stats = {s["lane"]: s for s in clean_conductor.lane_stats()}
+        assert stats["NORMAL"]["rejected"] == 1
+        assert stats["NORMAL"]["depth"] == 2
+    finally:
+        gate.set()
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_queued_subscription_drains_critical_before_bulk_backlog(clean_conductor):
+    gate = asyncio.Event()
+    order = []
+
+    async def handler(envelope):
+        await gate.wait()
+        order.append(envelope.sender_id)
+
+    await clean_conductor.subscribe("lanes.#", handler, max_queue=64)
+    await clean_conductor.enable_lanes(workers=2, reserved={},
+                                       topic_priorities={"lanes.bulk": Priority.BULK,
+                                                         "lanes.critical": Priority.CRITICAL})
+    try:
+        # The bulk backlog has already left its lane and sits in the subscription's
+        # buffer (the handler is stuck) when governance traffic arrives
+        for i in range(20):
+            await clean_conductor.publish("lanes.bulk", make_env(i, sender="bulk"))
+        await clean_conductor._lanes.join()
+        for i in range(8):
+            await clean_conductor.publish("lanes.critical", make_env(i, sender="critical"))
+        await clean_conductor._lanes.join()
+
+        gate.set()
+        await clean_conductor.drain()
+        assert len(order) == 28
+        # Same 8:1 weighting inside the buffer (the first bulk was already being handled)
+        assert order[:10].count("critical") == 8
+    finally:
+        await clean_conductor.shutdown()
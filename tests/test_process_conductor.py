@@ -0,0 +1,181 @@
+import pytest
+import asyncio
+import os
+from agents.base_agent import BaseAgent
+from core.envelope import Envelope, AetherIntent
+from core.process_conductor import ProcessConductor, _WorkerHandle
+from core.wire import decode_frame
+from core.shm_ring import ShmRing
+
+class EchoAgent(BaseAgent):
+    """ Runs inside the worker; answers every ping with its own pid. """
+    def __init__(self, bus):
+        super().__init__("Echo_Worker", bus)
+
+    async def start(self):
+        await self.subscribe("mp.ping.*", self.on_ping)
+
+    async def on_ping(self, envelope):
+        await self.publish("mp.pong", AetherIntent.SHARE_INFO, {
+            "pid": os.getpid(),
+            "echo": envelope.payload["msg"],
+            "_security_context": "AGIO-CODEX System Message"
+        }, envelope.flow_id)
+
+def echo_factory(bus):
+    return [EchoAgent(bus)]
+
+class AskingAgent(BaseAgent):
+    """ Runs inside the worker; asks the parent from an inline handler. """
+    def __init__(self, bus):
+        super().__init__("Asking_Worker", bus)
+
+    async def start(self):
+        await self.subscribe("mp.ask", self.on_ask)
+
+    async def on_ask(self, envelope):
+        answer = await self.request("mp.rpc", AetherIntent.QUERY_TRUTH, {
+            "msg": envelope.payload["msg"],
+            "_security_context": "AGIO-CODEX System Message"
+        }, envelope.flow_id, timeout=5)
+        await self.publish("mp.pong", AetherIntent.SHARE_INFO, {
+            "answer": answer.payload["echo"],
+            "_security_context": "AGIO-CODEX System Message"
+        }, envelope.flow_id)
+
+def asking_factory(bus):
+    return [AskingAgent(bus)]
+
+class TriggeringAgent(BaseAgent):
+    """ Runs inside the worker; triggers a parent handler that then asks it back. """
+    def __init__(self, bus):
+        super().__init__("Triggering_Worker", bus)
+
+    async def start(self):
+        await self.subscribe("mp.go", self.on_go)
+        await self.subscribe("mp.echo", self.on_echo)
+
+    async def on_go(self, envelope):
+        await self.publish("mp.trigger", AetherIntent.SHARE_INFO, {
+            "msg": envelope.payload["msg"],
+            "_security_context": "AGIO-CODEX System Message"
+        }, envelope.flow_id)
+
+    async def on_echo(self, envelope):
+        await self.reply(envelope, AetherIntent.SHARE_INFO, {
+            "echo": envelope.payload["msg"],
+            "_security_context": "AGIO-CODEX System Message"
+        })
+
+def triggering_factory(bus):
+    return [TriggeringAgent(bus)]
+
+def test_ring_wraps_around():
+    ring = ShmRing(capacity=64)
+    try:
+        for i in range(50):
+            frame = bytes([i]) * (i % 20 + 1)
+            assert ring.try_put(frame)
+            assert ring.try_get() == frame
+        assert ring.try_get() is None
+    finally:
+        ring.close()
+
+def test_ring_reports_full_and_rejects_oversized():
+    ring = ShmRing(capacity=64)
+    try:
+        assert ring.try_put(b"x" * 20)
+        assert ring.try_put(b"y" * 20)
+        assert not ring.try_put(b"z" * 20)
+        assert ring.try_get() == b"x" * 20
+        assert ring.try_put(b"z" * 20)
+        with pytest.raises(ValueError):
+            ring.try_put(b"!" * 40)
+    finally:
+        ring.close()
+
+@pytest.mark.asyncio
+async def test_agent_in_worker_process_round_trip(clean_conductor):
+    pc = ProcessConductor(clean_conductor, ring_bytes=1 << 16)
+    replies = asyncio.Queue()
+
+    async def on_pong(envelope):
+        await replies.put(envelope)
+
+    await pc.subscribe("mp.pong", on_pong)
+    try:
+        await pc.spawn(echo_factory, name="echo")
+        assert pc.stats()[0]["topics"] == ["mp.ping.*"]
+
+        await pc.publish("mp.ping.a", Envelope(AetherIntent.QUERY_TRUTH, "tester", {"msg": "Architect calling"}))
+        reply = await asyncio.wait_for(replies.get(), timeout=10)
+
+        assert reply.payload["echo"] == "Architect calling"
+        assert reply.payload["pid"] != os.getpid()
+        assert reply.sender_id == "Echo_Worker"
+    finally:
+        await pc.close()
+    # The stopped worker's forwarder is gone; the parent's own subscription stays
+    assert set(clean_conductor.channels) == {"mp.pong"}
+
+@pytest.mark.asyncio
+async def test_worker_request_is_answered_by_the_parent(clean_conductor):
+    pc = ProcessConductor(clean_conductor, ring_bytes=1 << 16)
+    replies = asyncio.Queue()
+
+    async def responder(envelope):
+        await clean_conductor.reply(envelope, Envelope(
+            AetherIntent.SHARE_INFO, "Parent", {"echo": envelope.payload["msg"]}))
+
+    await clean_conductor.subscribe("mp.rpc", responder)
+    await pc.subscribe("mp.pong", replies.put)
+    try:
+        await pc.spawn(asking_factory, name="asker")
+        await pc.publish("mp.ask", Envelope(AetherIntent.QUERY_TRUTH, "tester", {"msg": "Architect asks"}))
+        reply = await asyncio.wait_for(replies.get(), timeout=10)
+
+        assert reply.payload["answer"] == "Architect asks"
+    finally:
+        await pc.close()
+
+@pytest.mark.asyncio
+async def test_parent_handler_requests_the_worker_that_triggered_it(clean_conductor):
+    pc = ProcessConductor(clean_conductor, ring_bytes=1 << 16)
+    answers = asyncio.Queue()
+
+    async def on_trigger(envelope):
+        answer = await clean_conductor.request("mp.echo", Envelope(
+            AetherIntent.QUERY_TRUTH, "Parent", {"msg": envelope.payload["msg"]}), timeout=5)
+        await answers.put(answer)
+
+    await clean_conductor.subscribe("mp.trigger", on_trigger)
+    try:
+        await pc.spawn(triggering_factory, name="trigger")
+        await pc.publish("mp.go", Envelope(AetherIntent.QUERY_TRUTH, "tester", {"msg": "Architect asks"}))
+        answer = await asyncio.wait_for(answers.get(), timeout=10)
+
+        assert answer.payload["echo"] == "Architect asks"
+    finally:
+        await pc.close()
+
+class FrameCollector:
+    """ Stands in for a worker's inbound ring. """
+    def __init__(self):
+        self.frames = []
+
+    async def put(self, frame):
+        self.frames.append(decode_frame(frame))
+
+@pytest.mark.asyncio
+async def test_overlapping_patterns_ship_each_publish_once(clean_conductor):
+    pc = ProcessConductor(clean_conductor)
+    worker = _WorkerHandle("w", None, FrameCollector(), None)
+    await pc._forward(worker, "mp.#")
+    await pc._forward(worker, "mp.*")
+
+    env = Envelope(AetherIntent.SHARE_INFO, "tester", {"msg": "Architect"})
+    await clean_conductor.publish("mp.topic", env)
+    await clean_conductor.publish("mp.topic", env)              # a retry by the sender
+    await clean_conductor.publish_many("mp.topic", [env, env])  # repeated items
+
+    assert [topic for _, topic, _ in worker.inbound.frames] == ["mp.topic"] * 4
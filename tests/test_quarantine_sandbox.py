@@ -0,0 +1,97 @@
+import pytest
+import asyncio
+from core.lanes import LaneOverflowError
+from core.dispatch import OverflowPolicy
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_quarantined_traffic_is_capped_while_trusted_flows_run(clean_conductor):
+    gate = asyncio.Event()
+    active = peak = 0
+    trusted = []
+
+    async def handler(envelope):
+        nonlocal active, peak
+        if envelope.payload.get("_quarantine"):
+            active += 1
+            peak = max(peak, active)
+            await gate.wait()
+            active -= 1
+        else:
+            trusted.append(envelope)
+
+    await clean_conductor.subscribe("sandbox.topic", handler)
+    await clean_conductor.enable_sandbox(workers=2, max_depth=5)
+    try:
+        # Returns immediately even though every quarantined handler is stuck
+        for _ in range(7):
+            await asyncio.wait_for(clean_conductor.publish("sandbox.topic", make_env(sender="stranger", msg="no marker")), timeout=1)
+            await asyncio.sleep(0)  # let the sandbox workers pick up what they can
+        with pytest.raises(LaneOverflowError):
+            await clean_conductor.publish("sandbox.topic", make_env(sender="stranger", msg="no marker"))
+
+        await asyncio.wait_for(clean_conductor.publish("sandbox.topic", make_env(sender="Architect", msg="Architect")),
+                               timeout=1)
+        assert len(trusted) == 1
+
+        stats = clean_conductor.sandbox_stats()
+        assert stats["depth"] == 5 and stats["rejected"] == 1
+        assert peak == 2
+
+        gate.set()
+        await clean_conductor.drain()
+        assert clean_conductor.sandbox_stats()["dispatched"] == 7
+        assert peak == 2
+    finally:
+        gate.set()
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_batch_splits_quarantined_envelopes_into_sandbox(clean_conductor):
+    received = []
+
+    async def handler(envelope):
+        received.append(bool(envelope.payload.get("_quarantine")))
+
+    await clean_conductor.subscribe("sandbox.batch", handler)
+    await clean_conductor.enable_sandbox(workers=1)
+    try:
+        await clean_conductor.publish_many("sandbox.batch", [
+            make_env(sender="Architect", msg="Architect"), make_env(sender="stranger", msg="no marker"), make_env(sender="Architect", msg="Architect")
+        ])
+        await clean_conductor.drain()
+        assert sorted(received) == [False, False, True]
+        assert clean_conductor.sandbox_stats()["dispatched"] == 1
+    finally:
+        await clean_conductor.shutdown()
+
+@pytest.mark.asyncio
+async def test_quarantined_flood_does_not_reach_a_queued_subscribers_buffer(clean_conductor):
+    gate = asyncio.Event()
+    trusted, quarantined = [], 0
+
+    async def handler(envelope):
+        nonlocal quarantined
+        if envelope.payload.get("_quarantine"):
+            quarantined += 1
+            return
+        await gate.wait()
+        trusted.append(envelope.payload["msg"])
+
+    sub = await clean_conductor.subscribe("sandbox.queued", handler, max_queue=2,
+                                          overflow=OverflowPolicy.DROP_OLDEST)
+    await clean_conductor.enable_sandbox(workers=1, max_depth=100)
+    try:
+        for i in range(3):
+            await clean_conductor.publish("sandbox.queued", make_env(i, sender="Architect"))
+            await asyncio.sleep(0)  # the worker holds Architect 0; 1 and 2 fill the queue
+        for _ in range(50):
+            await clean_conductor.publish("sandbox.queued", make_env(sender="stranger", msg="no marker"))
+
+        gate.set()
+        await clean_conductor.drain()
+        assert trusted == ["Architect 0", "Architect 1", "Architect 2"]
+        assert quarantined == 50 and sub.dropped == 0
+    finally:
+        gate.set()
+        await clean_conductor.shutdown()
@@ -0,0 +1,63 @@
+import pytest
+import asyncio
+from core.envelope import AetherIntent
+from agents.base_agent import BaseAgent
+from conftest import make_env
+
+class EchoResponder(BaseAgent):
+    async def start(self):
+        await self.subscribe("rpc.echo", self.handle)
+
+    async def handle(self, envelope):
+        await self.reply(envelope, AetherIntent.SHARE_INFO,
+                         {"echo": envelope.payload["msg"], "_security_context": "Architect"})
+
+@pytest.mark.asyncio
+async def test_request_returns_the_correlated_reply(clean_conductor):
+    await EchoResponder("Echo", clean_conductor).start()
+    caller = BaseAgent("Caller", clean_conductor)
+
+    answer = await caller.request("rpc.echo", AetherIntent.QUERY_TRUTH, {"msg": "Architect hi"},
+                                  flow_id="flow-1", timeout=1)
+
+    assert answer.payload["echo"] == "Architect hi"
+    assert answer.flow_id == "flow-1"
+    assert answer.sender_id == "Echo"
+    assert clean_conductor._replies == {}
+
+@pytest.mark.asyncio
+async def test_replies_do_not_fan_out_and_concurrent_requests_stay_separate(clean_conductor):
+    seen = []
+
+    async def eavesdropper(envelope):
+        seen.append(envelope)
+
+    await clean_conductor.subscribe("#", eavesdropper)
+    await EchoResponder("Echo", clean_conductor).start()
+
+    answers = await asyncio.gather(*(
+        clean_conductor.request("rpc.echo", make_env(i, intent=AetherIntent.QUERY_TRUTH), timeout=1)
+        for i in range(5)
+    ))
+
+    assert [a.payload["echo"] for a in answers] == [f"Architect {i}" for i in range(5)]
+    # Only the five requests were broadcast; none of the replies
+    assert len(seen) == 5
+    assert all(env.intent == AetherIntent.QUERY_TRUTH for env in seen)
+
+@pytest.mark.asyncio
+async def test_request_times_out_and_late_reply_is_counted(clean_conductor):
+    held = []
+
+    async def slow_responder(envelope):
+        held.append(envelope)
+
+    await clean_conductor.subscribe("rpc.slow", slow_responder)
+    late_before = clean_conductor.late_replies
+
+    with pytest.raises(asyncio.TimeoutError):
+        await clean_conductor.request("rpc.slow", make_env(intent=AetherIntent.QUERY_TRUTH), timeout=0.05)
+    assert clean_conductor._replies == {}
+
+    await clean_conductor.reply(held[0], make_env(intent=AetherIntent.QUERY_TRUTH))
+    assert clean_conductor.late_replies == late_before + 1
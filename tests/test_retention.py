@@ -0,0 +1,157 @@
+import pytest
+import asyncio
+from datetime import datetime, timezone
+from core.retention import Retention, encoded_size
+from core.clock import simulate, get_clock
+from core.aether_conductor import AetherConductor
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_late_subscriber_replays_ring_then_goes_live(clean_conductor):
+    clean_conductor.retain("resource.state", max_count=5)
+    for i in range(10):
+        await clean_conductor.publish("resource.state", make_env(i))
+
+    received = []
+
+    async def console(envelope):
+        received.append((envelope.payload["n"], envelope.meta["offset"]))
+
+    await clean_conductor.subscribe("resource.state", console, replay_from=0)
+    await clean_conductor.publish("resource.state", make_env(10))
+
+    assert received == [(5, 5), (6, 6), (7, 7), (8, 8), (9, 9), (10, 10)]
+    assert clean_conductor.retention_stats() == [{
+        "topic": "resource.state", "retained": 5, "bytes": 0,
+        "first_offset": 6, "last_offset": 10, "appended": 11, "evicted": 6,
+    }]
+
+@pytest.mark.asyncio
+async def test_handover_has_no_gap_or_duplicate_under_concurrent_publishing(clean_conductor):
+    clean_conductor.retain("resource.state", max_count=1000)
+    for i in range(50):
+        await clean_conductor.publish("resource.state", make_env(i))
+
+    received = []
+
+    async def slow_console(envelope):
+        received.append(envelope.payload["n"])
+        await asyncio.sleep(0)
+
+    async def publisher():
+        for i in range(50, 150):
+            await clean_conductor.publish("resource.state", make_env(i))
+            await asyncio.sleep(0)
+
+    # The backlog is still being replayed while new envelopes arrive
+    producer = asyncio.create_task(publisher())
+    await asyncio.sleep(0)
+    await clean_conductor.subscribe("resource.state", slow_console, replay_from=0)
+    await producer
+
+    assert received == list(range(150))
+
+@pytest.mark.asyncio
+async def test_queued_subscription_replays_in_order(clean_conductor):
+    clean_conductor.retain("resource.state")
+    for i in range(20):
+        await clean_conductor.publish("resource.state", make_env(i))
+
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("resource.state", handler, max_queue=100, replay_from=15)
+    await clean_conductor.publish("resource.state", make_env(20))
+    await clean_conductor.drain()
+
+    assert received == [15, 16, 17, 18, 19, 20]
+
+@pytest.mark.asyncio
+async def test_wildcard_replay_merges_topics_by_offset(clean_conductor):
+    clean_conductor.retain("cognition.#", max_count=10)
+    for i in range(6):
+        await clean_conductor.publish("cognition.a" if i % 2 else "cognition.b", make_env(i))
+    await clean_conductor.publish("aether.tasks.pending", make_env(99))  # not retained
+
+    received = []
+
+    async def handler(topic, envelope):
+        received.append((topic, envelope.payload["n"]))
+
+    await clean_conductor.subscribe("cognition.*", handler, with_topic=True, replay_from=2)
+
+    assert received == [("cognition.b", 2), ("cognition.a", 3), ("cognition.b", 4), ("cognition.a", 5)]
+    assert {s["topic"] for s in clean_conductor.retention_stats()} == {"cognition.a", "cognition.b"}
+
+@pytest.mark.asyncio
+async def test_byte_bound_keeps_newest(clean_conductor):
+    size = encoded_size(make_env(0))
+    clean_conductor.retain("resource.state", max_count=None, max_bytes=size * 3)
+    for i in range(10):
+        await clean_conductor.publish("resource.state", make_env(i))
+
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("resource.state", handler, replay_from=0)
+    # Every envelope is about the same size: roughly the last three survive
+    assert 2 <= len(received) <= 3
+    assert received[-1] == 9
+
+def test_replay_from_timestamp_and_age_bound_in_virtual_time():
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    async def scenario():
+        bus = AetherConductor()
+        bus.retain("resource.state", max_count=None, max_age=3600)
+        checkpoint = None
+        for i in range(8):  # one envelope every 10 minutes
+            if i == 5:
+                checkpoint = get_clock().now()
+            await bus.publish("resource.state", make_env(i))
+            await asyncio.sleep(600)
+
+        received = []
+
+        async def handler(envelope):
+            received.append(envelope.payload["n"])
+
+        await bus.subscribe("resource.state", handler, replay_from=checkpoint)
+        everything = []
+
+        async def from_start(envelope):
+            everything.append(envelope.payload["n"])
+
+        await bus.subscribe("resource.state", from_start, replay_from=start)
+        await bus.shutdown()
+        return received, everything
+
+    received, everything = simulate(scenario(), start=start)
+    assert received == [5, 6, 7]
+    # Only the last hour is retained
+    assert everything == [2, 3, 4, 5, 6, 7]
+
+@pytest.mark.asyncio
+async def test_stop_retaining_drops_history(clean_conductor):
+    clean_conductor.retain("resource.state")
+    await clean_conductor.publish("resource.state", make_env())
+    clean_conductor.stop_retaining("resource.state")
+
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope)
+
+    await clean_conductor.subscribe("resource.state", handler, replay_from=0)
+    assert received == []
+    assert clean_conductor.retention_stats() == []
+
+def test_retention_needs_a_bound():
+    with pytest.raises(ValueError):
+        Retention(max_count=None)
+    with pytest.raises(ValueError):
+        Retention(max_age=0)
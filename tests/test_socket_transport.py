@@ -0,0 +1,200 @@
+import pytest
+import asyncio
+import os
+import tempfile
+from agents.base_agent import BaseAgent
+from core.envelope import Envelope, AetherIntent
+from core.socket_transport import ConductorServer, RemoteConductor
+from conftest import make_env
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are length-limited, so keep them short
+    directory = tempfile.mkdtemp(prefix="aether-")
+    yield os.path.join(directory, "bus.sock")
+
+class RemoteListener(BaseAgent):
+    def __init__(self, bus):
+        super().__init__("Remote_Listener", bus)
+        self.received = asyncio.Queue()
+
+    async def start(self):
+        await self.subscribe("remote.tasks.*", self.received.put)
+
+@pytest.mark.asyncio
+async def test_remote_agent_receives_and_publishes(clean_conductor, socket_path):
+    server = await ConductorServer(clean_conductor, path=socket_path).start()
+    client = await RemoteConductor(path=socket_path).connect()
+    try:
+        agent = RemoteListener(client)
+        await agent.start()
+        await asyncio.sleep(0.05)  # let the SUBSCRIBE frame reach the server
+
+        await clean_conductor.publish("remote.tasks.pending", make_env(msg="Architect says hi"))
+        env = await asyncio.wait_for(agent.received.get(), timeout=2)
+        assert env.payload["msg"] == "Architect says hi"
+
+        local = asyncio.Queue()
+        await clean_conductor.subscribe("remote.replies", local.put)
+        await agent.publish("remote.replies", AetherIntent.ASSERT_FACT, {"msg": "Architect ack"})
+        reply = await asyncio.wait_for(local.get(), timeout=2)
+        assert reply.sender_id == "Remote_Listener"
+    finally:
+        await client.close()
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_small_frames_are_batched(clean_conductor):
+    server = await ConductorServer(clean_conductor, port=0).start()
+    client = await RemoteConductor(port=server.port).connect()
+    received = []
+    done = asyncio.Event()
+
+    async def handler(envelope):
+        received.append(envelope)
+        if len(received) == 100:
+            done.set()
+
+    try:
+        await clean_conductor.subscribe("tcp.topic", handler)
+        for i in range(100):
+            await client.publish("tcp.topic", make_env(msg=f"Architect {i}"))
+        await asyncio.wait_for(done.wait(), timeout=2)
+
+        assert [e.payload["msg"] for e in received] == [f"Architect {i}" for i in range(100)]
+        assert client._writer.writes < client._writer.frames
+    finally:
+        await client.close()
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_client_reconnects_and_resubscribes(clean_conductor, socket_path):
+    server = await ConductorServer(clean_conductor, path=socket_path).start()
+    client = await RemoteConductor(path=socket_path, reconnect_delay=0.01).connect()
+    inbox = asyncio.Queue()
+    try:
+        await client.subscribe("reconnect.topic", inbox.put)
+        await server.close()
+        await asyncio.sleep(0.05)
+        assert not client.connected
+
+        # Published while offline: buffered and flushed after reconnect
+        local = asyncio.Queue()
+        await clean_conductor.subscribe("offline.topic", local.put)
+        await client.publish("offline.topic", make_env(msg="Architect offline"))
+
+        server = await ConductorServer(clean_conductor, path=socket_path).start()
+        await client.connect(timeout=2)
+        assert client.connects == 2
+        assert (await asyncio.wait_for(local.get(), timeout=2)).payload["msg"] == "Architect offline"
+
+        await asyncio.sleep(0.05)
+        await clean_conductor.publish("reconnect.topic", make_env(msg="Architect again"))
+        env = await asyncio.wait_for(inbox.get(), timeout=2)
+        assert env.payload["msg"] == "Architect again"
+    finally:
+        await client.close()
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_forwarders_are_removed_on_unsubscribe_and_disconnect(clean_conductor, socket_path):
+    server = await ConductorServer(clean_conductor, path=socket_path).start()
+    client = await RemoteConductor(path=socket_path).connect()
+    try:
+        first = await client.subscribe("remote.a", asyncio.Queue().put)
+        await client.subscribe("remote.b", asyncio.Queue().put)
+        await asyncio.sleep(0.05)
+        assert set(clean_conductor.channels) == {"remote.a", "remote.b"}
+
+        assert await first.unsubscribe()
+        await asyncio.sleep(0.05)  # let the UNSUBSCRIBE frame reach the server
+        assert set(clean_conductor.channels) == {"remote.b"}
+    finally:
+        await client.close()
+    await asyncio.sleep(0.05)
+    try:
+        assert not clean_conductor.channels
+    finally:
+        await server.close()
+
+class RemoteAuditor(BaseAgent):
+    """ Asks the parent from inside an inline handler, like GEPPolicyEnforcer does. """
+    def __init__(self, bus):
+        super().__init__("Remote_Auditor", bus)
+        self.verdicts = asyncio.Queue()
+
+    async def start(self):
+        await self.subscribe("remote.audit", self.on_audit)
+
+    async def on_audit(self, envelope):
+        answer = await self.request("remote.rpc", AetherIntent.QUERY_TRUTH,
+                                    {"msg": envelope.payload["msg"]}, envelope.flow_id, timeout=2)
+        await self.verdicts.put(answer)
+
+@pytest.mark.asyncio
+async def test_remote_request_is_answered_while_the_handler_waits(clean_conductor, socket_path):
+    async def responder(envelope):
+        await clean_conductor.reply(envelope, Envelope(
+            AetherIntent.SHARE_INFO, "Parent", {"echo": envelope.payload["msg"]}))
+
+    await clean_conductor.subscribe("remote.rpc", responder)
+    server = await ConductorServer(clean_conductor, path=socket_path).start()
+    client = await RemoteConductor(path=socket_path).connect()
+    try:
+        auditor = RemoteAuditor(client)
+        await auditor.start()
+        await asyncio.sleep(0.05)  # let the SUBSCRIBE frame reach the server
+
+        env = make_env(msg="Architect asks")
+        await clean_conductor.publish("remote.audit", env)
+        answer = await asyncio.wait_for(auditor.verdicts.get(), timeout=3)
+
+        assert answer.payload["echo"] == "Architect asks"
+        assert answer.flow_id == env.flow_id
+        assert len(client._inbox) == 0
+    finally:
+        await client.close()
+        await server.close()
+
+class RemoteEcho(BaseAgent):
+    def __init__(self, bus):
+        super().__init__("Remote_Echo", bus)
+
+    async def start(self):
+        await self.subscribe("remote.echo", self.on_echo)
+
+    async def on_echo(self, envelope):
+        await self.reply(envelope, AetherIntent.SHARE_INFO, {"echo": envelope.payload["msg"]})
+
+@pytest.mark.asyncio
+async def test_server_handler_requests_the_connection_that_triggered_it(clean_conductor, socket_path):
+    answers = asyncio.Queue()
+
+    async def on_trigger(envelope):
+        answer = await clean_conductor.request("remote.echo", Envelope(
+            AetherIntent.QUERY_TRUTH, "Parent", {"msg": envelope.payload["msg"]}), timeout=2)
+        await answers.put(answer)
+
+    await clean_conductor.subscribe("remote.trigger", on_trigger)
+    server = await ConductorServer(clean_conductor, path=socket_path).start()
+    client = await RemoteConductor(path=socket_path).connect()
+    try:
+        echo = RemoteEcho(client)
+        await echo.start()
+        await echo.publish("remote.trigger", AetherIntent.SHARE_INFO, {"msg": "Architect asks"})
+        answer = await asyncio.wait_for(answers.get(), timeout=3)
+
+        assert answer.payload["echo"] == "Architect asks"
+    finally:
+        await client.close()
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_remote_subscribe_refuses_options_it_cannot_honour():
+    client = RemoteConductor(port=1)
+    for option in ({"with_topic": True}, {"batch": True}, {"replay_from": 0}, {"weak": True}):
+        with pytest.raises(TypeError):
+            await client.subscribe("remote.options", asyncio.Queue().put, **option)
+    sub = await client.subscribe("remote.options", asyncio.Queue().put, max_queue=4, with_topic=False)
+    assert sub.queued
+    await client.close()
@@ -0,0 +1,74 @@
+import pytest
+import asyncio
+import threading
+from core.admission import AdmissionError
+from core.aether_conductor import AetherConductor
+from conftest import make_env
+
+@pytest.mark.asyncio
+async def test_threads_publish_in_order_with_batched_wakeups(clean_conductor):
+    received = []
+
+    async def sink(envelope):
+        received.append((envelope.sender_id, envelope.payload["n"]))
+
+    await clean_conductor.subscribe("sync.world", sink)
+
+    def producer(name):
+        for i in range(200):
+            clean_conductor.publish_threadsafe("sync.world", make_env(i, sender=name))
+
+    def run_producers():
+        threads = [threading.Thread(target=producer, args=(f"thread-{t}",)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    await asyncio.to_thread(run_producers)
+    await clean_conductor.drain()
+
+    assert len(received) == 800
+    for t in range(4):
+        assert [n for sender, n in received if sender == f"thread-{t}"] == list(range(200))
+    stats = clean_conductor.handoff_stats()
+    assert stats["published"] == 800
+    assert stats["buffered"] == 0
+    assert stats["wakeups"] < 800
+
+@pytest.mark.asyncio
+async def test_publish_sync_blocks_until_delivered(clean_conductor):
+    received = []
+
+    async def sink(envelope):
+        received.append(envelope.payload["n"])
+
+    await clean_conductor.subscribe("sync.world", sink)
+
+    def sync_component():
+        clean_conductor.publish_sync("sync.world", make_env(1), timeout=5)
+        return list(received)
+
+    assert await asyncio.to_thread(sync_component) == [1]
+
+@pytest.mark.asyncio
+async def test_publish_sync_reports_refusals_to_the_caller(clean_conductor):
+    await clean_conductor.enable_admission(limits={"low": (0.001, 1)})
+    clean_conductor.attach_loop(asyncio.get_running_loop())
+
+    def sync_component():
+        clean_conductor.publish_sync("sync.world", make_env(0, sender="stranger", msg="no marker"), timeout=5)
+        clean_conductor.publish_sync("sync.world", make_env(1, sender="stranger", msg="no marker"), timeout=5)
+
+    with pytest.raises(AdmissionError):
+        await asyncio.to_thread(sync_component)
+
+@pytest.mark.asyncio
+async def test_publish_sync_refuses_to_block_the_loop(clean_conductor):
+    clean_conductor.attach_loop(asyncio.get_running_loop())
+    with pytest.raises(RuntimeError):
+        clean_conductor.publish_sync("sync.world", make_env())
+
+def test_threadsafe_publish_needs_a_loop():
+    with pytest.raises(RuntimeError):
+        AetherConductor().publish_threadsafe("sync.world", make_env())
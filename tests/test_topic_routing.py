@@ -0,0 +1,93 @@
+import pytest
+from core.topic_trie import TopicTrie
+from core.aether_conductor import AetherConductor
+from conftest import make_env
+
+def test_trie_single_and_multi_wildcards():
+    trie = TopicTrie()
+    trie.insert("aether.tasks.*", "star")
+    trie.insert("cognition.#", "hash")
+    trie.insert("a.#.z", "middle")
+
+    assert trie.match("aether.tasks.pending") == ["star"]
+    assert trie.match("aether.tasks") == []
+    assert trie.match("aether.tasks.pending.extra") == []
+
+    assert trie.match("cognition") == ["hash"]
+    assert trie.match("cognition.thought_stream") == ["hash"]
+    assert trie.match("cognition.a.b.c") == ["hash"]
+
+    assert trie.match("a.z") == ["middle"]
+    assert trie.match("a.b.c.z") == ["middle"]
+    assert trie.match("a.b.c") == []
+
+def test_trie_remove_prunes_nodes():
+    trie = TopicTrie()
+    trie.insert("x.*.y", 1)
+    assert trie.remove("x.*.y", 1) is True
+    assert trie.remove("x.*.y", 1) is False
+    assert len(trie) == 0
+    assert trie._root.children == {}
+
+def test_trie_rejects_partial_segment_wildcards():
+    with pytest.raises(ValueError):
+        TopicTrie().insert("aether.ta*", "bad")
+
+@pytest.mark.asyncio
+async def test_wildcard_subscription_receives_matching_topics(clean_conductor):
+    received = []
+
+    async def tasks_handler(envelope):
+        received.append("tasks")
+
+    async def cognition_handler(envelope):
+        received.append("cognition")
+
+    await clean_conductor.subscribe("aether.tasks.*", tasks_handler)
+    await clean_conductor.subscribe("cognition.#", cognition_handler)
+
+    await clean_conductor.publish("aether.tasks.pending", make_env())
+    await clean_conductor.publish("aether.tasks.approved", make_env())
+    await clean_conductor.publish("cognition.thought_stream", make_env())
+    await clean_conductor.publish("query.response", make_env())
+
+    assert received == ["tasks", "tasks", "cognition"]
+
+@pytest.mark.asyncio
+async def test_route_cache_invalidated_on_subscribe(clean_conductor):
+    received = []
+
+    async def exact(envelope):
+        received.append("exact")
+
+    async def wild(envelope):
+        received.append("wild")
+
+    await clean_conductor.subscribe("aether.tasks.pending", exact)
+    await clean_conductor.publish("aether.tasks.pending", make_env())
+    assert "aether.tasks.pending" in clean_conductor._route_cache
+
+    await clean_conductor.subscribe("aether.#", wild)
+    assert clean_conductor._route_cache == {}
+
+    await clean_conductor.publish("aether.tasks.pending", make_env())
+    assert received == ["exact", "exact", "wild"]
+
+@pytest.mark.asyncio
+async def test_route_cache_is_bounded_lru():
+    conductor = AetherConductor(route_cache_size=3)
+    received = []
+
+    async def handler(envelope):
+        received.append(envelope.msg_id)
+
+    await conductor.subscribe("jobs.hot", handler)
+    await conductor.publish("jobs.hot", make_env())
+    for i in range(10):
+        await conductor.publish(f"jobs.j{i}.status", make_env())  # per-job topics, nobody listens
+        await conductor.publish("jobs.hot", make_env())  # keeps the hot route recent
+
+    assert len(conductor._route_cache) == 3
+    assert "jobs.hot" in conductor._route_cache
+    assert len(received) == 11
+    await conductor.shutdown()
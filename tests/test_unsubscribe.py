@@ -0,0 +1,109 @@
+import pytest
+import asyncio
+import gc
+import weakref
+from agents.base_agent import BaseAgent
+from agents.uposatha_cleaner_agent import UposathaCleanerAgent
+from conftest import make_env
+
+class Listener(BaseAgent):
+    def __init__(self, bus):
+        super().__init__("Listener", bus)
+        self.received = []
+
+    async def on_wave(self, envelope):
+        self.received.append(envelope.payload["n"])
+
+@pytest.mark.asyncio
+async def test_handle_unsubscribes_exact_and_wildcard(clean_conductor):
+    received = []
+
+    async def exact(envelope):
+        received.append(("exact", envelope.payload["n"]))
+
+    async def wildcard(envelope):
+        received.append(("wildcard", envelope.payload["n"]))
+
+    exact_sub = await clean_conductor.subscribe("ws.console", exact)
+    wildcard_sub = await clean_conductor.subscribe("ws.*", wildcard)
+    await clean_conductor.publish("ws.console", make_env(1))
+
+    assert await exact_sub.unsubscribe()
+    await clean_conductor.publish("ws.console", make_env(2))
+    assert await clean_conductor.unsubscribe(wildcard_sub)
+    await clean_conductor.publish("ws.console", make_env(3))
+
+    assert received == [("exact", 1), ("wildcard", 1), ("wildcard", 2)]
+    assert not await exact_sub.unsubscribe()
+    assert not exact_sub.active
+    assert "ws.console" not in clean_conductor.channels
+    assert len(clean_conductor._wildcards) == 0
+
+@pytest.mark.asyncio
+async def test_async_with_scopes_a_short_lived_listener(clean_conductor):
+    received = []
+
+    async def listener(envelope):
+        received.append(envelope.payload["n"])
+
+    async with await clean_conductor.subscribe("ws.session", listener, max_queue=10) as sub:
+        await clean_conductor.publish("ws.session", make_env(1))
+        await clean_conductor.drain()
+    await clean_conductor.publish("ws.session", make_env(2))
+
+    assert received == [1]
+    assert sub.queue is None  # worker pool stopped
+
+@pytest.mark.asyncio
+async def test_unsubscribe_with_drain_finishes_queued_work(clean_conductor):
+    received = []
+
+    async def slow(envelope):
+        await asyncio.sleep(0.001)
+        received.append(envelope.payload["n"])
+
+    sub = await clean_conductor.subscribe("ws.queue", slow, max_queue=100)
+    for i in range(5):
+        await clean_conductor.publish("ws.queue", make_env(i))
+    await clean_conductor.unsubscribe(sub, drain=True)
+
+    assert received == [0, 1, 2, 3, 4]
+
+@pytest.mark.asyncio
+async def test_weak_handler_is_pruned_when_owner_is_collected(clean_conductor):
+    listener = Listener(clean_conductor)
+    sub = await clean_conductor.subscribe("ws.weak", listener.on_wave, weak=True)
+    await clean_conductor.publish("ws.weak", make_env(1))
+    assert listener.received == [1]
+
+    owner = weakref.ref(listener)
+    del listener
+    gc.collect()
+    assert owner() is None  # the subscription did not keep the agent alive
+
+    await asyncio.sleep(0)  # pruning is deferred to the loop
+    await asyncio.sleep(0)
+    assert not sub.active
+    assert "ws.weak" not in clean_conductor.channels
+    await clean_conductor.publish("ws.weak", make_env(2))  # nothing left to call
+
+@pytest.mark.asyncio
+async def test_strong_handler_keeps_owner_alive(clean_conductor):
+    listener = Listener(clean_conductor)
+    await clean_conductor.subscribe("ws.strong", listener.on_wave)
+    owner = weakref.ref(listener)
+    del listener
+    gc.collect()
+    assert owner() is not None
+
+@pytest.mark.asyncio
+async def test_agent_stop_releases_its_subscriptions(clean_conductor):
+    agent = UposathaCleanerAgent(clean_conductor, interval=1000)
+    await agent.start()
+    await agent.subscribe("aether.tasks.pending", agent.perform_uposatha_ritual)
+    await agent.subscribe("aether.tasks.approved", agent.perform_uposatha_ritual)
+
+    await agent.stop()
+
+    assert agent._running_task is None
+    assert not clean_conductor.channels